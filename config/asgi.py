@@ -12,8 +12,24 @@ from . import otel_setup  # noqa: F401, I001
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+from lib.monitoring.pool import instrument_pools  # noqa: E402 # Needs the settings configured above
+
+instrument_pools()
+
+if settings.MONITORING_LOOP_MONITOR_ENABLED or settings.MONITORING_PYROSCOPE_TAGS_ENABLED:
+    from lib.monitoring.executors import MonitoredExecutorsMiddleware
+
+    # Runs sync_to_async calls on executors that the loop monitor measures and that apply profiling tags
+    application = MonitoredExecutorsMiddleware(application)  # type: ignore # Wrapped application is still an ASGI app
+
+if settings.MONITORING_LOOP_MONITOR_ENABLED:
+    from lib.monitoring.loop import LoopMonitorMiddleware
+
+    application = LoopMonitorMiddleware(application)  # type: ignore # Wrapped application is still an ASGI app
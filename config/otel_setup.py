@@ -12,8 +12,11 @@ from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import SERVICE_NAME, Resource
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, Sampler, TraceIdRatioBased
+
+from lib.monitoring.sampling import RecordingSampler, TailSamplingSpanProcessor
 
 MONITORING_OTLP_TRACING_ENDPOINT = os.getenv("MONITORING_OTLP_TRACING_ENDPOINT")
 MONITORING_OTLP_TRACING_PROTOCOL = os.getenv("MONITORING_OTLP_TRACING_PROTOCOL")
@@ -21,6 +24,12 @@ MONITORING_OTLP_LOGS_ENDPOINT = os.getenv("MONITORING_OTLP_LOGS_ENDPOINT")
 MONITORING_OTLP_LOGS_PROTOCOL = os.getenv("MONITORING_OTLP_LOGS_PROTOCOL")
 MONITORING_OTLP_METRICS_ENDPOINT = os.getenv("MONITORING_OTLP_METRICS_ENDPOINT")
 MONITORING_OTLP_METRICS_PROTOCOL = os.getenv("MONITORING_OTLP_METRICS_PROTOCOL")
+MONITORING_TRACING_SAMPLE_RATIO = float(os.getenv("MONITORING_TRACING_SAMPLE_RATIO", "1.0"))
+MONITORING_TRACING_TAIL_LATENCY_THRESHOLD = os.getenv("MONITORING_TRACING_TAIL_LATENCY_THRESHOLD")
+MONITORING_TRACING_MAX_QUEUE_SIZE = int(os.getenv("MONITORING_TRACING_MAX_QUEUE_SIZE", "2048"))
+MONITORING_TRACING_MAX_EXPORT_BATCH_SIZE = int(os.getenv("MONITORING_TRACING_MAX_EXPORT_BATCH_SIZE", "512"))
+MONITORING_TRACING_SCHEDULE_DELAY_MILLIS = int(os.getenv("MONITORING_TRACING_SCHEDULE_DELAY_MILLIS", "5000"))
+MONITORING_TRACING_SQL_COMMENTER = os.getenv("MONITORING_TRACING_SQL_COMMENTER", "True") == "True"
 
 
 if MONITORING_OTLP_TRACING_PROTOCOL == "http":
@@ -49,9 +58,24 @@ logging.basicConfig(level=logging.DEBUG)
 resource = Resource(attributes={SERVICE_NAME: APP_NAME})
 
 # Set up tracing
-tracer_provider = TracerProvider(resource=resource)
+# Traces are sampled at the root and children follow their parent's decision. With a tail latency threshold, the traces
+# that are not sampled are still recorded, and exported anyway if they turn out to be slow or failed.
+sampler: Sampler = ParentBased(root=TraceIdRatioBased(MONITORING_TRACING_SAMPLE_RATIO))
+if MONITORING_TRACING_TAIL_LATENCY_THRESHOLD:
+    sampler = RecordingSampler(sampler)
+tracer_provider = TracerProvider(resource=resource, sampler=sampler)
 tracing_exporter = OTLPSpanExporter(endpoint=MONITORING_OTLP_TRACING_ENDPOINT)
-span_processor = BatchSpanProcessor(tracing_exporter)
+span_processor: SpanProcessor = BatchSpanProcessor(
+    tracing_exporter,
+    max_queue_size=MONITORING_TRACING_MAX_QUEUE_SIZE,
+    max_export_batch_size=MONITORING_TRACING_MAX_EXPORT_BATCH_SIZE,
+    schedule_delay_millis=MONITORING_TRACING_SCHEDULE_DELAY_MILLIS,
+)
+if MONITORING_TRACING_TAIL_LATENCY_THRESHOLD:
+    span_processor = TailSamplingSpanProcessor(
+        span_processor,
+        latency_threshold=float(MONITORING_TRACING_TAIL_LATENCY_THRESHOLD),
+    )
 tracer_provider.add_span_processor(span_processor)
 trace.set_tracer_provider(tracer_provider)
 
@@ -70,5 +94,5 @@ metrics.set_meter_provider(meter_provider)
 
 DjangoInstrumentor().instrument()
 HTTPXClientInstrumentor().instrument()
-PsycopgInstrumentor().instrument(enable_commenter=True, commenter_options={})
+PsycopgInstrumentor().instrument(enable_commenter=MONITORING_TRACING_SQL_COMMENTER, commenter_options={})
 RequestsInstrumentor().instrument()
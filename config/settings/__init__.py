@@ -23,5 +23,6 @@ from .logging import *
 from .middleware import *
 from .monitoring import *
 from .security import *
+from .sessions import *
 from .templates import *
 from .webserver import *
@@ -13,6 +13,9 @@ AUTHENTICATION_BACKENDS = [
 
 AUTH_USER_MODEL = "core.User"
 
+# How long the user of a session is cached for, see `core.auth.authentication`
+AUTH_USER_CACHE_TTL = 60
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -104,6 +107,7 @@ __all__ = [
     "ACCOUNT_USER_MODEL_USERNAME_FIELD",
     "AUTHENTICATION_BACKENDS",
     "AUTH_PASSWORD_VALIDATORS",
+    "AUTH_USER_CACHE_TTL",
     "AUTH_USER_MODEL",
     "HEADLESS_ADAPTER",
     "HEADLESS_FRONTEND_URLS",
@@ -2,7 +2,10 @@
 # CACHE SETTINGS
 #
 # Environment variables used:
-#   CACHE_URL           - Url for the cache backend (e.g., redis://<host>:<port>)
+#   CACHE_URL                  - Url for the cache backend (e.g., redis://<host>:<port>)
+#   CACHE_LOCAL_TTL            - Seconds values stay at most in the in-process cache of `lib.cache` (default: 30)
+#   CACHE_LOCAL_MAX_SIZE       - Default number of entries kept in-process per `lib.cache` namespace (default: 1024)
+#   CACHE_INVALIDATION_CHANNEL - Redis pub/sub channel model invalidations are sent on (default: 'cache-invalidation')
 # ------------------------------------------------------------------------------------------------
 
 import os
@@ -27,4 +30,20 @@ if TESTING:
         }
     }
 
-__all__ = ["CACHES"]
+# In-process (L1) cache used by `lib.cache` in front of the default cache
+
+CACHE_LOCAL_TTL = float(os.environ.get("CACHE_LOCAL_TTL", "30"))
+CACHE_LOCAL_MAX_SIZE = int(os.environ.get("CACHE_LOCAL_MAX_SIZE", "1024"))
+
+# Redis used by `lib.cache` for locks, and to send model invalidations to other processes over pub/sub
+
+CACHE_REDIS_URL = None if TESTING else os.environ.get("CACHE_URL")
+CACHE_INVALIDATION_CHANNEL = os.environ.get("CACHE_INVALIDATION_CHANNEL", "cache-invalidation")
+
+__all__ = [
+    "CACHES",
+    "CACHE_INVALIDATION_CHANNEL",
+    "CACHE_LOCAL_MAX_SIZE",
+    "CACHE_LOCAL_TTL",
+    "CACHE_REDIS_URL",
+]
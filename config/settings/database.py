@@ -2,19 +2,32 @@
 # DATABASE SETTINGS
 #
 # Environment variables used:
-#   DB_NAME           - Name of the database
-#   DB_USER           - Database username
-#   DB_PASSWORD       - Database user password
-#   DB_HOST           - Database host address
-#   DB_PORT           - Database port
-#   DB_SSL_MODE       - (Optional) SSL mode for database connection (e.g., 'require', 'disable')
-#   DB_SSL_ROOT_CERT  - (Optional) Path to the SSL root certificate file
+#   DB_NAME                   - Name of the database
+#   DB_USER                   - Database username
+#   DB_PASSWORD               - Database user password
+#   DB_HOST                   - Database host address
+#   DB_PORT                   - Database port
+#   DB_SSL_MODE               - (Optional) SSL mode for database connection (e.g., 'require', 'disable')
+#   DB_SSL_ROOT_CERT          - (Optional) Path to the SSL root certificate file
+#   DB_POOL                   - (Optional) Whether connections are pooled with psycopg's pool (default: True)
+#   DB_POOL_MIN_SIZE          - (Optional) Connections the pool keeps open (default: 2)
+#   DB_POOL_MAX_SIZE          - (Optional) Connections the pool can open at most (default: 10)
+#   DB_POOL_MAX_IDLE          - (Optional) Seconds an idle connection above the minimum is kept for (default: 600)
+#   DB_POOL_TIMEOUT           - (Optional) Seconds to wait for a connection from the pool before failing (default: 30)
+#   DB_POOL_CHECK             - (Optional) Whether connections are checked before they are handed out (default: True)
+#   DB_REPLICAS               - (Optional) Comma separated read replicas, as host[:port][/name] (e.g., 'r1,r2:5433')
+#   DB_REPLICA_MAX_LAG        - (Optional) Seconds a replica can trail the primary and still serve reads (default: 5)
+#   DB_REPLICA_CHECK_INTERVAL - (Optional) Seconds between replica lag checks (default: 5)
+#   DB_REPLICA_STICKY_TTL     - (Optional) Seconds a session reads from the primary after it writes (default: 10)
 # ------------------------------------------------------------------------------------------------
 
 import os
+from typing import Any
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# Connections come from psycopg's pool, which saves the connection setup (and TLS handshake) on each request
+# https://docs.djangoproject.com/en/5.2/ref/databases/#connection-pool
 
 
 def _get_db_ssl_settings() -> dict[str, str]:
@@ -28,6 +41,18 @@ def _get_db_ssl_settings() -> dict[str, str]:
     return ssl_settings
 
 
+def _get_db_pool_settings() -> dict[str, Any]:
+    if os.environ.get("DB_POOL", "True") != "True":
+        return {}
+    pool_settings: dict[str, Any] = {
+        "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+        "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "600")),
+        "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "30")),
+    }
+    return {"pool": pool_settings}
+
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -36,15 +61,59 @@ DATABASES = {
         "PASSWORD": os.environ["DB_PASSWORD"],
         "HOST": os.environ["DB_HOST"],
         "PORT": os.environ["DB_PORT"],
+        # With the pool, Django checks connections as they are handed out: it costs a round trip per checkout, but
+        # connections dropped by the server are replaced instead of failing
+        "CONN_HEALTH_CHECKS": os.environ.get("DB_POOL_CHECK", "True") == "True",
         "OPTIONS": {
             **(_get_db_ssl_settings()),
+            **(_get_db_pool_settings()),
         },
     },
 }
 
+# Read replicas, which share the credentials and options of the primary
+# https://docs.djangoproject.com/en/5.2/topics/db/multi-db/
+
+
+def _get_db_replicas(primary: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    replicas = {}
+    for index, replica in enumerate(filter(None, os.environ.get("DB_REPLICAS", "").split(","))):
+        address, _, name = replica.strip().partition("/")
+        host, _, port = address.partition(":")
+        replicas[f"replica_{index}"] = {
+            **primary,
+            "HOST": host,
+            "PORT": port or primary["PORT"],
+            "NAME": name or primary["NAME"],
+            # Tests read from the test database rather than a replica of it
+            "TEST": {"MIRROR": "default"},
+        }
+    return replicas
+
+
+DATABASES.update(_get_db_replicas(DATABASES["default"]))
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_REPLICA_MAX_LAG = float(os.environ.get("DB_REPLICA_MAX_LAG", "5"))
+DATABASE_REPLICA_CHECK_INTERVAL = float(os.environ.get("DB_REPLICA_CHECK_INTERVAL", "5"))
+DATABASE_REPLICA_STICKY_TTL = float(os.environ.get("DB_REPLICA_STICKY_TTL", "10"))
+# Apps whose reads always go to the primary, as they must read their own writes across requests
+DATABASE_REPLICA_EXCLUDED_APPS = ["sessions"]
+
+DATABASE_ROUTERS = ["lib.replicas.ReplicaRouter"] if DATABASE_REPLICAS else []
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
-__all__ = ["DATABASES", "DEFAULT_AUTO_FIELD"]
+__all__ = [
+    "DATABASES",
+    "DATABASE_REPLICAS",
+    "DATABASE_REPLICA_CHECK_INTERVAL",
+    "DATABASE_REPLICA_EXCLUDED_APPS",
+    "DATABASE_REPLICA_MAX_LAG",
+    "DATABASE_REPLICA_STICKY_TTL",
+    "DATABASE_ROUTERS",
+    "DEFAULT_AUTO_FIELD",
+]
@@ -22,7 +22,8 @@ from pathlib import Path
 
 ENVIRONMENT = os.environ.get("ENVIRONMENT", "development")
 DEBUG = os.getenv("DEBUG") == "True"
-TESTING = "test" in sys.argv
+# `manage.py test`, or pytest, which sets PYTEST_VERSION while it runs
+TESTING = "test" in sys.argv or "PYTEST_VERSION" in os.environ
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
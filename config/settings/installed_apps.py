@@ -17,6 +17,7 @@ INSTALLED_APPS = [
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
+    "django.contrib.postgres",
     # "django.contrib.messages", - Messages framework is not used
     "django.contrib.staticfiles",
     # -------------------------------------------------
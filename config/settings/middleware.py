@@ -2,6 +2,7 @@
 # MIDDLEWARE SETTINGS
 # ------------------------------------------------------------------------------------------------
 
+from .database import DATABASE_REPLICAS
 from .deployment import DEBUG, TESTING
 
 MIDDLEWARE = [
@@ -15,7 +16,8 @@ MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.auth.middleware.AuthenticationMiddleware",
+    "lib.permissions.PermissionMemoMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     # -------------------------------------------------
     # Third party middleware
@@ -27,6 +29,9 @@ MIDDLEWARE = [
     "lib.monitoring.middleware.TelemetryMiddleware",
 ]
 
+if DATABASE_REPLICAS:
+    MIDDLEWARE = [*MIDDLEWARE, "lib.replicas.ReplicaRoutingMiddleware"]
+
 if DEBUG and not TESTING:
     MIDDLEWARE = ["debug_toolbar.middleware.DebugToolbarMiddleware", *MIDDLEWARE]
 
@@ -2,11 +2,32 @@
 # MONITORING SETTINGS
 #
 # Environment variables used:
-#   MONITORING_PYROSCOPE_URL            - URL of the Pyroscope server for performance profiling
-#   MONITORING_OTLP_LOGS_ENDPOINT       - OTLP endpoint for logs
-#   MONITORING_OTLP_LOGS_PROTOCOL       - OTLP protocol for logs. Either 'http' or 'grpc'.
-#   MONITORING_OTLP_TRACING_ENDPOINT    - OTLP endpoint for traces
-#   MONITORING_OTLP_TRACING_PROTOCOL    - OTLP protocol for traces. Either 'http' or 'grpc'.
+#   MONITORING_PYROSCOPE_URL                - URL of the Pyroscope server for performance profiling
+#   MONITORING_PYROSCOPE_TAGS               - Whether to tag profiles with the request's route, GraphQL operation and
+#                                             slice ('True' or 'False', default: 'True')
+#   MONITORING_OTLP_LOGS_ENDPOINT           - OTLP endpoint for logs
+#   MONITORING_OTLP_LOGS_PROTOCOL           - OTLP protocol for logs. Either 'http' or 'grpc'.
+#   MONITORING_OTLP_TRACING_ENDPOINT        - OTLP endpoint for traces
+#   MONITORING_OTLP_TRACING_PROTOCOL        - OTLP protocol for traces. Either 'http' or 'grpc'.
+#   MONITORING_TRACING_SAMPLE_RATIO         - Ratio of traces sampled at their root, between 0 and 1 (default: 1.0)
+#   MONITORING_TRACING_TAIL_LATENCY_THRESHOLD
+#                                           - (Optional) Seconds after which traces that were not sampled are exported
+#                                             anyway. Failed traces are also kept. Disabled if empty.
+#   MONITORING_TRACING_MAX_QUEUE_SIZE       - Maximum number of spans queued for export (default: 2048)
+#   MONITORING_TRACING_MAX_EXPORT_BATCH_SIZE
+#                                           - Maximum number of spans exported in one batch (default: 512)
+#   MONITORING_TRACING_SCHEDULE_DELAY_MILLIS
+#                                           - Milliseconds between span exports (default: 5000)
+#   MONITORING_TRACING_SQL_COMMENTER        - Whether to add trace context comments to SQL statements
+#                                             ('True' or 'False', default: 'True')
+#   MONITORING_QUERY_DUPLICATES_THRESHOLD   - Number of repeated SQL statements in a request before it is
+#                                             reported as a suspected N+1 query (default: 5)
+#   MONITORING_LOOP_MONITOR_ENABLED         - Whether to monitor event loop lag and executor saturation
+#                                             ('True' or 'False', default: 'True')
+#   MONITORING_LOOP_MONITOR_INTERVAL        - Seconds between event loop samples (default: 1.0)
+#   MONITORING_LOOP_LAG_THRESHOLD           - Event loop lag in seconds above which a warning is logged (default: 0.1)
+#   MONITORING_EXECUTOR_WAIT_THRESHOLD      - Executor wait time in seconds above which a warning is logged
+#                                             (default: 0.1)
 # ------------------------------------------------------------------------------------------------
 
 import os
@@ -23,4 +44,26 @@ if MONITORING_PYROSCOPE_URL and not deployment.TESTING:
         server_address=MONITORING_PYROSCOPE_URL,
     )
 
-__all__ = []
+MONITORING_PYROSCOPE_TAGS_ENABLED = (
+    bool(MONITORING_PYROSCOPE_URL)
+    and not deployment.TESTING
+    and os.getenv("MONITORING_PYROSCOPE_TAGS", "True") == "True"
+)
+
+MONITORING_QUERY_DUPLICATES_THRESHOLD = int(os.getenv("MONITORING_QUERY_DUPLICATES_THRESHOLD", "5"))
+
+MONITORING_LOOP_MONITOR_ENABLED = (
+    os.getenv("MONITORING_LOOP_MONITOR_ENABLED", "True") == "True" and not deployment.TESTING
+)
+MONITORING_LOOP_MONITOR_INTERVAL = float(os.getenv("MONITORING_LOOP_MONITOR_INTERVAL", "1.0"))
+MONITORING_LOOP_LAG_THRESHOLD = float(os.getenv("MONITORING_LOOP_LAG_THRESHOLD", "0.1"))
+MONITORING_EXECUTOR_WAIT_THRESHOLD = float(os.getenv("MONITORING_EXECUTOR_WAIT_THRESHOLD", "0.1"))
+
+__all__ = [
+    "MONITORING_EXECUTOR_WAIT_THRESHOLD",
+    "MONITORING_LOOP_LAG_THRESHOLD",
+    "MONITORING_LOOP_MONITOR_ENABLED",
+    "MONITORING_LOOP_MONITOR_INTERVAL",
+    "MONITORING_PYROSCOPE_TAGS_ENABLED",
+    "MONITORING_QUERY_DUPLICATES_THRESHOLD",
+]
@@ -0,0 +1,31 @@
+# ------------------------------------------------------------------------------------------------
+# SESSION SETTINGS
+#
+# Environment variables used:
+#   SESSION_REDIS                - Whether sessions are stored in Redis, which requires CACHE_URL (default: False)
+#   SESSION_REDIS_WRITE_THROUGH  - Whether Redis sessions are also written to the database (default: False)
+# ------------------------------------------------------------------------------------------------
+
+import os
+
+from .cache import CACHE_REDIS_URL
+
+# Sessions, which back the headless session tokens
+# https://docs.djangoproject.com/en/5.2/topics/http/sessions
+# Moving to Redis drops the sessions kept in the database unless they are migrated first, see
+# `tools/management/commands/sessions.py`
+
+SESSION_ENGINE = (
+    "lib.sessions.backend"
+    if CACHE_REDIS_URL and os.environ.get("SESSION_REDIS", "False") == "True"
+    else "django.contrib.sessions.backends.db"
+)
+
+# Keeps the database copy of Redis sessions up to date, so that they survive a Redis flush, and moving back to the
+# database engine doesn't log users out
+SESSION_REDIS_WRITE_THROUGH = os.environ.get("SESSION_REDIS_WRITE_THROUGH", "False") == "True"
+
+__all__ = [
+    "SESSION_ENGINE",
+    "SESSION_REDIS_WRITE_THROUGH",
+]
@@ -0,0 +1,102 @@
+import copy
+import uuid
+
+from allauth.headless import app_settings as headless_settings
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.http import HttpRequest
+from django.utils.crypto import constant_time_compare
+
+from lib.cache import TieredCache
+
+from .models import AnonymousUser, DeactivatedUser, User
+
+# Session key (or headless session token) to the uuid of its user and the session's auth hash.
+# Dropped on logout and password changes, see `core.auth.signals`. Not kept in the process, so that a logout applies to
+# every process at once; sessions deleted or expired otherwise are served for at most `AUTH_USER_CACHE_TTL`.
+session_users = TieredCache("auth.session_users", ttl=settings.AUTH_USER_CACHE_TTL, local_ttl=0)
+
+# User uuid to the user, with what `services.get_profile` needs prefetched, and the auth hash of its sessions. The
+# password hash isn't cached. Dropped when the user is saved.
+users = TieredCache(
+    "auth.users",
+    ttl=settings.AUTH_USER_CACHE_TTL,
+    invalidated_by={"core.User": str},
+)
+
+
+def get_session_key(request: HttpRequest) -> str | None:
+    """The headless session token of the request if it has one, or the key of its cookie based session."""
+    return headless_settings.TOKEN_STRATEGY.get_session_token(request) or request.session.session_key
+
+
+@sync_to_async
+def _load_session_user(request: HttpRequest, session_key: str) -> tuple[uuid.UUID, str] | None:
+    session = request.session
+    if session.session_key != session_key:
+        session = headless_settings.TOKEN_STRATEGY.lookup_session(session_key)
+    if session is None:
+        return None
+    user_id = session.get(SESSION_KEY)
+    if user_id is None or session.get(BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS:
+        return None
+    user_uuid = User.objects.filter(pk=User._meta.pk.to_python(user_id)).values_list("uuid", flat=True).first()  # noqa: SLF001 # Public Django API
+    if user_uuid is None:
+        return None
+    return user_uuid, session.get(HASH_SESSION_KEY, "")
+
+
+async def _load_user(user_uuid: uuid.UUID) -> tuple[User, str] | None:
+    user = await User.objects.filter(uuid=user_uuid).afirst()
+    if user is None:
+        return None
+    await user.aprefetch_related("emailaddress_set")
+    session_auth_hash = user.get_session_auth_hash()
+    # Deferred, so it's loaded again if it is used, and left out when the user is saved
+    del user.__dict__["password"]
+    return user, session_auth_hash
+
+
+async def aget_user(request: HttpRequest) -> User | AnonymousUser:
+    """
+    Resolve the user of the request's session through the cache, like `django.contrib.auth.aget_user`.
+
+    Cache hits are served without loading the session or the user from the database. The returned user is a copy of
+    the cached one, and can be modified. Sessions of inactive users resolve to a `DeactivatedUser`.
+    """
+    session_key = get_session_key(request)
+    if not session_key:
+        return AnonymousUser()
+    session_user = await session_users.aget_or_set(session_key, lambda: _load_session_user(request, session_key))
+    if session_user is None:
+        return AnonymousUser()
+
+    user_uuid, session_hash = session_user
+    cached_user: tuple[User, str] | None = await users.aget_or_set(str(user_uuid), lambda: _load_user(user_uuid))
+    if cached_user is None:
+        return AnonymousUser()
+    user, user_hash = cached_user
+    # The hash of sessions started before the password changed no longer matches
+    if not constant_time_compare(session_hash, user_hash):
+        return AnonymousUser()
+    if not user.is_active:
+        return DeactivatedUser()
+    return copy.copy(user)
+
+
+async def aget_request_user(request: HttpRequest) -> User | AnonymousUser:
+    """
+    Resolve the user of the request, once per request. Installed as `request.auser` by the authentication middleware.
+    """
+    if not hasattr(request, "_acached_user"):
+        request._acached_user = await aget_user(request)  # type: ignore # noqa: SLF001 # Same cache as Django
+    return request._acached_user  # type: ignore # noqa: SLF001
+
+
+async def adrop_session(session_key: str | None) -> None:
+    """
+    Drop the cached user of a session, e.g. when it's logged out.
+    """
+    if session_key:
+        await session_users.adelete(session_key)
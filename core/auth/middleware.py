@@ -0,0 +1,18 @@
+from functools import partial
+
+from django.contrib.auth import middleware
+from django.http import HttpRequest
+
+from .authentication import aget_request_user
+
+
+class AuthenticationMiddleware(middleware.AuthenticationMiddleware):
+    """
+    Django's authentication middleware, resolving `request.auser()` through a cache (see `core.auth.authentication`).
+
+    `request.user` is left as is, for synchronous code and the allauth views that switch the request's session.
+    """
+
+    def process_request(self, request: HttpRequest) -> None:
+        super().process_request(request)
+        request.auser = partial(aget_request_user, request)  # type: ignore
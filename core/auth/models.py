@@ -1,14 +1,20 @@
+import uuid
+
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import AnonymousUser
 from django.db import models
 from django.db.models import functions
 
-from lib.models import BaseModel
+from lib.models import BaseModel, BaseQuerySet
+from lib.search import trigram_index
 
 # Create your models here.
 
 
 class UserManager(BaseUserManager["User"]):
+    def get_queryset(self) -> BaseQuerySet["User"]:
+        return BaseQuerySet(self.model, using=self._db)
+
     async def _create_user(
         self,
         email: str,
@@ -74,6 +80,9 @@ class User(BaseModel, AbstractBaseUser):
 
     objects: UserManager = UserManager()
 
+    # Predates time-ordered UUIDs, see `BaseModel`
+    uuid_generator = uuid.uuid4
+
     USERNAME_FIELD = "email"
 
     class Meta:
@@ -81,6 +90,13 @@ class User(BaseModel, AbstractBaseUser):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ("-created_at",)
+        indexes = (trigram_index("user", "email"), trigram_index("user", "full_name"))
+
+
+class DeactivatedUser(AnonymousUser):
+    """
+    Anonymous user of a session whose user has been deactivated.
+    """
 
 
-__all__ = ["AnonymousUser", "User"]
+__all__ = ["AnonymousUser", "DeactivatedUser", "User"]
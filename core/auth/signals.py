@@ -1,9 +1,16 @@
 import logging
 from typing import TYPE_CHECKING, Any
 
-from allauth.account.signals import user_logged_in, user_signed_up
+from allauth.account.models import EmailAddress
+from allauth.account.signals import password_changed, password_reset, password_set, user_logged_in, user_signed_up
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from lib.models import invalidate
+
+from .authentication import adrop_session, get_session_key
+
 if TYPE_CHECKING:
     from django.http import HttpRequest
 
@@ -26,3 +33,23 @@ async def handle_user_logged_in(sender: Any, request: "HttpRequest", user: "User
     Signal receiver to perform actions upon user login.
     """
     logger.info("User logged in", extra={"user_id": user.uuid})
+
+
+@receiver(user_logged_out)
+@receiver(password_changed)
+@receiver(password_set)
+@receiver(password_reset)
+async def handle_session_user_changed(sender: Any, request: "HttpRequest", **kwargs: Any) -> None:  # noqa: ARG001 # Arguments are required by signal
+    """
+    Signal receiver dropping the cached user of the request's session when it logs out or changes its password.
+    """
+    await adrop_session(get_session_key(request))
+
+
+@receiver(post_save, sender=EmailAddress)
+@receiver(post_delete, sender=EmailAddress)
+def handle_email_address_changed(sender: Any, instance: EmailAddress, using: str, **kwargs: Any) -> None:  # noqa: ARG001 # Arguments are required by signal
+    """
+    Signal receiver invalidating the cached user of an email address, since its email addresses are cached with it.
+    """
+    invalidate("core.User", [instance.user.uuid], using=using)
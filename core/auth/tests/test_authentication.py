@@ -0,0 +1,111 @@
+import pickle
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from importlib import import_module
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpRequest
+from django.test import Client, RequestFactory
+
+from ..authentication import adrop_session, aget_user, session_users, users
+from ..models import DeactivatedUser, User
+from .factories import UserFactory
+
+type CaptureOnCommit = Callable[..., AbstractContextManager[list[Callable[[], None]]]]
+
+
+def logged_in_session(user: User) -> str:
+    client = Client()
+    client.force_login(user)
+    return client.session.session_key or ""
+
+
+def make_request(session_key: str | None = None, **headers: Any) -> HttpRequest:
+    request = RequestFactory().get("/", **headers)
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+    return request
+
+
+@pytest.mark.django_db
+def test_cached_user(assert_max_queries: Callable[..., AbstractContextManager[Any]]) -> None:
+    user = UserFactory.create()
+    session_key = logged_in_session(user)
+
+    assert async_to_sync(aget_user)(make_request(session_key)) == user
+    with assert_max_queries(0):
+        cached = async_to_sync(aget_user)(make_request(session_key))
+        # What `services.get_profile` needs is prefetched
+        emails = list(cached.emailaddress_set.all())
+
+    assert cached == user
+    assert emails == []
+
+
+@pytest.mark.django_db
+def test_session_token() -> None:
+    user = UserFactory.create()
+    session_key = logged_in_session(user)
+
+    assert async_to_sync(aget_user)(make_request(HTTP_X_SESSION_TOKEN=session_key)) == user
+
+
+@pytest.mark.django_db
+def test_anonymous() -> None:
+    assert not async_to_sync(aget_user)(make_request()).is_authenticated
+    assert not async_to_sync(aget_user)(make_request(HTTP_X_SESSION_TOKEN="unknown")).is_authenticated  # noqa: S106 - Not a secret
+
+
+@pytest.mark.django_db
+def test_password_change_logs_out_other_sessions(django_capture_on_commit_callbacks: CaptureOnCommit) -> None:
+    user = UserFactory.create()
+    session_key = logged_in_session(user)
+    assert async_to_sync(aget_user)(make_request(session_key)) == user
+
+    with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+        user.set_password("A new password 123!")
+        user.save()
+
+    assert not async_to_sync(aget_user)(make_request(session_key)).is_authenticated
+
+
+@pytest.mark.django_db
+def test_deactivated_user(django_capture_on_commit_callbacks: CaptureOnCommit) -> None:
+    user = UserFactory.create()
+    session_key = logged_in_session(user)
+    assert async_to_sync(aget_user)(make_request(session_key)) == user
+
+    with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+        user.is_active = False
+        user.save()
+
+    assert isinstance(async_to_sync(aget_user)(make_request(session_key)), DeactivatedUser)
+
+
+@pytest.mark.django_db
+def test_password_hash_is_not_cached() -> None:
+    user = UserFactory.create()
+    user.set_password("A real password 123!")
+    user.save()
+    async_to_sync(aget_user)(make_request(logged_in_session(user)))
+
+    cached, _ = async_to_sync(users.aget)(str(user.uuid))
+
+    assert "password" in cached.get_deferred_fields()
+    assert user.password.encode() not in pickle.dumps(cached)
+
+
+@pytest.mark.django_db
+def test_logout_applies_to_every_process() -> None:
+    user = UserFactory.create()
+    session_key = logged_in_session(user)
+    assert async_to_sync(aget_user)(make_request(session_key)) == user
+    # Sessions are only cached in the shared tier, which other processes read too
+    assert len(session_users.local) == 0
+
+    async_to_sync(adrop_session)(session_key)
+
+    assert async_to_sync(session_users.aget)(session_key) is None
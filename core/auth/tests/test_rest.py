@@ -35,3 +35,19 @@ def test_get_profile_unauthenticated() -> None:
 
     # Assert
     assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_get_profile_deactivated() -> None:
+    # Arrange
+    user = UserFactory.create(is_active=False)
+    client = Client()
+    client.force_login(user)
+    url = reverse("api:profile-read")
+
+    # Act
+    response = client.get(url)
+
+    # Assert
+    assert response.status_code == 401
+    assert response.json()["errors"][0]["code"] == "account_deactivated"
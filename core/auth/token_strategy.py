@@ -1,9 +1,13 @@
+from importlib import import_module
 from typing import Any
 
 from allauth.headless.tokens.sessions import SessionTokenStrategy
+from django.conf import settings
 from django.contrib.sessions.backends.base import SessionBase
 from django.http import HttpRequest
 
+from lib.sessions.backend import SessionStore as RedisSessionStore
+
 # Override this to customize token creation / payload
 
 
@@ -18,4 +22,8 @@ class TokenStrategy(SessionTokenStrategy):
         return super().create_session_token(request)
 
     def lookup_session(self, session_token: str) -> Any | SessionBase | None:
+        session = import_module(settings.SESSION_ENGINE).SessionStore(session_token)
+        if isinstance(session, RedisSessionStore):
+            # A single GET, where the default checks the session exists before loading it
+            return session if session.preload() else None
         return super().lookup_session(session_token)
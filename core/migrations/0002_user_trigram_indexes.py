@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:12
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        # Needed by `lib.search.trigram_index`
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper(
+                        django.db.models.functions.comparison.Cast("email", output_field=models.TextField())
+                    ),
+                    name="gin_trgm_ops",
+                ),
+                name="user_email_trg",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper(
+                        django.db.models.functions.comparison.Cast("full_name", output_field=models.TextField())
+                    ),
+                    name="gin_trgm_ops",
+                ),
+                name="user_full_name_trg",
+            ),
+        ),
+    ]
@@ -1,5 +1,12 @@
+from .singleflight import SingleFlight
+from .streaming import Progress, ProgressHook, abatched, astream
 from .utils import alist
 
 __all__ = [
+    "Progress",
+    "ProgressHook",
+    "SingleFlight",
+    "abatched",
     "alist",
+    "astream",
 ]
@@ -0,0 +1,73 @@
+import asyncio
+import weakref
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+
+
+class SingleFlight[K: Hashable, T]:
+    """Coalesces concurrent calls for the same key, so that callers arriving while a call is in flight share its result.
+
+    Results aren't kept once a call completes; pair this with a cache. In-flight calls are tracked per event loop,
+    and aren't cancelled when one of their callers is.
+    """
+
+    def __init__(self) -> None:
+        self._calls: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[K, asyncio.Future[T]]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _loop_calls(self) -> dict[K, asyncio.Future[T]]:
+        loop = asyncio.get_running_loop()
+        calls = self._calls.get(loop)
+        if calls is None:
+            calls = self._calls[loop] = {}
+        return calls
+
+    def in_flight(self, key: K) -> bool:
+        return key in self._loop_calls()
+
+    async def run(self, key: K, func: Callable[[], Awaitable[T]]) -> T:
+        """Returns the result of `func()`, or of the call already in flight for `key`."""
+        calls = self._loop_calls()
+        future = calls.get(key)
+        if future is None:
+            future = calls[key] = asyncio.ensure_future(func())
+            future.add_done_callback(lambda _: calls.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def run_many(self, keys: Sequence[K], func: Callable[[list[K]], Awaitable[Sequence[T]]]) -> list[T]:
+        """Returns the results for `keys`, calling `func` once with the keys that aren't already in flight.
+
+        `func` must return one result per key, in order, like `DataLoader.execute` implementations.
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._loop_calls()
+        missing = [key for key in dict.fromkeys(keys) if key not in calls]
+        if missing:
+            futures = [loop.create_future() for _ in missing]
+            for key, future in zip(missing, futures, strict=True):
+                calls[key] = future
+            batch = asyncio.ensure_future(func(missing))
+            batch.add_done_callback(lambda batch: self._settle(calls, missing, futures, batch))
+        return list(await asyncio.gather(*(asyncio.shield(calls[key]) for key in keys)))
+
+    def _settle(
+        self,
+        calls: dict[K, asyncio.Future[T]],
+        keys: list[K],
+        futures: list[asyncio.Future[T]],
+        batch: asyncio.Future[Sequence[T]],
+    ) -> None:
+        for key in keys:
+            calls.pop(key, None)
+        if batch.cancelled():
+            for future in futures:
+                future.cancel()
+            return
+        error = batch.exception()
+        if error is None and len(batch.result()) != len(keys):
+            error = ValueError(f"Expected {len(keys)} results, got {len(batch.result())}")
+        for i, future in enumerate(futures):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(batch.result()[i])
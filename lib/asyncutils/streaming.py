@@ -0,0 +1,65 @@
+import inspect
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from itertools import islice
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
+
+
+class Progress(NamedTuple):
+    """How far a stream has got, passed to progress hooks after each batch."""
+
+    batches: int
+    rows: int
+
+
+type ProgressHook = Callable[[Progress], Awaitable[None] | None]
+
+
+async def abatched[T](
+    iterable: Iterable[T],
+    n: int = 2000,
+    *,
+    on_progress: ProgressHook | None = None,
+) -> AsyncIterator[list[T]]:
+    """Yields the items of `iterable` in lists of at most `n`, holding a single batch in memory at a time.
+
+    Querysets are read with `QuerySet.iterator`, which uses a server-side cursor on Postgres, fetching `n` rows per
+    round trip. Like `QuerySet.aiterator`, each batch is fetched in the thread the ORM runs sync code in; batches are
+    handed over whole rather than row by row. `on_progress` is called (or awaited) after each batch.
+
+    Wrap the stream in `contextlib.aclosing` when it may not be read to the end, so the cursor is closed right away.
+    """
+    if n < 1:
+        raise ValueError("Batches must hold at least one item")
+    iterator: Iterator[T] = iterable.iterator(chunk_size=n) if isinstance(iterable, QuerySet) else iter(iterable)
+    next_batch = sync_to_async(lambda: list(islice(iterator, n)))
+    progress = Progress(batches=0, rows=0)
+    try:
+        while batch := await next_batch():
+            progress = Progress(batches=progress.batches + 1, rows=progress.rows + len(batch))
+            yield batch
+            if on_progress is not None:
+                result = on_progress(progress)
+                if inspect.isawaitable(result):
+                    await result
+            if len(batch) < n:
+                break
+    finally:
+        # Closes the server-side cursor, from the thread that opened it
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close)()
+
+
+async def astream[T](
+    iterable: Iterable[T],
+    chunk_size: int = 2000,
+    *,
+    on_progress: ProgressHook | None = None,
+) -> AsyncIterator[T]:
+    """Yields the items of `iterable` one by one, fetching them in chunks of `chunk_size`, see `abatched`."""
+    async for batch in abatched(iterable, chunk_size, on_progress=on_progress):
+        for item in batch:
+            yield item
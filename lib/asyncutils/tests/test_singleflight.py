@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from ..singleflight import SingleFlight
+
+
+def test_run_coalesces_concurrent_calls() -> None:
+    flights: SingleFlight[str, int] = SingleFlight()
+    calls: list[str] = []
+
+    async def compute() -> int:
+        calls.append("a")
+        await asyncio.sleep(0.01)
+        return 1
+
+    async def run() -> list[int]:
+        return list(await asyncio.gather(*(flights.run("a", compute) for _ in range(5))))
+
+    assert async_to_sync(run)() == [1] * 5
+    assert calls == ["a"]
+    # Results aren't kept once the call completes
+    assert async_to_sync(flights.run)("a", compute) == 1
+    assert calls == ["a", "a"]
+
+
+def test_run_shares_errors() -> None:
+    flights: SingleFlight[str, int] = SingleFlight()
+
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def run() -> list[int | BaseException]:
+        return list(await asyncio.gather(flights.run("a", fail), flights.run("a", fail), return_exceptions=True))
+
+    assert [type(result) for result in async_to_sync(run)()] == [ValueError, ValueError]
+
+
+def test_run_many_only_loads_keys_not_in_flight() -> None:
+    flights: SingleFlight[int, int] = SingleFlight()
+    batches: list[list[int]] = []
+
+    async def load(keys: list[int]) -> list[int]:
+        batches.append(keys)
+        await asyncio.sleep(0.01)
+        return [key * 10 for key in keys]
+
+    async def run() -> list[list[int]]:
+        return list(await asyncio.gather(flights.run_many([1, 2], load), flights.run_many([2, 3, 3], load)))
+
+    assert async_to_sync(run)() == [[10, 20], [20, 30, 30]]
+    assert batches == [[1, 2], [3]]
+
+
+def test_run_many_checks_result_count() -> None:
+    flights: SingleFlight[int, int] = SingleFlight()
+
+    async def load(keys: list[int]) -> list[int]:  # noqa: ARG001 # Returns too few results on purpose
+        return []
+
+    with pytest.raises(ValueError, match="Expected 2 results"):
+        async_to_sync(flights.run_many)([1, 2], load)
@@ -0,0 +1,63 @@
+from contextlib import aclosing
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from core.auth.tests.factories import UserFactory
+from core.models import User
+
+from ..streaming import Progress, abatched, astream
+
+
+async def collect_batches(*args: object, **kwargs: object) -> list[list[object]]:
+    return [batch async for batch in abatched(*args, **kwargs)]  # type: ignore
+
+
+def test_abatched_splits_iterables() -> None:
+    assert async_to_sync(collect_batches)(range(5), 2) == [[0, 1], [2, 3], [4]]
+    assert async_to_sync(collect_batches)([], 2) == []
+
+
+def test_abatched_rejects_empty_batches() -> None:
+    with pytest.raises(ValueError, match="at least one"):
+        async_to_sync(collect_batches)(range(5), 0)
+
+
+def test_progress_hooks_are_called_after_each_batch() -> None:
+    reported: list[Progress] = []
+
+    async def on_progress(progress: Progress) -> None:
+        reported.append(progress)
+
+    async def run() -> list[int]:
+        return [item async for item in astream(range(5), 2, on_progress=on_progress)]
+
+    assert async_to_sync(run)() == [0, 1, 2, 3, 4]
+    assert reported == [Progress(batches=1, rows=2), Progress(batches=2, rows=4), Progress(batches=3, rows=5)]
+
+
+@pytest.mark.django_db
+def test_astream_reads_querysets_in_chunks() -> None:
+    users = UserFactory.create_batch(5)
+    reported: list[Progress] = []
+
+    async def run() -> list[User]:
+        queryset = User.objects.order_by("pk")
+        return [user async for user in astream(queryset, 2, on_progress=reported.append)]
+
+    assert [user.pk for user in async_to_sync(run)()] == [user.pk for user in users]
+    assert [progress.rows for progress in reported] == [2, 4, 5]
+
+
+@pytest.mark.django_db
+def test_abatched_stops_early() -> None:
+    UserFactory.create_batch(5)
+
+    async def run() -> list[User]:
+        # Closing the stream closes its cursor right away, rather than when it's garbage collected
+        async with aclosing(abatched(User.objects.order_by("pk"), 2)) as batches:
+            async for batch in batches:
+                return batch
+        return []
+
+    assert len(async_to_sync(run)()) == 2
@@ -0,0 +1,10 @@
+from .cache import CachedFunction, TieredCache, cached, default_key
+from .local import LocalCache
+
+__all__ = [
+    "CachedFunction",
+    "LocalCache",
+    "TieredCache",
+    "cached",
+    "default_key",
+]
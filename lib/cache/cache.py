@@ -0,0 +1,325 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable, Callable, Mapping
+from functools import update_wrapper
+from time import perf_counter, time
+from typing import Any, NamedTuple
+
+import redis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from opentelemetry import metrics
+
+from lib.asyncutils import SingleFlight
+
+from . import invalidation
+from .client import get_redis
+from .local import MISSING, LocalCache
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+cache_lookups = meter.create_counter(
+    "cache.lookups",
+    unit="{lookup}",
+    description="Number of cache lookups, by namespace, tier (local or shared) and result (hit or miss).",
+)
+cache_lookup_duration = meter.create_histogram(
+    "cache.lookup.duration",
+    unit="s",
+    description="Time taken by a cache lookup, by namespace and tier (local or shared).",
+)
+
+
+class _Stamped(NamedTuple):
+    # Values of namespaces serving stale entries, with the time (since the epoch) until which they're fresh
+    value: Any
+    fresh_until: float
+
+
+class TieredCache:
+    """A cache namespace layering a bounded in-process LRU (L1) over a Django cache (L2, Redis outside of tests).
+
+    Reads check L1, then L2, populating L1 on an L2 hit. Writes go to both. Keys are prefixed with the namespace
+    and `version`, so bumping the version invalidates every entry written with a different one, e.g. when the shape
+    of the cached values changes.
+
+    L1 entries live for at most `local_ttl` seconds, which bounds how stale a process can be when another process
+    changes a value. With `local_ttl=0`, entries are only kept in L2, so deleting one applies to every process at
+    once. Values must be picklable for L2, and must not be mutated once cached since L1 shares them.
+
+    `invalidated_by` maps model labels (e.g. "core.User") to a function giving the key cached for a row's uuid. When
+    such a row is saved or deleted, its entry is dropped from both tiers, in every process, once the transaction
+    commits. This keeps entries consistent with the database even with long TTLs.
+
+    `aget_or_set` coalesces concurrent misses for a key in the process, so that only one caller computes the value.
+    With `lock_timeout`, callers in other processes wait up to that long on a Redis lock for it too. With
+    `stale_ttl`, entries are kept that much longer than `ttl`, and served while a single background task refreshes
+    them.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        ttl: float,
+        local_ttl: float | None = None,
+        max_size: int | None = None,
+        version: int = 1,
+        alias: str = "default",
+        invalidated_by: Mapping[str, Callable[[uuid.UUID], str]] | None = None,
+        stale_ttl: float = 0,
+        lock_timeout: float | None = None,
+    ) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.version = version
+        self.alias = alias
+        self.local = LocalCache(
+            max_size=max_size or settings.CACHE_LOCAL_MAX_SIZE,
+            ttl=min(ttl, settings.CACHE_LOCAL_TTL if local_ttl is None else local_ttl),
+        )
+        self._attributes = {
+            (tier, result): {"cache.namespace": namespace, "cache.tier": tier, "cache.result": result}
+            for tier in ("local", "shared")
+            for result in ("hit", "miss")
+        }
+        self._tier_attributes = {
+            tier: {"cache.namespace": namespace, "cache.tier": tier} for tier in ("local", "shared")
+        }
+        self._flights: SingleFlight[str, Any] = SingleFlight()
+        self._refreshes: set[asyncio.Task[Any]] = set()
+        self.invalidated_by = dict(invalidated_by or {})
+        if self.invalidated_by:
+            invalidation.register(self)
+
+    def make_key(self, key: str) -> str:
+        return f"{self.namespace}:v{self.version}:{key}"
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """Returns the cached value for `key`, stale or not, or `default` if neither tier has it."""
+        value = await self._aget(self.make_key(key))
+        if isinstance(value, _Stamped):
+            return value.value
+        return default if value is MISSING else value
+
+    async def aset(self, key: str, value: Any, ttl: float | None = None) -> None:
+        full_key = self.make_key(key)
+        ttl = self.ttl if ttl is None else ttl
+        if self.stale_ttl:
+            value = _Stamped(value, time() + ttl)
+            ttl += self.stale_ttl
+        await _shared_set(caches[self.alias], full_key, value, ttl)
+        self.local.set(full_key, value, min(ttl, self.local.ttl))
+
+    async def adelete(self, key: str) -> None:
+        full_key = self.make_key(key)
+        self.local.delete(full_key)
+        await _shared_delete(caches[self.alias], full_key)
+
+    async def aget_or_set(self, key: str, default: Callable[[], Awaitable[Any]], ttl: float | None = None) -> Any:
+        """Returns the cached value for `key`, computing and caching it with `default` on a miss."""
+        full_key = self.make_key(key)
+        value = await self._aget(full_key)
+        if isinstance(value, _Stamped):
+            if value.fresh_until <= time() and not self._flights.in_flight(full_key):
+                self._refresh(key, default, ttl)
+            return value.value
+        if value is not MISSING:
+            return value
+        return await self._flights.run(full_key, lambda: self._compute(key, default, ttl, wait=True))
+
+    def _refresh(self, key: str, default: Callable[[], Awaitable[Any]], ttl: float | None) -> None:
+        task = asyncio.create_task(
+            self._flights.run(self.make_key(key), lambda: self._compute(key, default, ttl, wait=False))
+        )
+        # The loop only keeps weak references to tasks
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshed)
+
+    def _refreshed(self, task: asyncio.Task[Any]) -> None:
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Failed to refresh a stale cache entry", exc_info=task.exception())
+
+    async def _compute(self, key: str, default: Callable[[], Awaitable[Any]], ttl: float | None, *, wait: bool) -> Any:
+        """Computes and caches the value of `key`, holding the namespace's Redis lock for it if it has one.
+
+        When waiting, the value is computed without the lock if it can't be acquired in time. Otherwise, nothing is
+        computed if another process holds the lock.
+        """
+        lock = self._lock(key)
+        acquired = lock is not None and await _acquire(lock, blocking=wait)
+        if lock is not None and not acquired and not wait:
+            return None
+        try:
+            if acquired:
+                # Another process may have computed the value while this one waited for the lock
+                value = await _shared_get(caches[self.alias], self.make_key(key))
+                if value is not MISSING and not (isinstance(value, _Stamped) and value.fresh_until <= time()):
+                    self.local.set(self.make_key(key), value)
+                    return value.value if isinstance(value, _Stamped) else value
+            value = await default()
+            await self.aset(key, value, ttl)
+            return value
+        finally:
+            if acquired and lock is not None:
+                await _release(lock)
+
+    def _lock(self, key: str) -> redis.lock.Lock | None:
+        client = get_redis() if self.lock_timeout else None
+        if client is None:
+            return None
+        return client.lock(
+            f"{self.make_key(key)}:lock",
+            timeout=self.lock_timeout,
+            blocking_timeout=self.lock_timeout,
+            # Acquired and released on different executor threads
+            thread_local=False,
+        )
+
+    def delete_local(self, key: str) -> None:
+        """Drops `key` from this process only, e.g. when another process has already deleted it from L2."""
+        self.local.delete(self.make_key(key))
+
+    def invalidate_models(self, invalidated: Mapping[str, frozenset[uuid.UUID]], *, shared: bool) -> None:
+        """Drops the entries of the given rows, from the shared tier too if `shared`. See `invalidated_by`."""
+        keys = [
+            self.make_key(make_key(row))
+            for label, make_key in self.invalidated_by.items()
+            for row in invalidated.get(label, ())
+        ]
+        if not keys:
+            return
+        for key in keys:
+            self.local.delete(key)
+        if shared:
+            caches[self.alias].delete_many(keys)
+
+    async def _aget(self, full_key: str) -> Any:
+        start = perf_counter()
+        value = self.local.get(full_key)
+        if value is not MISSING:
+            cache_lookups.add(1, self._attributes["local", "hit"])
+            cache_lookup_duration.record(perf_counter() - start, self._tier_attributes["local"])
+            return value
+        cache_lookups.add(1, self._attributes["local", "miss"])
+        if self.invalidated_by:
+            invalidation.ensure_subscribed()
+
+        start = perf_counter()
+        value = await _shared_get(caches[self.alias], full_key)
+        cache_lookup_duration.record(perf_counter() - start, self._tier_attributes["shared"])
+        if value is MISSING:
+            cache_lookups.add(1, self._attributes["shared", "miss"])
+            return MISSING
+        cache_lookups.add(1, self._attributes["shared", "hit"])
+        self.local.set(full_key, value)
+        return value
+
+
+# Django's async cache methods run the sync ones with `thread_sensitive=True`, which queues them behind the ORM on the
+# single thread executor. Cache clients are thread safe, so they can run on the default executor instead.
+
+
+@sync_to_async(thread_sensitive=False)
+def _shared_get(cache: Any, key: str) -> Any:
+    return cache.get(key, MISSING)
+
+
+@sync_to_async(thread_sensitive=False)
+def _shared_set(cache: Any, key: str, value: Any, ttl: float) -> None:
+    cache.set(key, value, ttl)
+
+
+@sync_to_async(thread_sensitive=False)
+def _shared_delete(cache: Any, key: str) -> None:
+    cache.delete(key)
+
+
+@sync_to_async(thread_sensitive=False)
+def _acquire(lock: redis.lock.Lock, *, blocking: bool) -> bool:
+    try:
+        return bool(lock.acquire(blocking=blocking))
+    except redis.RedisError:
+        logger.exception("Failed to acquire a cache lock", extra={"lock": lock.name})
+        return False
+
+
+@sync_to_async(thread_sensitive=False)
+def _release(lock: redis.lock.Lock) -> None:
+    try:
+        lock.release()
+    except redis.RedisError:
+        # The lock expired (see `lock_timeout`) or Redis is unavailable, it'll expire on its own either way
+        logger.warning("Failed to release a cache lock", extra={"lock": lock.name})
+
+
+class CachedFunction[**P, T]:
+    """An async function whose results are cached in a `TieredCache`. See `cached`."""
+
+    def __init__(
+        self, func: Callable[P, Awaitable[T]], cache: TieredCache, key: Callable[P, str] | None = None
+    ) -> None:
+        self.func = func
+        self.cache = cache
+        self.key = key or default_key
+        update_wrapper(self, func)
+
+    async def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+        return await self.cache.aget_or_set(self.key(*args, **kwargs), lambda: self.func(*args, **kwargs))
+
+    async def invalidate(self, *args: P.args, **kwargs: P.kwargs) -> None:
+        """Deletes the cached result for the given arguments."""
+        await self.cache.adelete(self.key(*args, **kwargs))
+
+
+def _key_part(value: Any) -> str:
+    # Models are identified by their uuid rather than their (possibly stale) field values
+    return str(getattr(value, "uuid", value))
+
+
+def default_key(*args: Any, **kwargs: Any) -> str:
+    """Builds a key from the arguments of a call, using the uuid of models passed as arguments."""
+    parts = [_key_part(arg) for arg in args]
+    parts += [f"{name}={_key_part(value)}" for name, value in sorted(kwargs.items())]
+    return ":".join(parts)
+
+
+def cached[**P, T](
+    namespace: str,
+    *,
+    ttl: float,
+    local_ttl: float | None = None,
+    max_size: int | None = None,
+    version: int = 1,
+    key: Callable[P, str] | None = None,
+    invalidated_by: Mapping[str, Callable[[uuid.UUID], str]] | None = None,
+    stale_ttl: float = 0,
+    lock_timeout: float | None = None,
+) -> Callable[[Callable[P, Awaitable[T]]], CachedFunction[P, T]]:
+    """Caches the results of an async function in a `TieredCache` namespace.
+
+    The key is built from the call's arguments (see `default_key`) unless `key` is given. The cache is available on
+    the decorated function as `.cache`, and `.invalidate(...)` deletes the result cached for the given arguments.
+    Concurrent calls with the same arguments share a single call. See `TieredCache` for the other options.
+    """
+    cache = TieredCache(
+        namespace,
+        ttl=ttl,
+        local_ttl=local_ttl,
+        max_size=max_size,
+        version=version,
+        invalidated_by=invalidated_by,
+        stale_ttl=stale_ttl,
+        lock_timeout=lock_timeout,
+    )
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> CachedFunction[P, T]:
+        return CachedFunction(func, cache, key)
+
+    return decorator
@@ -0,0 +1,18 @@
+import threading
+
+import redis
+from django.conf import settings
+
+_lock = threading.Lock()
+_client: redis.Redis | None = None
+
+
+def get_redis() -> redis.Redis | None:
+    """The Redis client used for cache invalidations and locks, or None if Redis isn't configured."""
+    global _client  # noqa: PLW0603 # Created lazily, once per process
+    if not settings.CACHE_REDIS_URL:
+        return None
+    with _lock:
+        if _client is None:
+            _client = redis.Redis.from_url(settings.CACHE_REDIS_URL)
+        return _client
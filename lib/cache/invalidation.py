@@ -0,0 +1,96 @@
+import json
+import logging
+import threading
+import uuid
+import weakref
+from time import sleep
+from typing import TYPE_CHECKING, Any
+
+import redis
+from django.conf import settings
+from django.dispatch import receiver
+
+from lib.models import models_invalidated
+
+from .client import get_redis
+
+if TYPE_CHECKING:
+    from .cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process, so that it ignores the invalidations it published itself
+_origin = uuid.uuid4().hex
+_caches: "weakref.WeakSet[TieredCache]" = weakref.WeakSet()
+_lock = threading.Lock()
+_subscriber: threading.Thread | None = None
+
+
+def register(cache: "TieredCache") -> None:
+    """Invalidates `cache` when the models it depends on change, in this process or another one."""
+    _caches.add(cache)
+
+
+@receiver(models_invalidated)
+def handle_models_invalidated(*, invalidated: dict[str, frozenset[uuid.UUID]], remote: bool, **_: Any) -> None:
+    """
+    Signal receiver dropping the invalidated entries, then telling other processes about local changes.
+    """
+    for cache in list(_caches):
+        # The process making the change clears the shared tier before other processes drop their local copies, so
+        # they can't repopulate them with stale values
+        cache.invalidate_models(invalidated, shared=not remote)
+
+    client = get_redis()
+    if remote or client is None:
+        return
+    message = {
+        "origin": _origin,
+        "invalidated": {label: [str(u) for u in uuids] for label, uuids in invalidated.items()},
+    }
+    try:
+        client.publish(settings.CACHE_INVALIDATION_CHANNEL, json.dumps(message))
+    except redis.RedisError:
+        logger.exception("Failed to publish cache invalidations", extra={"models": list(invalidated)})
+
+
+def ensure_subscribed() -> None:
+    """Starts receiving invalidations from other processes, if it hasn't started yet."""
+    global _subscriber  # noqa: PLW0603 # Started lazily, once per process
+    if _subscriber is not None or not settings.CACHE_REDIS_URL:
+        return
+    with _lock:
+        if _subscriber is None:
+            _subscriber = threading.Thread(target=_subscribe, name="cache-invalidation", daemon=True)
+            _subscriber.start()
+
+
+def _subscribe() -> None:
+    client = redis.Redis.from_url(settings.CACHE_REDIS_URL)
+    while True:
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+            # Invalidations may have been missed while (re)connecting
+            for cache in list(_caches):
+                cache.local.clear()
+            for message in pubsub.listen():
+                try:
+                    _receive(message["data"])
+                except Exception:
+                    logger.exception("Failed to apply a cache invalidation")
+        except redis.RedisError:
+            logger.exception("Lost the cache invalidation subscription, reconnecting")
+            sleep(1)
+
+
+def _receive(data: bytes) -> None:
+    try:
+        message = json.loads(data)
+        if message["origin"] == _origin:
+            return
+        invalidated = {label: frozenset(uuid.UUID(u) for u in uuids) for label, uuids in message["invalidated"].items()}
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Ignoring malformed cache invalidation", extra={"data": data})
+        return
+    models_invalidated.send(sender=None, invalidated=invalidated, remote=True)
@@ -0,0 +1,122 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache as shared_cache
+from freezegun import freeze_time
+
+from ..cache import TieredCache, cached, default_key
+
+
+@pytest.fixture
+def cache() -> TieredCache:
+    # A unique namespace keeps the shared (locmem) cache from leaking values between tests
+    return TieredCache(f"test-{uuid.uuid4()}", ttl=60, local_ttl=10, max_size=10)
+
+
+def test_set_and_get(cache: TieredCache) -> None:
+    async_to_sync(cache.aset)("a", {"value": 1})
+
+    assert async_to_sync(cache.aget)("a") == {"value": 1}
+    assert async_to_sync(cache.aget)("b", "default") == "default"
+
+
+def test_shared_hit_populates_local(cache: TieredCache) -> None:
+    shared_cache.set(cache.make_key("a"), 1)
+
+    assert async_to_sync(cache.aget)("a") == 1
+    shared_cache.delete(cache.make_key("a"))
+    assert async_to_sync(cache.aget)("a") == 1
+
+
+def test_delete_local_falls_back_to_shared(cache: TieredCache) -> None:
+    async_to_sync(cache.aset)("a", 1)
+    shared_cache.set(cache.make_key("a"), 2)
+    cache.delete_local("a")
+
+    assert async_to_sync(cache.aget)("a") == 2
+
+
+def test_delete(cache: TieredCache) -> None:
+    async_to_sync(cache.aset)("a", 1)
+    async_to_sync(cache.adelete)("a")
+
+    assert async_to_sync(cache.aget)("a") is None
+
+
+def test_versions_are_isolated(cache: TieredCache) -> None:
+    async_to_sync(cache.aset)("a", 1)
+    other = TieredCache(cache.namespace, ttl=60, version=2)
+
+    assert async_to_sync(other.aget)("a") is None
+
+
+def test_cached_function() -> None:
+    calls: list[str] = []
+
+    @cached(f"test-{uuid.uuid4()}", ttl=60)
+    async def get_name(*, name: str) -> str:
+        calls.append(name)
+        return name.upper()
+
+    assert async_to_sync(get_name)(name="a") == "A"
+    assert async_to_sync(get_name)(name="a") == "A"
+    assert calls == ["a"]
+
+    async_to_sync(get_name.invalidate)(name="a")
+    assert async_to_sync(get_name)(name="a") == "A"
+    assert calls == ["a", "a"]
+
+
+def test_cached_function_caches_none() -> None:
+    calls: list[int] = []
+
+    @cached(f"test-{uuid.uuid4()}", ttl=60)
+    async def find() -> None:
+        calls.append(1)
+
+    async_to_sync(find)()
+    async_to_sync(find)()
+
+    assert calls == [1]
+
+
+def test_default_key_uses_model_uuid() -> None:
+    user = SimpleNamespace(uuid=uuid.UUID(int=1), email="a@example.com")
+
+    assert default_key("x", user=user, page=2) == f"x:page=2:user={user.uuid}"
+
+
+def test_get_or_set_coalesces_concurrent_misses(cache: TieredCache) -> None:
+    calls: list[str] = []
+
+    async def compute() -> str:
+        calls.append("a")
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run() -> list[str]:
+        return list(await asyncio.gather(*(cache.aget_or_set("a", compute) for _ in range(5))))
+
+    assert async_to_sync(run)() == ["value"] * 5
+    assert calls == ["a"]
+
+
+def test_get_or_set_serves_stale_values_while_refreshing() -> None:
+    cache = TieredCache(f"test-{uuid.uuid4()}", ttl=60, stale_ttl=60)
+    values = iter(["old", "new"])
+
+    async def compute() -> str:
+        return next(values)
+
+    async def run() -> list[str]:
+        with freeze_time("2025-01-01 00:00:00") as frozen:
+            first = await cache.aget_or_set("a", compute)
+            frozen.tick(90)
+            stale = await cache.aget_or_set("a", compute)
+        await asyncio.gather(*cache._refreshes)  # noqa: SLF001 # Waits for the background refresh
+        return [first, stale, await cache.aget("a")]
+
+    assert async_to_sync(run)() == ["old", "old", "new"]
@@ -0,0 +1,45 @@
+import uuid
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache as shared_cache
+from django.db import transaction
+
+from core.auth.tests.factories import UserFactory
+from lib.models import models_invalidated
+
+from ..cache import TieredCache
+
+type CaptureOnCommit = Callable[..., AbstractContextManager[list[Callable[[], None]]]]
+
+
+@pytest.fixture
+def cache() -> TieredCache:
+    return TieredCache(f"test-{uuid.uuid4()}", ttl=60, invalidated_by={"core.User": str})
+
+
+@pytest.mark.django_db
+def test_saving_a_model_invalidates_its_entry(
+    cache: TieredCache, django_capture_on_commit_callbacks: CaptureOnCommit
+) -> None:
+    user = UserFactory.create()
+    async_to_sync(cache.aset)(str(user.uuid), "cached")
+    async_to_sync(cache.aset)("other", "cached")
+
+    with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+        user.save()
+
+    assert async_to_sync(cache.aget)(str(user.uuid)) is None
+    assert async_to_sync(cache.aget)("other") == "cached"
+
+
+def test_remote_invalidations_only_clear_the_local_tier(cache: TieredCache) -> None:
+    row = uuid.uuid4()
+    async_to_sync(cache.aset)(str(row), "cached")
+
+    models_invalidated.send(sender=None, invalidated={"core.User": frozenset({row})}, remote=True)
+
+    assert cache.local.get(cache.make_key(str(row)), None) is None
+    assert shared_cache.get(cache.make_key(str(row))) == "cached"
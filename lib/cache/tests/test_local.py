@@ -0,0 +1,42 @@
+from freezegun import freeze_time
+
+from ..local import MISSING, LocalCache
+
+
+def test_get_missing() -> None:
+    cache = LocalCache(max_size=2, ttl=60)
+
+    assert cache.get("a") is MISSING
+    assert cache.get("a", None) is None
+
+
+def test_evicts_least_recently_used() -> None:
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+
+
+def test_entries_expire() -> None:
+    cache = LocalCache(max_size=2, ttl=60)
+    with freeze_time("2025-01-01 00:00:00") as frozen:
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=120)
+        frozen.tick(90)
+
+        assert cache.get("a") is MISSING
+        assert cache.get("b") == 2
+        assert len(cache) == 1
+
+
+def test_nothing_stored_without_ttl() -> None:
+    cache = LocalCache(max_size=2, ttl=0)
+    cache.set("a", 1)
+
+    assert len(cache) == 0
+    assert cache.get("a") is MISSING
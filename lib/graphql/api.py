@@ -27,7 +27,9 @@ class GraphQLAPI:
         for endpoint in self.endpoints:
             urls.append(
                 path(
-                    endpoint.path, AsyncGraphQLView.as_view(schema=endpoint.schema), name=f"graphql-api:{endpoint.name}"
+                    endpoint.path,
+                    AsyncGraphQLView.as_view(schema=endpoint.schema, slice_name=endpoint.name),
+                    name=f"graphql-api:{endpoint.name}",
                 )
             )
         return urls
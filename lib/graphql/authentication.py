@@ -1,5 +1,4 @@
-from collections.abc import Generator
-from typing import Any
+from collections.abc import AsyncGenerator
 
 from strawberry import extensions
 
@@ -7,8 +6,10 @@ from lib.errors import UnauthenticatedError
 
 
 class AuthenticationExtension(extensions.SchemaExtension):
-    def on_operation(self) -> Generator[None, Any]:
-        context = self.execution_context
-        if not context.context.request.user.is_authenticated:
+    async def on_operation(self) -> AsyncGenerator[None]:  # type: ignore # Async hooks are supported
+        request = self.execution_context.context.request
+        # `auser` is resolved by the authentication middleware without blocking the event loop
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
             raise UnauthenticatedError
         yield
@@ -4,6 +4,7 @@ import strawberry
 from strawberry.types.nodes import InlineFragment, Selection
 
 from core.models import AnonymousUser, User
+from lib.permissions import PermissionMemo
 
 from .context import Context
 from .loaders import DataLoader
@@ -16,6 +17,13 @@ class Info(strawberry.Info[Context, T]):
     def user(self) -> User | AnonymousUser:
         return self.context.request.user
 
+    @property
+    def permissions(self) -> PermissionMemo | None:
+        """
+        The permission decisions memoized for the request, see `lib.permissions.memo`.
+        """
+        return getattr(self.context.request, "permissions", None)
+
     def get_selection(self, *, path: list[str], depth: int = 1) -> set[str]:  # noqa: C901 - Necessary complexity
         """
         Get the selected fields in the query by recursing down the selection set.
@@ -1,10 +1,23 @@
+from typing import ClassVar
+
 import strawberry.dataloader
 
+from lib.asyncutils import SingleFlight
+
 
 class DataLoader[K, T](strawberry.dataloader.DataLoader[K, T]):
+    # Whether concurrent requests loading the same keys share a single `execute` call. Only enable this for loaders
+    # whose results don't depend on the request (e.g. the authenticated user).
+    coalesce: ClassVar[bool] = False
+    _flights: ClassVar[SingleFlight]
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._flights = SingleFlight()
+
     def __init__(self) -> None:
         super().__init__(
-            load_fn=self.execute,
+            load_fn=self._coalesced_execute if self.coalesce else self.execute,
             max_batch_size=100,
             cache=False,
         )
@@ -12,3 +25,6 @@ class DataLoader[K, T](strawberry.dataloader.DataLoader[K, T]):
     async def execute(self, keys: list[K]) -> list[T | None | Exception]:
         # Implement the logic to load data based on the keys
         raise NotImplementedError("Subclasses must implement this method.")
+
+    async def _coalesced_execute(self, keys: list[K]) -> list[T | Exception | None]:
+        return await self._flights.run_many(keys, self.execute)
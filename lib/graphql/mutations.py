@@ -6,7 +6,7 @@ from strawberry.field_extensions import InputMutationExtension as _InputMutation
 from strawberry.types import arguments
 from strawberry.types.field import StrawberryField
 
-from lib.validation import Input, ValidationRule, validate
+from lib.validation import Input, ValidationPlan, ValidationRule, validate
 
 from .info import Info
 
@@ -22,28 +22,40 @@ class Payload[T]:
 
 
 class GraphqlInput(Input):
-    def __init__(self, data: object, validators: dict[str, tuple[ValidationRule, ...]]) -> None:
+    """
+    The input of a mutation, validated with the plan compiled by its extension.
+
+    The fields of the input are copied onto it, so that rules read them as plain attributes; anything else (e.g.
+    properties of the input type) is looked up on the input itself.
+    """
+
+    def __init__(self, data: object, plan: ValidationPlan) -> None:
         self._data = data
-        self._validators = validators or {}
+        self._plan = plan
+        vars(self).update(vars(data))
 
     def as_dict(self) -> dict[str, Any]:
         return vars(self._data)
 
     @property
     def validators(self) -> dict[str, tuple[ValidationRule, ...]]:
-        return self._validators
+        return self._plan.validators
+
+    @property
+    def validation_plan(self) -> ValidationPlan:
+        return self._plan
 
-    def __getattribute__(self, name: str) -> Any:
-        if name in ("_data", "_validators", "validators", "as_dict"):
-            return super().__getattribute__(name)
-        if hasattr(self._data, name):
-            return getattr(self._data, name)
-        return super().__getattribute__(name)
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing from the instance, e.g. `_data` itself while it's being copied
+        if name == "_data":
+            raise AttributeError(name)
+        return getattr(self._data, name)
 
 
 class ValidatedInputMutationExtension(_InputMutationExtension):
     def __init__(self, validation_rules: dict[str, tuple[ValidationRule, ...]] | None = None) -> None:
         self._validation_rules = validation_rules or {}
+        self._plan = ValidationPlan.compile(self._validation_rules)
         super().__init__()
 
     def apply(self, field: StrawberryField) -> None:
@@ -65,9 +77,9 @@ class ValidatedInputMutationExtension(_InputMutationExtension):
     def resolve(self, next_: Any, source: Any, info: Info, **kwargs: Any) -> Any:  # type: ignore # Info class super
         input_ = kwargs.get("input")
         client_request_id = input_.__dict__.pop("client_request_id", None)
-        if input_ and self._validation_rules:
+        if input_ and self._plan.fields:
             async_to_sync(validate)(
-                GraphqlInput(data=input_, validators=self._validation_rules),
+                GraphqlInput(data=input_, plan=self._plan),
                 auth_user=info.user,
                 base_path=[*info.path.as_list(), "input"],
             )
@@ -78,9 +90,9 @@ class ValidatedInputMutationExtension(_InputMutationExtension):
     async def resolve_async(self, next_: Any, source: Any, info: Info, **kwargs: Any) -> Any:  # type: ignore # Info class super
         input_ = kwargs.get("input")
         client_request_id = input_.__dict__.pop("client_request_id", None)
-        if input_ and self._validation_rules:
+        if input_ and self._plan.fields:
             await validate(
-                GraphqlInput(data=input_, validators=self._validation_rules),
+                GraphqlInput(data=input_, plan=self._plan),
                 auth_user=info.user,
                 base_path=[*info.path.as_list(), "input"],
             )
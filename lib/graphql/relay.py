@@ -61,8 +61,8 @@ class Connection[T]:
 
 
 class PaginationExtension(extensions.FieldExtension):
-    def __init__(self, sorting_field: str = "id") -> None:
-        self._sorting_field = sorting_field
+    def __init__(self, ordering: Sequence[str] | None = None) -> None:
+        self._ordering = ordering
         super().__init__()
 
     def apply(self, field: field.StrawberryField) -> None:
@@ -140,6 +140,7 @@ class PaginationExtension(extensions.FieldExtension):
             cursor=cursor,
             limit=limit,
             forward=forward,
+            ordering=self._ordering,
         )
 
 
@@ -0,0 +1,13 @@
+from collections.abc import Iterator
+
+from strawberry import extensions
+from strawberry.types.graphql import OperationType
+
+from lib.replicas import allow_replica_reads
+
+
+class ReplicaReadsExtension(extensions.SchemaExtension):
+    def on_execute(self) -> Iterator[None]:
+        # Queries can read from the replicas whatever the HTTP method, mutations must read their own writes
+        allow_replica_reads(self.execution_context.operation_type == OperationType.QUERY)
+        yield
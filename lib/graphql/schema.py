@@ -6,6 +6,7 @@ from strawberry.schema.config import StrawberryConfig
 
 from .authentication import AuthenticationExtension
 from .info import Info
+from .replicas import ReplicaReadsExtension
 
 
 def make_schema(
@@ -19,7 +20,7 @@ def make_schema(
         mutation=mutation,
         types=types or (),
         # strawberry-federation specific
-        extensions=[AuthenticationExtension(), OpenTelemetryExtension()],
+        extensions=[AuthenticationExtension(), ReplicaReadsExtension(), OpenTelemetryExtension()],
         config=StrawberryConfig(info_class=Info),
         federation_version="2.11",
     )
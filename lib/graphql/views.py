@@ -1,5 +1,6 @@
 from typing import Any
 
+from django.conf import settings
 from django.http import HttpRequest, HttpResponse
 from graphql import GraphQLError
 from strawberry.django import views
@@ -8,11 +9,14 @@ from strawberry.types import ExecutionResult
 
 from lib.errors import BaseError, InputError
 from lib.monitoring import trace_async_function
+from lib.monitoring.profiling import graphql_operation_name, profile_tags
 
 from .context import Context
 
 
 class AsyncGraphQLView(views.AsyncGraphQLView):
+    slice_name: str | None = None
+
     async def get_context(self, request: HttpRequest, response: HttpResponse) -> Context:  # type: ignore # Need to return context
         return Context(
             request=request,
@@ -91,4 +95,11 @@ class AsyncGraphQLView(views.AsyncGraphQLView):
 
     @trace_async_function(name="graphql.dispatch")
     async def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:  # type: ignore
-        return await super().dispatch(request, *args, **kwargs)
+        if not settings.MONITORING_PYROSCOPE_TAGS_ENABLED:
+            return await super().dispatch(request, *args, **kwargs)
+
+        tags = {"graphql_operation": graphql_operation_name(request)}
+        if self.slice_name:
+            tags["slice"] = self.slice_name
+        with profile_tags(tags):
+            return await super().dispatch(request, *args, **kwargs)
@@ -1,8 +1,23 @@
-from .base import BaseLookUp, BaseLookUpManager, BaseLookUpManagerMixin, BaseModel
+from .base import BaseLookUp, BaseLookUpManager, BaseLookUpManagerMixin, BaseManager, BaseModel, BaseQuerySet
+from .indexes import brin_index, index_name, partial_index
+from .invalidation import invalidate, models_changed, models_invalidated
+from .lookups import LookUpIndex
+from .uuids import uuid7, uuid_timestamp
 
 __all__ = [
     "BaseLookUp",
     "BaseLookUpManager",
     "BaseLookUpManagerMixin",
+    "BaseManager",
     "BaseModel",
+    "BaseQuerySet",
+    "LookUpIndex",
+    "brin_index",
+    "index_name",
+    "invalidate",
+    "models_changed",
+    "models_invalidated",
+    "partial_index",
+    "uuid7",
+    "uuid_timestamp",
 ]
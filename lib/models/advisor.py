@@ -0,0 +1,225 @@
+# Recommends indexes from the shape of the SQL the app runs, see `./manage.py indexes advise`.
+# Statements are matched with regular expressions tuned to the SQL Django generates, not parsed.
+
+import math
+import re
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+
+from django.db import models
+
+from .indexes import brin_index, index_name, partial_index
+
+_column = r'"(?P<table>\w+)"\."(?P<column>\w+)"'
+# Placeholders as written by Django (%s), `normalize_sql` (?, (...)) or pg_stat_statements ($1)
+_value = r"(?:%s|\?|\$(?:\d+|\?)|\()"
+_equality = re.compile(_column + r"\s*(?:=|IN)\s*" + _value)
+_range = re.compile(_column + r"\s*(?:<=|>=|<|>)\s*" + _value)
+_null = re.compile(_column + r"\s+IS\s+(?P<negated>NOT\s+)?NULL")
+# `filter(flag=True)` is written as a bare `"table"."flag"`, and `filter(flag=False)` as `NOT "table"."flag"`
+_boolean = re.compile(r"(?:\bWHERE|\bAND|\()\s*(?P<negated>NOT\s+)?" + _column + r"(?=\s*(?:\bAND\b|\)|$))")
+_order = re.compile(_column + r"(?:\s+(?P<direction>ASC|DESC))?")
+_from = re.compile(r'\bFROM\s+"(?P<table>\w+)"')
+_end_of_where = re.compile(r"\s(?:ORDER BY|LIMIT|OFFSET|FOR UPDATE)\s")
+_end_of_order = re.compile(r"\s(?:LIMIT|OFFSET|FOR UPDATE)\s")
+
+# Tables with fewer rows are scanned quickly enough without a BRIN index
+BRIN_MIN_ROWS = 1_000_000
+# How closely `created_at` must follow the physical order of the rows for a BRIN index to narrow scans down
+BRIN_MIN_CORRELATION = 0.9
+
+PAGE_SIZE = 8192
+BTREE_FILL_FACTOR = 0.9
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """The columns of its main table a SELECT filters and sorts on."""
+
+    table: str
+    equality: tuple[str, ...] = ()
+    ranges: tuple[str, ...] = ()
+    # Descending columns are prefixed with "-"
+    ordering: tuple[str, ...] = ()
+    # (column, "null" | "not null" | "true" | "false") constant predicates, which partial indexes can cover
+    conditions: tuple[tuple[str, str], ...] = ()
+
+
+@dataclass(frozen=True)
+class TableStats:
+    """Planner statistics of a table, from `pg_class` and `pg_stats`."""
+
+    rows: float
+    pages: int
+    widths: Mapping[str, int] = field(default_factory=dict)
+    null_fractions: Mapping[str, float] = field(default_factory=dict)
+    true_fractions: Mapping[str, float] = field(default_factory=dict)
+    correlations: Mapping[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class Recommendation:
+    table: str
+    columns: tuple[str, ...]
+    kind: str = "btree"
+    conditions: tuple[tuple[str, str], ...] = ()
+    calls: int = 0
+    estimated_size: int | None = None
+
+    def to_index(self, fields_by_column: Mapping[str, str]) -> models.Index:
+        """The index to declare in the model's `Meta.indexes`, with columns mapped to field names."""
+        fields = [
+            ("-" if column.startswith("-") else "") + fields_by_column.get(column.lstrip("-"), column.lstrip("-"))
+            for column in self.columns
+        ]
+        if self.kind == "brin":
+            return brin_index(self.table, fields[0])
+        if self.conditions:
+            lookups = {
+                "null": ("__isnull", True),
+                "not null": ("__isnull", False),
+                "true": ("", True),
+                "false": ("", False),
+            }
+            condition = models.Q()
+            for column, predicate in self.conditions:
+                suffix, value = lookups[predicate]
+                condition &= models.Q(**{f"{fields_by_column.get(column, column)}{suffix}": value})
+            return partial_index(self.table, *fields, condition=condition)
+        return models.Index(fields=fields, name=index_name(self.table, fields))
+
+
+def parse_query(sql: str) -> QueryShape | None:
+    """The shape of a SELECT statement, or `None` for other statements."""
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    match = _from.search(sql)
+    if match is None:
+        return None
+    table = match["table"]
+    rest = sql[match.end() :]
+
+    where = ""
+    if (start := rest.find(" WHERE ")) != -1:
+        where = rest[start:]
+        if end := _end_of_where.search(where):
+            where = where[: end.start()]
+    ordering: list[str] = []
+    if (start := rest.find(" ORDER BY ")) != -1:
+        order = rest[start + len(" ORDER BY ") :]
+        if end := _end_of_order.search(order):
+            order = order[: end.start()]
+        ordering = [
+            ("-" if m["direction"] == "DESC" else "") + m["column"]
+            for m in _order.finditer(order)
+            if m["table"] == table
+        ]
+
+    def columns(pattern: re.Pattern[str]) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(m["column"] for m in pattern.finditer(where) if m["table"] == table))
+
+    conditions = [
+        (m["column"], "not null" if m["negated"] else "null") for m in _null.finditer(where) if m["table"] == table
+    ]
+    conditions += [
+        (m["column"], "false" if m["negated"] else "true") for m in _boolean.finditer(where) if m["table"] == table
+    ]
+    return QueryShape(
+        table=table,
+        equality=columns(_equality),
+        ranges=columns(_range),
+        ordering=tuple(ordering),
+        conditions=tuple(sorted(set(conditions))),
+    )
+
+
+def _index_columns(shape: QueryShape) -> list[str]:
+    conditioned = {column for column, _ in shape.conditions}
+    # Equality columns first, in a stable order, then the columns the rows are sorted or ranged on
+    columns = sorted(set(shape.equality) - conditioned)
+    if shape.ordering:
+        if len({column.startswith("-") for column in shape.ordering}) == 1:
+            # B-tree indexes can be scanned backwards, so a single direction doesn't need to be declared
+            ordering = [column.lstrip("-") for column in shape.ordering]
+        else:
+            ordering = list(shape.ordering)
+        columns += [column for column in ordering if column.lstrip("-") not in columns]
+    elif shape.ranges and shape.ranges[0] not in columns:
+        columns.append(shape.ranges[0])
+    return columns
+
+
+def _is_brin_candidate(shape: QueryShape, columns: list[str], stats: TableStats | None) -> bool:
+    if shape.ordering or shape.equality or columns != ["created_at"] or stats is None:
+        return False
+    return stats.rows >= BRIN_MIN_ROWS and stats.correlations.get("created_at", 0) >= BRIN_MIN_CORRELATION
+
+
+def _is_covered(kind: str, columns: Sequence[str], existing: Iterable[tuple[str, Sequence[str]]]) -> bool:
+    plain = [column.lstrip("-") for column in columns]
+    for existing_kind, existing_columns in existing:
+        if kind == "brin" and list(existing_columns[:1]) == plain:
+            return True
+        if existing_kind != "brin" and list(existing_columns[: len(plain)]) == plain:
+            return True
+    return False
+
+
+def estimate_size(recommendation: Recommendation, stats: TableStats) -> int:
+    """Estimates the size of the recommended index in bytes, from the planner statistics of its table."""
+    columns = [column.lstrip("-") for column in recommendation.columns]
+    width = sum(stats.widths.get(column, 8) for column in columns)
+    if recommendation.kind == "brin":
+        # A min and max summary per range of 128 pages, plus the meta and range map pages
+        ranges = math.ceil(stats.pages / 128)
+        return (math.ceil(ranges * (2 * width + 16) / PAGE_SIZE) + 2) * PAGE_SIZE
+
+    fraction = 1.0
+    for column, predicate in recommendation.conditions:
+        null_fraction = stats.null_fractions.get(column, 0.0)
+        true_fraction = stats.true_fractions.get(column, 0.5)
+        fraction *= {
+            "null": null_fraction,
+            "not null": 1 - null_fraction,
+            "true": true_fraction,
+            "false": 1 - true_fraction,
+        }[predicate]
+    # Index tuple header and line pointer, with the key aligned to 8 bytes
+    tuple_size = 8 + 4 + math.ceil(width / 8) * 8
+    leaf_pages = math.ceil(stats.rows * fraction * tuple_size / (PAGE_SIZE * BTREE_FILL_FACTOR))
+    # Roughly one internal page per hundred leaf pages, plus the meta page
+    return (leaf_pages + math.ceil(leaf_pages / 100) + 1) * PAGE_SIZE
+
+
+def recommend(
+    statements: Iterable[tuple[str, int]],
+    existing: Mapping[str, Sequence[tuple[str, Sequence[str]]]],
+    stats: Mapping[str, TableStats] | None = None,
+) -> list[Recommendation]:
+    """Recommends the indexes missing for `statements`, as (sql, calls) pairs, most called first.
+
+    `existing` maps tables to their indexes, as (type, columns) pairs. Statements on tables it doesn't list are
+    ignored, so it also scopes the recommendations (e.g. to the tables of the project's models).
+    """
+    stats = stats or {}
+    recommendations: dict[tuple[str, tuple[str, ...], str, tuple[tuple[str, str], ...]], Recommendation] = {}
+    for sql, calls in statements:
+        shape = parse_query(sql)
+        if shape is None or shape.table not in existing:
+            continue
+        columns = _index_columns(shape)
+        if not columns:
+            continue
+        table_stats = stats.get(shape.table)
+        kind = "brin" if _is_brin_candidate(shape, columns, table_stats) else "btree"
+        if _is_covered(kind, columns, existing[shape.table]):
+            continue
+        conditions = () if kind == "brin" else shape.conditions
+        key = (shape.table, tuple(columns), kind, conditions)
+        recommendation = recommendations.get(key)
+        if recommendation is None:
+            recommendation = recommendations[key] = Recommendation(shape.table, tuple(columns), kind, conditions)
+            if table_stats is not None:
+                recommendation.estimated_size = estimate_size(recommendation, table_stats)
+        recommendation.calls += calls
+    return sorted(recommendations.values(), key=lambda recommendation: -recommendation.calls)
@@ -1,21 +1,168 @@
 import uuid
-from typing import TYPE_CHECKING, Self
+from collections.abc import Callable, Iterable, Sequence
+from functools import partial
+from itertools import batched
+from typing import TYPE_CHECKING, Any, ClassVar, Self
 
 from asgiref.sync import sync_to_async
-from django.db import models
+from django.db import models, transaction
+from django.db.models.lookups import In
 from django.db.models.query import aprefetch_related_objects, prefetch_related_objects
+from django.db.models.signals import class_prepared, post_delete, post_save
+from django.db.models.sql.where import AND
+from django.utils import timezone
+
+from lib.asyncutils import SingleFlight, alist
+
+from .invalidation import invalidate, models_changed, models_invalidated
+from .lookups import LookUpIndex
+from .uuids import uuid7
 
 if TYPE_CHECKING:
     from core.models import User
 
 
+def _label(model: type[models.Model]) -> str:
+    return model._meta.label  # noqa: SLF001 # Public Django API
+
+
+class BaseQuerySet[T: "BaseModel"](models.QuerySet[T]):
+    """
+    Query set for all models.
+
+    Bulk operations, which don't send `post_save`, queue invalidations for the rows they change. Their `_audited`
+    variants also set the audit fields of the whole batch, in as many statements as there are batches.
+    """
+
+    # Number of uuids `update` fetches at a time to queue the invalidation of the rows it changes
+    invalidation_chunk_size: ClassVar[int] = 2000
+
+    def bulk_create(self, objs: Iterable[T], *args: Any, **kwargs: Any) -> list[T]:
+        created = super().bulk_create(objs, *args, **kwargs)
+        invalidate(_label(self.model), (obj.uuid for obj in created), using=self.db)
+        return created
+
+    def bulk_update(self, objs: Iterable[T], fields: Sequence[str], *args: Any, **kwargs: Any) -> int:
+        objs = list(objs)
+        # Django updates each batch with `update`, which would fetch the uuids of the rows, known here, again
+        queryset = models.QuerySet(self.model, query=self.query.chain(), using=self._db, hints=self._hints)
+        updated = queryset.bulk_update(objs, fields, *args, **kwargs)
+        invalidate(_label(self.model), (obj.uuid for obj in objs), using=self.db)
+        return updated
+
+    def update(self, **kwargs: Any) -> int:
+        if not models_invalidated.has_listeners():
+            models_changed.send(sender=None, label=_label(self.model))
+            return super().update(**kwargs)
+        uuids = self._filtered_uuids()
+        if uuids is not None:
+            updated = super().update(**kwargs)
+            invalidate(_label(self.model), uuids, using=self.db)
+            return updated
+        # Otherwise the uuids of the matched rows are fetched, in chunks so that updating a large table doesn't load
+        # all of them in one result
+        with transaction.atomic(using=self.db, savepoint=False):
+            uuids = self.values_list("uuid", flat=True).iterator(chunk_size=self.invalidation_chunk_size)
+            for chunk in batched(uuids, self.invalidation_chunk_size, strict=False):
+                invalidate(_label(self.model), chunk, using=self.db)
+            return super().update(**kwargs)
+
+    def _filtered_uuids(self) -> list[uuid.UUID] | None:
+        # The rows of a query set filtered on `uuid__in` are among the given uuids, so they needn't be fetched
+        where = self.query.where
+        if where.connector != AND or where.negated:
+            return None
+        uuid_field = self.model._meta.get_field("uuid")  # noqa: SLF001 # Public Django API
+        for lookup in where.children:
+            if (
+                isinstance(lookup, In)
+                and isinstance(lookup.rhs, list)
+                and getattr(lookup.lhs, "target", None) is uuid_field
+                and getattr(lookup.lhs, "alias", None) == self.query.base_table
+            ):
+                return lookup.rhs
+        return None
+
+    async def abulk_create_audited(
+        self, objs: Iterable[T], user: "User | None", *, batch_size: int | None = None
+    ) -> list[T]:
+        """
+        Create `objs` in a single statement per batch, as created and last updated by `user`.
+        """
+        objs = _stamp(objs, created_by=user, updated_by=user)
+        return await self.abulk_create(objs, batch_size=batch_size)
+
+    async def aupsert_audited(
+        self, objs: Iterable[T], user: "User | None", fields: Sequence[str], *, batch_size: int | None = None
+    ) -> list[T]:
+        """
+        Create `objs`, or update the `fields` of the rows with the same `uuid`, with `INSERT ... ON CONFLICT`.
+
+        New rows are created by `user`; existing rows keep their creator and are marked as updated by `user`.
+        """
+        objs = _stamp(objs, created_by=user, updated_by=user)
+        return await self.abulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["uuid"],
+            update_fields=[*fields, "updated_by", "updated_at"],
+        )
+
+    async def abulk_update_audited(
+        self, objs: Iterable[T], fields: Sequence[str], user: "User | None", *, batch_size: int | None = None
+    ) -> int:
+        """
+        Update the `fields` of `objs` in a single statement per batch, as last updated by `user`.
+        """
+        # `bulk_update` doesn't apply `auto_now`
+        objs = _stamp(objs, updated_by=user, updated_at=timezone.now())
+        return await self.abulk_update(objs, [*fields, "updated_by", "updated_at"], batch_size=batch_size)
+
+    async def aupdate_audited(self, user: "User | None", **kwargs: Any) -> int:
+        """
+        Update the matched rows in a single statement, as last updated by `user`.
+        """
+        return await self.aupdate(**kwargs, updated_by=user, updated_at=timezone.now())
+
+    bulk_create.alters_data = True  # type: ignore
+    bulk_update.alters_data = True  # type: ignore
+    update.alters_data = True  # type: ignore
+    abulk_create_audited.alters_data = True  # type: ignore
+    aupsert_audited.alters_data = True  # type: ignore
+    abulk_update_audited.alters_data = True  # type: ignore
+    aupdate_audited.alters_data = True  # type: ignore
+
+
+def _stamp[T: "BaseModel"](objs: Iterable[T], **values: Any) -> list[T]:
+    objs = list(objs)
+    for obj in objs:
+        for field, value in values.items():
+            setattr(obj, field, value)
+    return objs
+
+
+class BaseManager[T: "BaseModel"](models.Manager.from_queryset(BaseQuerySet)):  # type: ignore # Dynamic base
+    """
+    Manager for all models.
+    """
+
+
 class BaseModel(models.Model):
     """
     Base model for all models.
+
+    Saving or deleting a row queues an invalidation for it, see `lib.models.invalidation`.
+
+    `uuid` values come from `uuid_generator`, time-ordered UUIDv7s by default, which keep inserts into its index
+    local. Models created before it was configurable set `uuid_generator = uuid.uuid4`; switching an existing
+    model only changes the default in the next migration, as existing values stay valid.
     """
 
+    uuid_generator: ClassVar[Callable[[], uuid.UUID]] = uuid7
+
     uuid = models.UUIDField(
-        default=uuid.uuid4,
+        default=uuid7,
         unique=True,
         editable=False,
         db_index=True,
@@ -40,6 +187,8 @@ class BaseModel(models.Model):
         db_index=True,
     )
 
+    objects: "models.Manager[Self] | BaseManager[Self]" = BaseManager()
+
     class Meta:
         abstract = True
 
@@ -82,16 +231,107 @@ class BaseModel(models.Model):
 class BaseLookUpManagerMixin[T: BaseLookUp]:
     """
     Look up table manager.
+
+    With `preload` set, the whole table is loaded into an immutable `LookUpIndex` on first use, and look ups are
+    served from it without queries. The index is reloaded after `preload_ttl` seconds, or on the next use after a
+    record changes in any process. Records from the index are shared, and must not be modified.
     """
 
+    preload: ClassVar[bool] = False
+    preload_ttl: ClassVar[float] = 3600
+
+    model: type[T]
+    _index: "LookUpIndex[T] | None" = None
+    # Incremented by every invalidation, so that a load overlapping one doesn't keep its snapshot
+    _index_generation: int = 0
+    _index_flights: "SingleFlight[str, LookUpIndex[T]]"
+
+    def contribute_to_class(self, cls: type[T], name: str) -> None:
+        super().contribute_to_class(cls, name)  # type: ignore
+        self._index_flights = SingleFlight()
+        if self.preload and not cls._meta.abstract:
+            # The model serves copies of this manager, which hold their own index, so they are looked up on invalidation
+            models_invalidated.connect(partial(_invalidate_indexes, cls), weak=False)
+
+    def _invalidate_index(self, *, invalidated: dict[str, frozenset[uuid.UUID]], **_: Any) -> None:
+        if _label(self.model) in invalidated:
+            self._index_generation += 1
+            self._index = None
+
+    async def aindex(self) -> "LookUpIndex[T]":
+        """
+        Get the preloaded index of the table, loading it if needed.
+        """
+        index = self._index
+        if index is None or index.is_expired(self.preload_ttl):
+            index = await self._index_flights.run("index", self._aload_index)
+        return index
+
+    async def _aload_index(self) -> "LookUpIndex[T]":
+        from lib.cache.invalidation import ensure_subscribed  # noqa: PLC0415 # lib.cache depends on lib.models
+
+        # Changes made by other processes are received through the cache invalidation subscription
+        ensure_subscribed()
+        generation = self._index_generation
+        index = LookUpIndex.build(await alist(self.get_queryset()))  # type: ignore
+        # The rows may have been read before a change invalidated while loading, so the index then only serves the
+        # callers waiting for this load and the next use loads it again
+        if self._index_generation == generation:
+            self._index = index
+        return index
+
+    async def _aget_indexed(self, mapping: str, key: Any) -> T:
+        index = await self.aindex()
+        try:
+            return getattr(index, mapping)[key]
+        except KeyError:
+            raise self.model.DoesNotExist(f"{self.model.__name__} matching {key!r} does not exist.") from None
+
     async def get_by_name(self, name: str) -> T:
         """
         Get a record by name.
         """
+        if self.preload:
+            return await self._aget_indexed("by_name", name)
         return await self.aget(name=name)  # type: ignore
 
+    async def get_by_uuid(self, record_uuid: uuid.UUID | str) -> T:
+        """
+        Get a record by uuid.
+        """
+        if self.preload:
+            return await self._aget_indexed("by_uuid", uuid.UUID(str(record_uuid)))
+        return await self.aget(uuid=record_uuid)  # type: ignore
+
+    async def get_by_id(self, record_id: int) -> T:
+        """
+        Get a record by id.
+        """
+        if self.preload:
+            return await self._aget_indexed("by_id", record_id)
+        return await self.aget(pk=record_id)  # type: ignore
 
-class BaseLookUpManager(BaseLookUpManagerMixin["BaseLookUp"], models.Manager["BaseLookUp"]): ...
+    async def aresolve[M: models.Model](self, instances: Iterable[M], field_name: str) -> list[M]:
+        """
+        Set the `field_name` foreign key of each instance to the matching record, without queries when preloaded.
+        """
+        instances = list(instances)
+        field = instances[0]._meta.get_field(field_name) if instances else None  # noqa: SLF001 # Public Django API
+        if field is None:
+            return instances
+        ids = {getattr(instance, field.attname) for instance in instances} - {None}
+        if self.preload:
+            records = (await self.aindex()).by_id
+        else:
+            records = await self.ain_bulk(ids)  # type: ignore
+        for instance in instances:
+            record_id = getattr(instance, field.attname)
+            if record_id is not None and record_id in records:
+                setattr(instance, field_name, records[record_id])
+        return instances
+
+
+class BaseLookUpManager(BaseLookUpManagerMixin["BaseLookUp"], BaseManager["BaseLookUp"]): ...
 
 
 class BaseLookUp(BaseModel):
@@ -111,3 +351,32 @@ class BaseLookUp(BaseModel):
 
     def __str__(self) -> str:
         return self.name if not self.display_name else f"{self.name} ({self.display_name})"
+
+
+def _invalidate_indexes(model: type[BaseLookUp], **kwargs: Any) -> None:
+    for manager in model._meta.managers:  # noqa: SLF001 # Public Django API
+        if isinstance(manager, BaseLookUpManagerMixin):
+            manager._invalidate_index(**kwargs)  # noqa: SLF001 # Receiver of the manager
+
+
+def _invalidate_instance(sender: type[BaseModel], instance: BaseModel, using: str, **kwargs: Any) -> None:  # noqa: ARG001 # Arguments are required by signal
+    invalidate(_label(sender), [instance.uuid], using=using)
+
+
+def _use_uuid_generator(sender: type[models.Model], **kwargs: Any) -> None:  # noqa: ARG001 # Arguments are required by signal
+    # Each concrete model gets its own copy of the abstract `uuid` field, whose default can then differ per model
+    if issubclass(sender, BaseModel) and not sender._meta.abstract:  # noqa: SLF001 # Public Django API
+        field = sender._meta.get_field("uuid")  # noqa: SLF001 # Public Django API
+        field.default = sender.uuid_generator
+        field.__dict__.pop("_get_default", None)  # Cached by Django on first use
+
+
+def _connect_invalidation(sender: type[models.Model], **kwargs: Any) -> None:  # noqa: ARG001 # Arguments are required by signal
+    # Receivers are connected per model so that models outside of `BaseModel` keep Django's fast deletes
+    if issubclass(sender, BaseModel) and not sender._meta.abstract:  # noqa: SLF001 # Public Django API
+        post_save.connect(_invalidate_instance, sender=sender, weak=False)
+        post_delete.connect(_invalidate_instance, sender=sender, weak=False)
+
+
+class_prepared.connect(_use_uuid_generator, weak=False)
+class_prepared.connect(_connect_invalidation, weak=False)
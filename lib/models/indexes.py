@@ -0,0 +1,36 @@
+import hashlib
+from collections.abc import Sequence
+
+from django.contrib.postgres.indexes import BrinIndex
+from django.db import models
+
+# Postgres allows 63 characters, Django checks for 30 to stay portable
+MAX_NAME_LENGTH = 30
+
+
+def index_name(table: str, fields: Sequence[str], suffix: str = "idx") -> str:
+    """A stable index name for `fields` of `table`, shortened with a hash to fit Django's 30 characters."""
+    name = "_".join([table, *(field.lstrip("-") for field in fields)])
+    limit = MAX_NAME_LENGTH - len(suffix) - 1
+    if len(name) > limit:
+        digest = hashlib.md5(name.encode(), usedforsecurity=False).hexdigest()[:8]
+        name = f"{name[: limit - 9].rstrip('_')}_{digest}"
+    return f"{name}_{suffix}"
+
+
+def partial_index(table: str, *fields: str, condition: models.Q) -> models.Index:
+    """A B-tree index over the rows matching `condition`, e.g. `partial_index("post", "-created_at", condition=...)`.
+
+    Smaller than a full index when listings only ever read a subset of the rows (e.g. active or published ones).
+    """
+    return models.Index(fields=list(fields), condition=condition, name=index_name(table, fields, "prt"))
+
+
+def brin_index(table: str, field: str = "created_at", *, pages_per_range: int | None = None) -> BrinIndex:
+    """A BRIN index on `field`, for range filters on large append-only tables.
+
+    It stores the bounds of each range of pages, which only narrows scans down while `field` follows the physical
+    order of the rows, as `created_at` does when rows are never updated in place. It takes a few pages where a B-tree
+    would take gigabytes, but can't serve `ORDER BY ... LIMIT`.
+    """
+    return BrinIndex(fields=[field], pages_per_range=pages_per_range, name=index_name(table, [field], "brn"))
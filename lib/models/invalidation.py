@@ -0,0 +1,62 @@
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.dispatch import Signal
+
+# Sent once per committed transaction, or savepoint within it, that changed `BaseModel` rows, and again in every other
+# process when the change is received over Redis (see `lib.cache.invalidation`).
+# Receivers get `invalidated`, a dict of model label (e.g. "core.User") to the uuids of the changed rows, and
+# `remote`, whether the change was made by another process.
+models_invalidated = Signal()
+
+# Sent as soon as `BaseModel` rows change, before the transaction commits, in the context making the change, so that
+# state kept for the current request (e.g. `lib.permissions.memo`) doesn't outlive its writes.
+# Receivers get `label`, the model label of the changed rows.
+models_changed = Signal()
+
+
+@dataclass
+class _Batch:
+    uuids: defaultdict[str, set[uuid.UUID]] = field(default_factory=lambda: defaultdict(set))
+    sent: bool = False
+
+    def send(self) -> None:
+        self.sent = True
+        invalidated = {label: frozenset(uuids) for label, uuids in self.uuids.items()}
+        models_invalidated.send(sender=None, invalidated=invalidated, remote=False)
+
+
+def _current_batch(connection: BaseDatabaseWrapper) -> _Batch | None:
+    # Batches are only kept as on-commit callbacks, registered with the savepoints they were made in, so that rolling
+    # back a transaction or savepoint drops its batch with them. Atomic blocks without a savepoint are listed as None.
+    savepoint_ids = set(connection.savepoint_ids) - {None}
+    for callback_savepoint_ids, callback, _ in reversed(connection.run_on_commit):
+        batch = getattr(callback, "__self__", None)
+        if isinstance(batch, _Batch) and callback_savepoint_ids - {None} == savepoint_ids:
+            # Callbacks run by tests without committing stay registered
+            return None if batch.sent else batch
+    return None
+
+
+def invalidate(label: str, uuids: Iterable[uuid.UUID], using: str | None = None) -> None:
+    """Queues an invalidation of the given rows, sent with the rest of the transaction's changes once it commits.
+
+    Outside of a transaction it is sent right away. Changes made within a savepoint are sent separately, unless the
+    savepoint is rolled back, and those of a rolled back transaction are dropped.
+    """
+    models_changed.send(sender=None, label=label)
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    if not connection.in_atomic_block:
+        batch = _Batch()
+        batch.uuids[label].update(uuids)
+        batch.send()
+        return
+    batch = _current_batch(connection)
+    if batch is None:
+        batch = _Batch()
+        transaction.on_commit(batch.send, using=using)
+    batch.uuids[label].update(uuids)
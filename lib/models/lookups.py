@@ -0,0 +1,34 @@
+import uuid
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from time import monotonic
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base import BaseLookUp
+
+
+@dataclass(frozen=True)
+class LookUpIndex[T: "BaseLookUp"]:
+    """
+    An immutable snapshot of a look up table, indexed by id, uuid and name.
+    """
+
+    by_id: Mapping[int, T]
+    by_uuid: Mapping[uuid.UUID, T]
+    by_name: Mapping[str, T]
+    loaded_at: float
+
+    @classmethod
+    def build(cls, records: Iterable[T]) -> "LookUpIndex[T]":
+        records = list(records)
+        return cls(
+            by_id=MappingProxyType({record.pk: record for record in records}),
+            by_uuid=MappingProxyType({record.uuid: record for record in records}),
+            by_name=MappingProxyType({record.name: record for record in records}),
+            loaded_at=monotonic(),
+        )
+
+    def is_expired(self, ttl: float) -> bool:
+        return monotonic() - self.loaded_at >= ttl
@@ -0,0 +1,80 @@
+import pytest
+from django.contrib.postgres.indexes import BrinIndex
+from django.db.models import Q
+
+from ..advisor import QueryShape, TableStats, parse_query, recommend
+from ..indexes import MAX_NAME_LENGTH, index_name
+
+LISTING = (
+    'SELECT "post"."id" FROM "post" WHERE ("post"."author_id" = ? AND "post"."published_at" IS NOT NULL) '
+    'ORDER BY "post"."created_at" DESC LIMIT ?'
+)
+RANGE = 'SELECT "event"."id" FROM "event" WHERE ("event"."created_at" >= $1 AND "event"."created_at" < $2)'
+LARGE_TABLE = TableStats(
+    rows=10_000_000, pages=200_000, widths={"author_id": 8, "created_at": 8}, correlations={"created_at": 0.99}
+)
+
+
+@pytest.mark.parametrize(
+    ("sql", "expected"),
+    [
+        (
+            LISTING,
+            QueryShape(
+                "post", equality=("author_id",), ordering=("-created_at",), conditions=(("published_at", "not null"),)
+            ),
+        ),
+        (
+            'SELECT "post"."id" FROM "post" WHERE ("post"."is_active" AND "post"."author_id" IN (...))',
+            QueryShape("post", equality=("author_id",), conditions=(("is_active", "true"),)),
+        ),
+        (
+            'SELECT "post"."id" FROM "post" WHERE NOT "post"."is_active"',
+            QueryShape("post", conditions=(("is_active", "false"),)),
+        ),
+        (RANGE, QueryShape("event", ranges=("created_at",))),
+        ('UPDATE "post" SET "title" = ?', None),
+    ],
+)
+def test_parse_query(sql: str, expected: QueryShape | None) -> None:
+    assert parse_query(sql) == expected
+
+
+def test_recommend_composite_partial_index() -> None:
+    (recommendation,) = recommend([(LISTING, 10), (LISTING, 5)], {"post": []}, {"post": LARGE_TABLE})
+
+    assert recommendation.columns == ("author_id", "created_at")
+    assert recommendation.conditions == (("published_at", "not null"),)
+    assert recommendation.calls == 15
+    assert recommendation.estimated_size is not None
+    assert recommendation.estimated_size > 0
+
+    index = recommendation.to_index({"author_id": "author", "created_at": "created_at"})
+    assert index.fields == ["author", "created_at"]
+    assert index.condition == Q(published_at__isnull=False)
+
+
+def test_recommend_skips_covered_and_unknown_tables() -> None:
+    existing = {"post": [("idx", ["author_id", "created_at", "id"])]}
+
+    assert recommend([(LISTING, 10), (RANGE, 10)], existing) == []
+
+
+def test_recommend_brin_for_large_correlated_tables() -> None:
+    (recommendation,) = recommend([(RANGE, 1)], {"event": []}, {"event": LARGE_TABLE})
+    (small,) = recommend([(RANGE, 1)], {"event": []}, {"event": TableStats(rows=1000, pages=10)})
+
+    assert recommendation.kind == "brin"
+    assert isinstance(recommendation.to_index({}), BrinIndex)
+    # A few pages for the whole table
+    assert recommendation.estimated_size is not None
+    assert recommendation.estimated_size < 100 * 8192
+    assert small.kind == "btree"
+
+
+def test_index_name_fits() -> None:
+    name = index_name("a_rather_long_table_name", ["first_column", "-second_column"])
+
+    assert len(name) <= MAX_NAME_LENGTH
+    assert name == index_name("a_rather_long_table_name", ["first_column", "-second_column"])
+    assert index_name("post", ["-created_at"]) == "post_created_at_idx"
@@ -0,0 +1,69 @@
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from core.auth.tests.factories import UserFactory
+from core.models import User
+from lib.monitoring import QueryStats
+
+type AssertMaxQueries = Callable[..., AbstractContextManager[QueryStats]]
+
+
+@pytest.mark.django_db
+def test_abulk_create_audited(assert_max_queries: AssertMaxQueries) -> None:
+    admin = UserFactory.create()
+    users = UserFactory.build_batch(3)
+
+    with assert_max_queries(1):
+        created = async_to_sync(User.objects.all().abulk_create_audited)(users, admin)
+
+    assert all(user.pk for user in created)
+    stored = User.objects.filter(uuid__in=[user.uuid for user in users])
+    assert {(user.created_by_id, user.updated_by_id) for user in stored} == {(admin.pk, admin.pk)}
+
+
+@pytest.mark.django_db
+def test_aupsert_audited_updates_existing_rows() -> None:
+    creator, updater = UserFactory.create_batch(2)
+    existing = UserFactory.create(first_name="Before", created_by=creator, updated_by=creator)
+    changed = UserFactory.build(uuid=existing.uuid, email=existing.email, first_name="After")
+    new = UserFactory.build()
+
+    async_to_sync(User.objects.all().aupsert_audited)([changed, new], updater, ["first_name"])
+
+    existing.refresh_from_db()
+    assert (existing.first_name, existing.created_by_id, existing.updated_by_id) == ("After", creator.pk, updater.pk)
+    assert User.objects.get(uuid=new.uuid).created_by_id == updater.pk
+
+
+@pytest.mark.django_db
+def test_abulk_update_audited(assert_max_queries: AssertMaxQueries) -> None:
+    admin = UserFactory.create()
+    users = UserFactory.create_batch(3)
+    updated_at = {user.pk: user.updated_at for user in users}
+    for user in users:
+        user.first_name = "Updated"
+
+    with assert_max_queries(1):
+        async_to_sync(User.objects.all().abulk_update_audited)(users, ["first_name"], admin)
+
+    for user in User.objects.filter(pk__in=updated_at):
+        assert (user.first_name, user.updated_by_id) == ("Updated", admin.pk)
+        assert user.updated_at > updated_at[user.pk]
+
+
+@pytest.mark.django_db
+def test_aupdate_audited() -> None:
+    admin = UserFactory.create()
+    users = UserFactory.create_batch(2)
+
+    count = async_to_sync(User.objects.filter(pk__in=[user.pk for user in users]).aupdate_audited)(
+        admin, is_active=False
+    )
+
+    assert count == len(users)
+    assert set(User.objects.filter(pk__in=[u.pk for u in users]).values_list("is_active", "updated_by")) == {
+        (False, admin.pk)
+    }
@@ -0,0 +1,121 @@
+import contextlib
+import uuid
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager
+from typing import Any
+
+import pytest
+from django.db import IntegrityError, transaction
+
+from core.auth.tests.factories import UserFactory
+from core.models import User
+from lib.monitoring import QueryStats
+
+from ..base import BaseQuerySet
+from ..invalidation import models_invalidated
+
+type Invalidations = list[dict[str, frozenset[uuid.UUID]]]
+type AssertMaxQueries = Callable[..., AbstractContextManager[QueryStats]]
+type CaptureOnCommit = Callable[..., AbstractContextManager[list[Callable[[], None]]]]
+
+
+@pytest.fixture
+def invalidations() -> Generator[Invalidations]:
+    sent: Invalidations = []
+
+    def receiver(*, invalidated: dict[str, frozenset[uuid.UUID]], **_: Any) -> None:
+        sent.append(invalidated)
+
+    models_invalidated.connect(receiver, weak=False)
+    yield sent
+    models_invalidated.disconnect(receiver)
+
+
+@pytest.mark.django_db
+def test_save_and_delete_are_batched_per_transaction(
+    invalidations: Invalidations, django_capture_on_commit_callbacks: CaptureOnCommit
+) -> None:
+    with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+        created = UserFactory.create()
+        deleted = UserFactory.create()
+        deleted_uuid = deleted.uuid
+        deleted.delete()
+
+    assert invalidations == [{"core.User": frozenset({created.uuid, deleted_uuid})}]
+
+
+@pytest.mark.django_db
+def test_not_sent_before_commit(
+    invalidations: Invalidations, django_capture_on_commit_callbacks: CaptureOnCommit
+) -> None:
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        UserFactory.create()
+
+    assert invalidations == []
+    assert callbacks
+
+
+@pytest.mark.django_db
+def test_rolled_back_savepoint_is_dropped(
+    invalidations: Invalidations, django_capture_on_commit_callbacks: CaptureOnCommit
+) -> None:
+    with django_capture_on_commit_callbacks(execute=True) as callbacks, transaction.atomic():
+        kept = UserFactory.create()
+        with contextlib.suppress(IntegrityError), transaction.atomic():
+            UserFactory.create()
+            UserFactory.create(email=kept.email)
+        kept.save()
+
+    assert len(callbacks) == 1
+    assert invalidations == [{"core.User": frozenset({kept.uuid})}]
+
+
+@pytest.mark.django_db
+def test_bulk_operations(invalidations: Invalidations, django_capture_on_commit_callbacks: CaptureOnCommit) -> None:
+    users = UserFactory.create_batch(2)
+    uuids = frozenset(user.uuid for user in users)
+
+    with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+        User.objects.filter(uuid__in=uuids).update(is_active=False)
+    with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+        User.objects.bulk_update(users, ["first_name"])
+    with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+        created = User.objects.bulk_create([User(email="bulk@example.com")])
+
+    assert invalidations == [
+        {"core.User": uuids},
+        {"core.User": uuids},
+        {"core.User": frozenset({created[0].uuid})},
+    ]
+
+
+@pytest.mark.django_db
+def test_update_fetches_uuids_in_chunks(
+    invalidations: Invalidations,
+    django_capture_on_commit_callbacks: CaptureOnCommit,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(BaseQuerySet, "invalidation_chunk_size", 2)
+    users = UserFactory.create_batch(5)
+    uuids = frozenset(user.uuid for user in users)
+
+    with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+        updated = User.objects.filter(pk__in=[user.pk for user in users]).update(is_active=False)
+
+    assert updated == len(users)
+    assert invalidations == [{"core.User": uuids}]
+
+
+@pytest.mark.django_db
+def test_update_filtered_on_uuids_doesnt_fetch_them(
+    invalidations: Invalidations,
+    django_capture_on_commit_callbacks: CaptureOnCommit,
+    assert_max_queries: AssertMaxQueries,
+) -> None:
+    users = UserFactory.create_batch(2)
+    uuids = frozenset(user.uuid for user in users)
+
+    with django_capture_on_commit_callbacks(execute=True), transaction.atomic(), assert_max_queries(1):
+        User.objects.filter(uuid__in=uuids, is_active=True).update(is_active=False)
+
+    assert invalidations == [{"core.User": uuids}]
@@ -0,0 +1,142 @@
+import uuid
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection, models, transaction
+from freezegun import freeze_time
+
+from lib.monitoring.queries import QueryStats
+
+from .. import base
+from ..base import BaseLookUp, BaseLookUpManager
+from ..lookups import LookUpIndex
+
+type AssertMaxQueries = Callable[..., AbstractContextManager[QueryStats]]
+type CaptureOnCommit = Callable[..., AbstractContextManager[list[Callable[[], None]]]]
+
+
+class ColourManager(BaseLookUpManager):
+    preload = True
+
+
+class Colour(BaseLookUp):
+    parent = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, related_name="+")
+
+    objects = ColourManager()  # type: ignore # Narrower than the base's manager
+
+    class Meta:
+        # Outside of the installed apps, so that deleting users doesn't look for colours created by them
+        app_label = "lookups_tests"
+
+
+def record(pk: int, name: str) -> Any:
+    return SimpleNamespace(pk=pk, uuid=uuid.uuid4(), name=name)
+
+
+def test_build_indexes_records() -> None:
+    active, inactive = record(1, "active"), record(2, "inactive")
+
+    index = LookUpIndex.build([active, inactive])
+
+    assert index.by_id[2] is inactive
+    assert index.by_uuid[active.uuid] is active
+    assert index.by_name["inactive"] is inactive
+
+
+def test_index_is_immutable() -> None:
+    index = LookUpIndex.build([record(1, "active")])
+
+    with pytest.raises(TypeError):
+        index.by_name["other"] = record(2, "other")  # type: ignore
+
+
+def test_index_expires() -> None:
+    with freeze_time("2025-01-01 00:00:00") as frozen:
+        index = LookUpIndex.build([])
+        frozen.tick(30)
+
+        assert not index.is_expired(60)
+        frozen.tick(30)
+        assert index.is_expired(60)
+
+
+@pytest.fixture
+def colours() -> Generator[tuple[Colour, Colour]]:
+    # The table only exists in the test's transaction
+    with connection.schema_editor() as editor:
+        editor.create_model(Colour)
+    Colour.objects._index = None  # noqa: SLF001
+    yield Colour.objects.create(name="red"), Colour.objects.create(name="blue")
+    Colour.objects._index = None  # noqa: SLF001
+
+
+@pytest.mark.django_db
+def test_preloaded_look_ups_run_no_queries(
+    colours: tuple[Colour, Colour], assert_max_queries: AssertMaxQueries
+) -> None:
+    red, blue = colours
+
+    async def run() -> list[Colour]:
+        await Colour.objects.aindex()
+        with assert_max_queries(0):
+            return [
+                await Colour.objects.get_by_name("red"),
+                await Colour.objects.get_by_uuid(str(blue.uuid)),
+                await Colour.objects.get_by_id(red.pk),
+            ]
+
+    assert [colour.pk for colour in async_to_sync(run)()] == [red.pk, blue.pk, red.pk]
+    with pytest.raises(Colour.DoesNotExist):
+        async_to_sync(Colour.objects.get_by_name)("green")
+
+
+@pytest.mark.django_db
+def test_aresolve_sets_foreign_keys_from_the_index(
+    colours: tuple[Colour, Colour], assert_max_queries: AssertMaxQueries
+) -> None:
+    red, _ = colours
+    dark_red = Colour.objects.get(pk=Colour.objects.create(name="dark red", parent=red).pk)
+
+    async def run() -> None:
+        index = await Colour.objects.aindex()
+        with assert_max_queries(0):
+            await Colour.objects.aresolve([dark_red], "parent")
+            assert dark_red.parent is index.by_id[red.pk]
+
+    async_to_sync(run)()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("colours")
+def test_index_reloads_after_invalidation(django_capture_on_commit_callbacks: CaptureOnCommit) -> None:
+    first = async_to_sync(Colour.objects.aindex)()
+    assert async_to_sync(Colour.objects.aindex)() is first
+
+    with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+        Colour.objects.create(name="green")
+
+    index = async_to_sync(Colour.objects.aindex)()
+    assert index is not first
+    assert "green" in index.by_name
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("colours")
+def test_index_loaded_across_an_invalidation_is_not_kept(monkeypatch: pytest.MonkeyPatch) -> None:
+    alist = base.alist
+
+    async def alist_then_invalidate(queryset: Any) -> list[Any]:
+        rows = await alist(queryset)
+        Colour.objects._invalidate_index(invalidated={"lookups_tests.Colour": frozenset()})  # noqa: SLF001
+        return rows
+
+    monkeypatch.setattr(base, "alist", alist_then_invalidate)
+
+    index = async_to_sync(Colour.objects.aindex)()
+
+    assert set(index.by_name) == {"red", "blue"}
+    assert Colour.objects._index is None  # noqa: SLF001
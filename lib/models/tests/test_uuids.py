@@ -0,0 +1,31 @@
+import time
+import uuid
+
+import pytest
+
+from core.models import User
+
+from ..uuids import uuid7, uuid_timestamp
+
+
+def test_uuid7_is_time_ordered() -> None:
+    before = time.time()
+    values = [uuid7() for _ in range(10_000)]
+    after = time.time()
+
+    assert all(value.version == 7 for value in values)
+    assert all(value.variant == uuid.RFC_4122 for value in values)
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert before - 0.001 <= uuid_timestamp(values[0]) <= uuid_timestamp(values[-1]) <= after
+
+
+def test_uuid_timestamp_rejects_other_versions() -> None:
+    with pytest.raises(ValueError, match="version 4"):
+        uuid_timestamp(uuid.uuid4())
+
+
+def test_models_use_their_uuid_generator() -> None:
+    # The user model predates time-ordered UUIDs
+    assert User._meta.get_field("uuid").default is uuid.uuid4  # noqa: SLF001 # Public Django API
+    assert User().uuid.version == 4
@@ -1,8 +1,12 @@
 from .middleware import TelemetryMiddleware
-from .tracing import trace_async_function, trace_function
+from .queries import QueryStats, track_queries
+from .tracing import trace_async_function, trace_function, tracing_enabled
 
 __all__ = [
+    "QueryStats",
     "TelemetryMiddleware",
     "trace_async_function",
     "trace_function",
+    "tracing_enabled",
+    "track_queries",
 ]
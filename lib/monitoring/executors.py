@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import weakref
+from collections.abc import Awaitable, Callable, MutableMapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import AbstractContextManager, ExitStack
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from asgiref.sync import SyncToAsync, ThreadSensitiveContext
+from opentelemetry import metrics
+
+meter = metrics.get_meter(__name__)
+
+executor_wait_time = meter.create_histogram(
+    "executor.wait_time",
+    unit="s",
+    description="Time a task submitted to an executor waited for a thread before it started running.",
+)
+
+type Scope = MutableMapping[str, Any]
+type Message = MutableMapping[str, Any]
+type ASGIApp = Callable[
+    [Scope, Callable[[], Awaitable[Message]], Callable[[Message], Awaitable[None]]], Awaitable[None]
+]
+type TaskHook = Callable[[], AbstractContextManager[object]]
+
+
+@dataclass(frozen=True)
+class ExecutorSample:
+    wait_time: float
+    queue_depth: int
+    active_threads: int
+
+
+class _ExecutorStats:
+    """Waiting and running tasks, and the longest wait since the last snapshot, of the executors with each name."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waiting: dict[str, int] = {}
+        self._running: dict[str, int] = {}
+        self._max_wait: dict[str, float] = {}
+
+    def submitted(self, name: str) -> None:
+        with self._lock:
+            self._waiting[name] = self._waiting.get(name, 0) + 1
+            self._running.setdefault(name, 0)
+
+    def started(self, name: str, wait_time: float) -> None:
+        with self._lock:
+            self._waiting[name] -= 1
+            self._running[name] += 1
+            self._max_wait[name] = max(self._max_wait.get(name, 0.0), wait_time)
+
+    def finished(self, name: str) -> None:
+        with self._lock:
+            self._running[name] -= 1
+
+    def cancelled(self, name: str) -> None:
+        with self._lock:
+            self._waiting[name] -= 1
+
+    def snapshot(self) -> dict[str, ExecutorSample]:
+        with self._lock:
+            samples = {
+                name: ExecutorSample(
+                    wait_time=self._max_wait.get(name, 0.0),
+                    queue_depth=waiting,
+                    active_threads=self._running[name],
+                )
+                for name, waiting in self._waiting.items()
+            }
+            self._max_wait.clear()
+        return samples
+
+
+executor_stats = _ExecutorStats()
+_task_hooks: list[TaskHook] = []
+
+
+def add_task_hook(hook: TaskHook) -> None:
+    """Runs the tasks of each `MonitoredExecutor` within `hook()`, which is called where the task is submitted.
+
+    This carries state of the caller, like context variables, over to the worker thread. Adding a hook again does
+    nothing.
+    """
+    if hook not in _task_hooks:
+        _task_hooks.append(hook)
+
+
+class MonitoredExecutor(ThreadPoolExecutor):
+    """A thread pool executor that counts its waiting and running tasks, and how long they waited, as `name`."""
+
+    def __init__(self, name: str, max_workers: int | None = None) -> None:
+        super().__init__(max_workers=max_workers, thread_name_prefix=name)
+        self.name = name
+
+    def submit[**P, T](self, fn: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs) -> Future[T]:
+        # Called by `loop.run_in_executor` in the task awaiting the call, so hooks see the caller's context
+        scopes = [hook() for hook in _task_hooks]
+        submitted = perf_counter()
+
+        def run() -> T:
+            wait_time = perf_counter() - submitted
+            executor_stats.started(self.name, wait_time)
+            executor_wait_time.record(wait_time, {"executor": self.name})
+            try:
+                with ExitStack() as stack:
+                    for scope in scopes:
+                        stack.enter_context(scope)
+                    return fn(*args, **kwargs)
+            finally:
+                executor_stats.finished(self.name)
+
+        executor_stats.submitted(self.name)
+        try:
+            future = super().submit(run)
+        except BaseException:
+            executor_stats.cancelled(self.name)
+            raise
+        # Only tasks that haven't started can be cancelled
+        future.add_done_callback(lambda future: executor_stats.cancelled(self.name) if future.cancelled() else None)
+        return future
+
+
+class MonitoredExecutorsMiddleware:
+    """ASGI middleware running the `sync_to_async` calls of each connection on `MonitoredExecutor`s.
+
+    Thread sensitive calls (the default, used by the ORM) run on a single thread executor per connection, named
+    `thread_sensitive`: the connection's `ThreadSensitiveContext` is entered here, and Django's ASGI handler reuses
+    it as only the outermost one applies. Calls with `thread_sensitive=False` run on the event loop's default
+    executor, named `default`. Lifespan events are passed through.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._loops: weakref.WeakSet[asyncio.AbstractEventLoop] = weakref.WeakSet()
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Callable[[], Awaitable[Message]],
+        send: Callable[[Message], Awaitable[None]],
+    ) -> None:
+        if scope["type"] == "lifespan":
+            await self.app(scope, receive, send)
+            return
+        loop = asyncio.get_running_loop()
+        if loop not in self._loops:
+            loop.set_default_executor(MonitoredExecutor("default"))
+            self._loops.add(loop)
+        async with ThreadSensitiveContext():  # type: ignore # Untyped in asgiref
+            # Shut down by asgiref with the context
+            SyncToAsync.context_to_thread_executor.setdefault(
+                SyncToAsync.thread_sensitive_context.get(), MonitoredExecutor("thread_sensitive", max_workers=1)
+            )
+            await self.app(scope, receive, send)
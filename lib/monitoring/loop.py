@@ -0,0 +1,147 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from time import perf_counter
+
+from django.conf import settings
+from opentelemetry import metrics
+
+from .executors import ASGIApp, ExecutorSample, Message, Scope, executor_stats
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+loop_lag = meter.create_histogram(
+    "asyncio.loop.lag",
+    unit="s",
+    description="Delay between when a callback was due to run on the event loop and when it actually ran.",
+)
+executor_queue_depth = meter.create_gauge(
+    "executor.queue.depth",
+    unit="{task}",
+    description="Number of tasks waiting for a thread in an executor.",
+)
+executor_active_threads = meter.create_gauge(
+    "executor.threads.active",
+    unit="{thread}",
+    description="Number of threads of an executor running a task.",
+)
+
+
+@dataclass(frozen=True)
+class LoopSample:
+    lag: float
+    executors: dict[str, ExecutorSample]
+
+
+class LoopMonitor:
+    """Periodically measures event loop lag and the saturation of the executors used by `sync_to_async`.
+
+    Executors are measured through the tasks they run, by `MonitoredExecutorsMiddleware`: `thread_sensitive` for
+    thread sensitive calls (the default, used by the ORM), which run on an executor per connection, and `default`
+    for calls with `thread_sensitive=False`.
+    """
+
+    def __init__(self, *, interval: float, lag_threshold: float, wait_threshold: float) -> None:
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.wait_threshold = wait_threshold
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Starts sampling on the running event loop. Does nothing if it's already running."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="loop-monitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.record(await self.sample())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to sample the event loop")
+
+    async def sample(self) -> LoopSample:
+        start = perf_counter()
+        await asyncio.sleep(self.interval)
+        lag = max(perf_counter() - start - self.interval, 0.0)
+        return LoopSample(lag=lag, executors=executor_stats.snapshot())
+
+    def record(self, sample: LoopSample) -> None:
+        loop_lag.record(sample.lag)
+        if sample.lag > self.lag_threshold:
+            logger.warning(
+                "Event loop lag threshold exceeded",
+                extra={"lag": sample.lag, "threshold": self.lag_threshold},
+            )
+
+        for name, executor in sample.executors.items():
+            attributes = {"executor": name}
+            executor_queue_depth.set(executor.queue_depth, attributes)
+            executor_active_threads.set(executor.active_threads, attributes)
+            if executor.wait_time > self.wait_threshold:
+                logger.warning(
+                    "Executor wait time threshold exceeded",
+                    extra={
+                        "executor": name,
+                        "wait_time": executor.wait_time,
+                        "threshold": self.wait_threshold,
+                        "queue_depth": executor.queue_depth,
+                        "active_threads": executor.active_threads,
+                    },
+                )
+
+
+class LoopMonitorMiddleware:
+    """ASGI middleware that runs a `LoopMonitor` for the lifetime of the application.
+
+    The monitor is started and stopped with the ASGI lifespan protocol. Django doesn't handle lifespan events, so
+    they are not forwarded. Servers that don't send lifespan events (like daphne) start it on the first request.
+    """
+
+    def __init__(self, app: ASGIApp, monitor: LoopMonitor | None = None) -> None:
+        self.app = app
+        self.monitor = monitor or LoopMonitor(
+            interval=settings.MONITORING_LOOP_MONITOR_INTERVAL,
+            lag_threshold=settings.MONITORING_LOOP_LAG_THRESHOLD,
+            wait_threshold=settings.MONITORING_EXECUTOR_WAIT_THRESHOLD,
+        )
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Callable[[], Awaitable[Message]],
+        send: Callable[[Message], Awaitable[None]],
+    ) -> None:
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        self.monitor.start()
+        await self.app(scope, receive, send)
+
+    async def lifespan(
+        self,
+        receive: Callable[[], Awaitable[Message]],
+        send: Callable[[Message], Awaitable[None]],
+    ) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.monitor.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.monitor.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -1,12 +1,21 @@
+import logging
 from collections.abc import Awaitable, Callable
+from contextlib import nullcontext
+from http import HTTPStatus
 from time import time
 
 from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
 from django.http import HttpRequest, HttpResponse
 from opentelemetry import trace
 from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
 
+from .executors import add_task_hook
+from .profiling import profile_tags, request_tags, thread_tags
+from .queries import QueryStats, track_queries
+
 tracer = trace.get_tracer(__name__)
+logger = logging.getLogger(__name__)
 
 
 class TelemetryMiddleware:
@@ -18,6 +27,11 @@ class TelemetryMiddleware:
         if iscoroutinefunction(self.get_response):
             markcoroutinefunction(self)
         # One-time configuration and initialization.
+        self.server_timing = settings.DEBUG
+        self.duplicates_threshold = settings.MONITORING_QUERY_DUPLICATES_THRESHOLD
+        self.profiling_tags = settings.MONITORING_PYROSCOPE_TAGS_ENABLED
+        if self.profiling_tags:
+            add_task_hook(thread_tags)
 
     async def __call__(self, request: HttpRequest) -> HttpResponse:
         ctx = None
@@ -26,7 +40,11 @@ class TelemetryMiddleware:
             carrier = {"traceparent": request.headers["Traceparent"]}
             ctx = TraceContextTextMapPropagator().extract(carrier=carrier)
 
-        with tracer.start_as_current_span(f"HTTP {request.method}", kind=trace.SpanKind.SERVER, context=ctx) as span:
+        with (
+            tracer.start_as_current_span(f"HTTP {request.method}", kind=trace.SpanKind.SERVER, context=ctx) as span,
+            track_queries() as queries,
+            profile_tags(request_tags(request)) if self.profiling_tags else nullcontext(),
+        ):
             span.set_attribute("http.request.method", request.method or "UNKNOWN")
             span.set_attribute("http.route", request.path)
             span.set_attribute("http.request.url", request.build_absolute_uri())
@@ -34,11 +52,30 @@ class TelemetryMiddleware:
             start_time = time()
             response = await self.get_response(request)
             duration = time() - start_time
-            span.set_attribute(
-                "user.uuid",
-                str(request.user.uuid) if request.user and request.user.is_authenticated else "anonymous",
-            )
+            # `auser` is cached per request, and resolved without blocking the event loop
+            user = await request.auser() if hasattr(request, "auser") else None
+            span.set_attribute("user.uuid", str(user.uuid) if user and user.is_authenticated else "anonymous")
             span.set_attribute("http.response.duration", duration)
             span.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                span.set_status(trace.StatusCode.ERROR)
+            self.record_queries(request, span, queries)
+
+        if self.server_timing:
+            response["Server-Timing"] = f"{queries.server_timing()}, total;dur={duration * 1000:.2f}"
 
         return response
+
+    def record_queries(self, request: HttpRequest, span: trace.Span, queries: QueryStats) -> None:
+        span.set_attribute("db.query.count", queries.count)
+        span.set_attribute("db.query.duration", queries.duration)
+        span.set_attribute("db.query.duplicate_count", queries.duplicate_count)
+
+        for statement, count in queries.duplicates.items():
+            if count < self.duplicates_threshold:
+                continue
+            span.add_event("db.query.n_plus_one", {"db.statement": statement, "db.query.count": count})
+            logger.warning(
+                "Suspected N+1 query",
+                extra={"path": request.path, "statement": statement, "count": count},
+            )
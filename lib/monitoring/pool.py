@@ -0,0 +1,104 @@
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from django.conf import settings
+from django.db import connections
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+meter = metrics.get_meter(__name__)
+
+# Counters read from `ConnectionPool.get_stats()`, which are cumulative since the pool was opened
+_counters = {
+    "db.client.connection.requests": ("requests_num", "{request}", "Connections requested from the pool."),
+    "db.client.connection.timeouts": (
+        "requests_errors",
+        "{request}",
+        "Requests that timed out waiting for a connection.",
+    ),
+    "db.client.connection.created": ("connections_num", "{connection}", "Connections opened by the pool."),
+    "db.client.connection.lost": ("connections_lost", "{connection}", "Connections found broken by the check."),
+    "db.client.connection.errors": ("connections_errors", "{connection}", "Connection attempts that failed."),
+}
+
+
+def _pools() -> Iterator[tuple[str, Any]]:
+    for alias in settings.DATABASES:
+        # Pools are shared by the connections of every thread, and are only read here once a request has opened them
+        pool = getattr(connections[alias], "_connection_pools", {}).get(alias)
+        if pool is not None:
+            yield alias, pool
+
+
+def pool_observations(alias: str, stats: dict[str, int]) -> dict[str, list[Observation]]:
+    """Turns the stats of the `alias` pool into observations, keyed by instrument name."""
+    name = {"db.client.connection.pool.name": alias}
+    size, idle, max_size = stats.get("pool_size", 0), stats.get("pool_available", 0), stats.get("pool_max", 0)
+    observations = {
+        "db.client.connection.count": [
+            Observation(idle, {**name, "db.client.connection.state": "idle"}),
+            Observation(size - idle, {**name, "db.client.connection.state": "used"}),
+        ],
+        "db.client.connection.max": [Observation(max_size, name)],
+        "db.client.connection.utilization": [Observation((size - idle) / max_size if max_size else 0.0, name)],
+        "db.client.connection.pending_requests": [Observation(stats.get("requests_waiting", 0), name)],
+        "db.client.connection.wait_time.total": [Observation(stats.get("requests_wait_ms", 0) / 1000, name)],
+    }
+    for instrument, (key, _, _) in _counters.items():
+        observations[instrument] = [Observation(stats.get(key, 0), name)]
+    return observations
+
+
+def _observe(instrument: str) -> Callable[[CallbackOptions], Iterable[Observation]]:
+    def callback(_: CallbackOptions) -> Iterable[Observation]:
+        for alias, pool in _pools():
+            yield from pool_observations(alias, pool.get_stats())[instrument]
+
+    return callback
+
+
+_instrumented = False
+
+
+def instrument_pools() -> None:
+    """Exports the state of the database connection pools as metrics, once per process.
+
+    Waits, utilisation and connection churn are read from the pools when metrics are collected, so this adds nothing
+    to checking connections out.
+    """
+    global _instrumented  # noqa: PLW0603 # Instruments are registered once per process
+    if _instrumented:
+        return
+    _instrumented = True
+    meter.create_observable_up_down_counter(
+        "db.client.connection.count",
+        [_observe("db.client.connection.count")],
+        unit="{connection}",
+        description="Connections in the pool, by state.",
+    )
+    meter.create_observable_gauge(
+        "db.client.connection.max",
+        [_observe("db.client.connection.max")],
+        unit="{connection}",
+        description="Connections the pool can open at most.",
+    )
+    meter.create_observable_gauge(
+        "db.client.connection.utilization",
+        [_observe("db.client.connection.utilization")],
+        unit="1",
+        description="Share of the pool's maximum size in use.",
+    )
+    meter.create_observable_up_down_counter(
+        "db.client.connection.pending_requests",
+        [_observe("db.client.connection.pending_requests")],
+        unit="{request}",
+        description="Requests waiting for a connection from the pool.",
+    )
+    meter.create_observable_counter(
+        "db.client.connection.wait_time.total",
+        [_observe("db.client.connection.wait_time.total")],
+        unit="s",
+        description="Time spent waiting for connections from the pool.",
+    )
+    for instrument, (_, unit, description) in _counters.items():
+        meter.create_observable_counter(instrument, [_observe(instrument)], unit=unit, description=description)
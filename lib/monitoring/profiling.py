@@ -0,0 +1,76 @@
+import contextvars
+import json
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+
+import pyroscope
+from django.http import HttpRequest
+from django.urls import Resolver404, ResolverMatch, resolve
+
+_profile_tags: contextvars.ContextVar[dict[str, str]] = contextvars.ContextVar("profile_tags", default={})  # noqa: B039 # Never mutated
+
+
+@contextmanager
+def profile_tags(tags: dict[str, str]) -> Iterator[None]:
+    """Tags the profiling samples of sync work started within the block, so flame graphs can be split by the tags.
+
+    Pyroscope tags samples per thread, and requests served concurrently on the event loop share its thread, so tags
+    are kept in a context variable and applied to the worker threads of `sync_to_async` calls made within the block
+    (see `thread_tags`). Code running on the event loop thread is not tagged.
+    """
+    token = _profile_tags.set({**_profile_tags.get(), **tags})
+    try:
+        yield
+    finally:
+        _profile_tags.reset(token)
+
+
+def thread_tags() -> AbstractContextManager[object]:
+    """Tags the samples of the thread that enters it with the current profiling tags, until it exits.
+
+    Registered as a task hook of `lib.monitoring.executors`, to tag the worker threads of `sync_to_async` calls.
+    """
+    tags = _profile_tags.get()
+    if not tags:
+        return nullcontext()
+    return pyroscope.tag_wrapper(tags)  # type: ignore # Untyped library
+
+
+def _view_slice(match: ResolverMatch) -> str | None:
+    view = getattr(match.func, "view_class", match.func)
+    # django-ninja routes resolve to a method of the PathView that holds the slice's operations
+    operations = getattr(getattr(view, "__self__", None), "operations", None)
+    if operations:
+        view = operations[0].view_func
+    module: str = getattr(view, "__module__", "")
+    # Slices live in the core app, e.g. `core.<slice>.rest`
+    parts = module.split(".")
+    return parts[1] if len(parts) > 2 and parts[0] == "core" else None  # noqa: PLR2004 # app.slice.module
+
+
+def request_tags(request: HttpRequest) -> dict[str, str]:
+    """Profiling tags for the route, and the owning slice if it can be told from the view."""
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return {"route": "unknown"}
+    tags = {"route": str(match.route)}
+    slice_name = _view_slice(match)
+    if slice_name:
+        tags["slice"] = slice_name
+    return tags
+
+
+def graphql_operation_name(request: HttpRequest) -> str:
+    """Reads the GraphQL operation name from the request without parsing the query."""
+    if request.method == "GET":
+        return request.GET.get("operationName") or "anonymous"
+    if request.content_type != "application/json":
+        return "unknown"
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return "unknown"
+    if not isinstance(data, dict):
+        return "batch"
+    return data.get("operationName") or "anonymous"
@@ -0,0 +1,105 @@
+import re
+from collections import Counter
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_placeholder_lists = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_whitespace = re.compile(r"\s+")
+
+_current_stats: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapses literals, placeholders and whitespace so that repeated statements compare equal.
+
+    Lists of placeholders (e.g. `IN (%s, %s, %s)`) are collapsed to `(...)` so that the same statement with a
+    different number of parameters is still considered a repetition.
+    """
+    sql = _literals.sub("?", sql).replace("%s", "?")
+    sql = _placeholder_lists.sub("(...)", sql)
+    return _whitespace.sub(" ", sql).strip()
+
+
+@dataclass
+class QueryStats:
+    """Accounting for the SQL queries executed within a `track_queries` block."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def record(self, sql: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[normalize_sql(sql)] += 1
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """Normalized statements that were executed more than once, with the number of executions."""
+        return {sql: count for sql, count in self.statements.items() if count > 1}
+
+    @property
+    def duplicate_count(self) -> int:
+        """Number of executions that repeated an already executed statement."""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def server_timing(self) -> str:
+        """Formats the stats as a `Server-Timing` header entry."""
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries, {self.duplicate_count} duplicates"'
+
+
+def _record_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(sql, perf_counter() - start)
+
+
+def install(connection: BaseDatabaseWrapper) -> None:
+    """Installs the query accounting wrapper on a connection. Safe to call more than once."""
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@receiver(connection_created)
+def _install_on_connection_created(sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any) -> None:  # noqa: ARG001 # Arguments are required by signal
+    # Connections are thread local and async views run their queries in `sync_to_async` threads, so the wrapper is
+    # installed on every connection rather than on the one visible to the caller of `track_queries`.
+    install(connection)
+
+
+@contextmanager
+def track_queries() -> Generator[QueryStats]:
+    """Counts the queries, total DB time and duplicate statements executed within the block.
+
+    Stats are carried in a context variable, so queries executed through `sync_to_async` and `async_to_sync` are
+    attributed to the block that started them.
+    """
+    for connection in connections.all(initialized_only=True):
+        install(connection)
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import Decision, Sampler, SamplingResult
+from opentelemetry.trace import Link, SpanKind, StatusCode
+from opentelemetry.util.types import Attributes
+
+
+class RecordingSampler(Sampler):
+    """Records the spans that `sampler` drops, so that `TailSamplingSpanProcessor` can still decide to keep them.
+
+    Recorded spans are not exported unless they are sampled, so this only changes what the tail processor can see.
+    """
+
+    def __init__(self, sampler: Sampler) -> None:
+        self.sampler = sampler
+
+    def should_sample(
+        self,
+        parent_context: Context | None,
+        trace_id: int,
+        name: str,
+        kind: SpanKind | None = None,
+        attributes: Attributes = None,
+        links: Sequence[Link] | None = None,
+        trace_state: trace.TraceState | None = None,
+    ) -> SamplingResult:
+        result = self.sampler.should_sample(parent_context, trace_id, name, kind, attributes, links, trace_state)
+        if result.decision != Decision.DROP:
+            return result
+        return SamplingResult(Decision.RECORD_ONLY, result.attributes, result.trace_state)
+
+    def get_description(self) -> str:
+        return f"RecordingSampler{{{self.sampler.get_description()}}}"
+
+
+def _as_sampled(span: ReadableSpan) -> ReadableSpan:
+    # Exporting processors skip spans that aren't flagged as sampled
+    context = span.get_span_context()
+    return ReadableSpan(
+        name=span.name,
+        context=trace.SpanContext(
+            trace_id=context.trace_id,
+            span_id=context.span_id,
+            is_remote=context.is_remote,
+            trace_flags=trace.TraceFlags(context.trace_flags | trace.TraceFlags.SAMPLED),
+            trace_state=context.trace_state,
+        ),
+        parent=span.parent,
+        resource=span.resource,
+        attributes=span.attributes,
+        events=span.events,
+        links=span.links,
+        kind=span.kind,
+        status=span.status,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        instrumentation_scope=span.instrumentation_scope,
+    )
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """Exports every sampled span, plus unsampled traces that turn out to be slow or failed.
+
+    Spans of unsampled traces (recorded through `RecordingSampler`) are buffered until their local root span ends.
+    The trace is then exported if the root took longer than `latency_threshold` seconds or any of its spans has an
+    error status, and dropped otherwise. At most `max_traces` traces are buffered, the oldest being dropped first.
+    """
+
+    def __init__(self, processor: SpanProcessor, *, latency_threshold: float, max_traces: int = 2048) -> None:
+        self.processor = processor
+        self.latency_threshold_ns = int(latency_threshold * 1e9)
+        self.max_traces = max_traces
+        self._traces: OrderedDict[int, list[ReadableSpan]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        self.processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        context = span.get_span_context()
+        if context.trace_flags.sampled:
+            self.processor.on_end(span)
+            return
+
+        with self._lock:
+            spans = self._traces.setdefault(context.trace_id, [])
+            spans.append(span)
+            if not self._is_local_root(span):
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+                return
+            del self._traces[context.trace_id]
+
+        if self._should_keep(span, spans):
+            for buffered in spans:
+                self.processor.on_end(_as_sampled(buffered))
+
+    def _is_local_root(self, span: ReadableSpan) -> bool:
+        return span.parent is None or span.parent.is_remote
+
+    def _should_keep(self, root: ReadableSpan, spans: list[ReadableSpan]) -> bool:
+        duration = (root.end_time or 0) - (root.start_time or 0)
+        if duration >= self.latency_threshold_ns:
+            return True
+        return any(s.status.status_code == StatusCode.ERROR for s in spans)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._traces.clear()
+        self.processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.processor.force_flush(timeout_millis)
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+
+from ..executors import ExecutorSample, MonitoredExecutor, MonitoredExecutorsMiddleware, executor_stats
+from ..loop import LoopMonitor, LoopMonitorMiddleware, LoopSample
+
+
+@pytest.fixture
+def monitor() -> LoopMonitor:
+    return LoopMonitor(interval=0.01, lag_threshold=0.05, wait_threshold=0.05)
+
+
+def test_sample_measures_lag(monitor: LoopMonitor) -> None:
+    async def block_loop() -> None:
+        await asyncio.sleep(0)
+        time.sleep(0.1)  # noqa: ASYNC251 # Blocks the event loop while the monitor is sleeping
+
+    async def run() -> LoopSample:
+        blocker = asyncio.create_task(block_loop())
+        sample = await monitor.sample()
+        await blocker
+        return sample
+
+    sample = async_to_sync(run)()
+
+    assert sample.lag >= 0.05
+
+
+def test_measures_sync_to_async_calls_of_each_connection() -> None:
+    threads: list[int] = []
+
+    async def app(*args: Any) -> None:  # noqa: ARG001 # ASGI signature
+        # Thread sensitive calls of a connection share its thread, and wait for each other
+        await asyncio.gather(*(sync_to_async(time.sleep)(0.05) for _ in range(3)))
+        threads.append(await sync_to_async(threading.get_ident)())
+        threads.append(await sync_to_async(threading.get_ident, thread_sensitive=False)())
+
+    middleware = MonitoredExecutorsMiddleware(app)
+    executor_stats.snapshot()
+
+    async def run() -> None:
+        connections = (middleware({"type": "http"}, None, None) for _ in range(2))  # type: ignore # No messages are exchanged
+        await asyncio.gather(*connections)
+
+    # Run like a server: under `async_to_sync`, thread sensitive calls go back to the calling thread instead
+    asyncio.run(run())
+    sample = executor_stats.snapshot()
+
+    assert sample["thread_sensitive"].wait_time >= 0.1
+    assert sample["thread_sensitive"].queue_depth == 0
+    assert sample["thread_sensitive"].active_threads == 0
+    assert "default" in sample
+    # Each connection has its own thread for thread sensitive calls
+    assert threads[0] != threads[2]
+
+
+def test_counts_waiting_and_running_tasks() -> None:
+    executor = MonitoredExecutor("test_counts", max_workers=1)
+    release = threading.Event()
+    running = executor.submit(release.wait)
+    waiting = executor.submit(time.sleep, 0)
+    cancelled = executor.submit(time.sleep, 0)
+
+    while executor_stats.snapshot()["test_counts"].active_threads == 0:
+        time.sleep(0.001)
+    assert executor_stats.snapshot()["test_counts"] == ExecutorSample(wait_time=0.0, queue_depth=2, active_threads=1)
+
+    assert cancelled.cancel()
+    release.set()
+    running.result()
+    waiting.result()
+    executor.shutdown()
+
+    sample = executor_stats.snapshot()["test_counts"]
+    assert (sample.queue_depth, sample.active_threads) == (0, 0)
+    assert sample.wait_time > 0
+
+
+def test_record_warns_over_threshold(monitor: LoopMonitor, caplog: pytest.LogCaptureFixture) -> None:
+    sample = LoopSample(
+        lag=0.2,
+        executors={"default": ExecutorSample(wait_time=0.2, queue_depth=4, active_threads=8)},
+    )
+
+    with caplog.at_level(logging.WARNING):
+        monitor.record(sample)
+
+    assert [r.getMessage() for r in caplog.records] == [
+        "Event loop lag threshold exceeded",
+        "Executor wait time threshold exceeded",
+    ]
+
+
+def test_record_silent_under_threshold(monitor: LoopMonitor, caplog: pytest.LogCaptureFixture) -> None:
+    sample = LoopSample(
+        lag=0.001,
+        executors={"default": ExecutorSample(wait_time=0.001, queue_depth=0, active_threads=1)},
+    )
+
+    with caplog.at_level(logging.WARNING):
+        monitor.record(sample)
+
+    assert not caplog.records
+
+
+def test_lifespan_starts_and_stops_monitor(monitor: LoopMonitor) -> None:
+    async def app(*args: Any) -> None:  # noqa: ARG001 # ASGI signature
+        pytest.fail("Lifespan events should not be forwarded")
+
+    middleware = LoopMonitorMiddleware(app, monitor=monitor)
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent: list[dict[str, Any]] = []
+    running: list[bool] = []
+
+    async def receive() -> dict[str, Any]:
+        running.append(monitor._task is not None)  # noqa: SLF001
+        return messages.pop(0)
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    async_to_sync(middleware)({"type": "lifespan"}, receive, send)
+
+    assert sent == [{"type": "lifespan.startup.complete"}, {"type": "lifespan.shutdown.complete"}]
+    assert running == [False, True]
+    assert monitor._task is None  # noqa: SLF001
@@ -0,0 +1,40 @@
+from ..pool import pool_observations
+
+
+def values(observations: dict, instrument: str) -> list[tuple[float, dict]]:
+    return [(o.value, dict(o.attributes or {})) for o in observations[instrument]]
+
+
+def test_pool_observations() -> None:
+    stats = {
+        "pool_max": 10,
+        "pool_size": 4,
+        "pool_available": 1,
+        "requests_waiting": 2,
+        "requests_wait_ms": 1500,
+        "connections_num": 6,
+        "connections_lost": 1,
+    }
+
+    observations = pool_observations("default", stats)
+
+    name = {"db.client.connection.pool.name": "default"}
+    assert values(observations, "db.client.connection.count") == [
+        (1, {**name, "db.client.connection.state": "idle"}),
+        (3, {**name, "db.client.connection.state": "used"}),
+    ]
+    assert values(observations, "db.client.connection.utilization") == [(0.3, name)]
+    assert values(observations, "db.client.connection.pending_requests") == [(2, name)]
+    assert values(observations, "db.client.connection.wait_time.total") == [(1.5, name)]
+    assert values(observations, "db.client.connection.created") == [(6, name)]
+    assert values(observations, "db.client.connection.lost") == [(1, name)]
+    # Counters missing from the stats (e.g. before the first error) are reported as 0
+    assert values(observations, "db.client.connection.timeouts") == [(0, name)]
+
+
+def test_pool_observations_without_max_size() -> None:
+    observations = pool_observations("default", {})
+
+    assert values(observations, "db.client.connection.utilization") == [
+        (0.0, {"db.client.connection.pool.name": "default"})
+    ]
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.test import RequestFactory
+
+from .. import executors, profiling
+from ..executors import MonitoredExecutorsMiddleware, add_task_hook
+from ..profiling import graphql_operation_name, profile_tags, request_tags, thread_tags
+
+operation_scenarios = {
+    "named": ({"query": "query Me { me { id } }", "operationName": "Me"}, "Me"),
+    "anonymous": ({"query": "{ me { id } }"}, "anonymous"),
+    "batch": ([{"query": "{ me { id } }"}], "batch"),
+}
+
+
+@pytest.mark.parametrize(("body", "expected"), operation_scenarios.values(), ids=operation_scenarios.keys())
+def test_graphql_operation_name(body: object, expected: str) -> None:
+    request = RequestFactory().post("/graphql/", data=json.dumps(body), content_type="application/json")
+
+    assert graphql_operation_name(request) == expected
+
+
+def test_graphql_operation_name_from_query_params() -> None:
+    request = RequestFactory().get("/graphql/", {"query": "query Me { me { id } }", "operationName": "Me"})
+
+    assert graphql_operation_name(request) == "Me"
+
+
+def test_graphql_operation_name_invalid_body() -> None:
+    request = RequestFactory().post("/graphql/", data="{", content_type="application/json")
+
+    assert graphql_operation_name(request) == "unknown"
+
+
+def test_request_tags_unknown_route() -> None:
+    request = RequestFactory().get("/does-not-exist/")
+
+    assert request_tags(request) == {"route": "unknown"}
+
+
+def test_profile_tags_apply_to_sync_to_async_threads_only(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(executors, "_task_hooks", [])
+    add_task_hook(thread_tags)
+    applied: list[tuple[int, dict[str, str]]] = []
+
+    @contextmanager
+    def tag_wrapper(tags: dict[str, str]) -> Iterator[None]:
+        applied.append((threading.get_ident(), tags))
+        yield
+
+    monkeypatch.setattr(profiling.pyroscope, "tag_wrapper", tag_wrapper)
+
+    worker_threads: list[int] = []
+
+    async def handle(route: str) -> None:
+        with profile_tags({"route": route}), profile_tags({"slice": "users"}):
+            await asyncio.sleep(0)
+            worker_threads.append(await sync_to_async(threading.get_ident)())
+            worker_threads.append(await sync_to_async(threading.get_ident, thread_sensitive=False)())
+
+    async def app(scope: dict[str, Any], *args: Any) -> None:  # noqa: ARG001 # ASGI signature
+        await handle(scope["path"])
+
+    middleware = MonitoredExecutorsMiddleware(app)
+
+    async def run() -> int:
+        connections = (middleware({"type": "http", "path": path}, None, None) for path in ("/a/", "/b/"))  # type: ignore # No messages are exchanged
+        await asyncio.gather(*connections)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert sorted(tags["route"] for _, tags in applied) == ["/a/", "/a/", "/b/", "/b/"]
+    assert all(tags["slice"] == "users" for _, tags in applied)
+    assert {thread for thread, _ in applied} == set(worker_threads)
+    assert loop_thread not in worker_threads
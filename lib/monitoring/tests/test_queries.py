@@ -0,0 +1,109 @@
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+
+from core.models import User
+
+from ..middleware import TelemetryMiddleware
+from ..queries import QueryStats, normalize_sql, track_queries
+
+normalize_scenarios = {
+    "placeholders": ('SELECT * FROM "user" WHERE "id" = %s', 'SELECT * FROM "user" WHERE "id" = ?'),
+    "literals": (
+        'SELECT * FROM "user" WHERE "email" = \'a@b.c\' LIMIT 21',
+        'SELECT * FROM "user" WHERE "email" = ? LIMIT ?',
+    ),
+    "in lists": ('SELECT * FROM "user" WHERE "id" IN (%s, %s, %s)', 'SELECT * FROM "user" WHERE "id" IN (...)'),
+    "whitespace": ('SELECT *\n  FROM   "user"', 'SELECT * FROM "user"'),
+    # Digits inside identifiers are not literals
+    "identifiers": ('SELECT "t1"."id" FROM "table1" "t1"', 'SELECT "t1"."id" FROM "table1" "t1"'),
+}
+
+
+@pytest.mark.parametrize(("sql", "expected"), normalize_scenarios.values(), ids=normalize_scenarios.keys())
+def test_normalize_sql(sql: str, expected: str) -> None:
+    assert normalize_sql(sql) == expected
+
+
+def test_query_stats_duplicates() -> None:
+    stats = QueryStats()
+
+    stats.record('SELECT * FROM "user" WHERE "id" = 1', 0.001)
+    stats.record('SELECT * FROM "user" WHERE "id" = 2', 0.002)
+    stats.record('SELECT * FROM "session"', 0.003)
+
+    assert stats.count == 3
+    assert stats.duration == pytest.approx(0.006)
+    assert stats.duplicates == {'SELECT * FROM "user" WHERE "id" = ?': 2}
+    assert stats.duplicate_count == 1
+    assert stats.server_timing() == 'db;dur=6.00;desc="3 queries, 1 duplicates"'
+
+
+@pytest.mark.django_db
+def test_track_queries() -> None:
+    with track_queries() as stats:
+        User.objects.count()
+        User.objects.count()
+
+    # Queries outside the block are not counted
+    User.objects.count()
+
+    assert stats.count == 2
+    assert stats.duplicate_count == 1
+
+
+@pytest.mark.django_db
+def test_assert_max_queries(assert_max_queries: Callable[..., AbstractContextManager[QueryStats]]) -> None:
+    with assert_max_queries(1):
+        User.objects.count()
+
+    def exceed() -> None:
+        with assert_max_queries(1):
+            User.objects.count()
+            User.objects.exists()
+
+    with pytest.raises(pytest.fail.Exception):
+        exceed()
+
+
+@pytest.mark.django_db
+def test_assert_max_queries_strict(assert_max_queries: Callable[..., AbstractContextManager[QueryStats]]) -> None:
+    def repeat() -> None:
+        with assert_max_queries(10, strict=True):
+            User.objects.count()
+            User.objects.count()
+
+    with pytest.raises(pytest.fail.Exception):
+        repeat()
+
+
+async def count_users_twice(request: HttpRequest) -> HttpResponse:  # noqa: ARG001 # request is passed by Django
+    await User.objects.acount()
+    await User.objects.acount()
+    return HttpResponse()
+
+
+@pytest.mark.django_db
+def test_server_timing_header_in_debug(settings: Any) -> None:
+    settings.DEBUG = True
+    middleware = TelemetryMiddleware(count_users_twice)
+
+    response = async_to_sync(middleware)(RequestFactory().get("/"))
+
+    assert response["Server-Timing"].startswith("db;dur=")
+    assert 'desc="2 queries, 1 duplicates", total;dur=' in response["Server-Timing"]
+
+
+@pytest.mark.django_db
+def test_no_server_timing_header_without_debug(settings: Any) -> None:
+    settings.DEBUG = False
+    middleware = TelemetryMiddleware(count_users_twice)
+
+    response = async_to_sync(middleware)(RequestFactory().get("/"))
+
+    assert "Server-Timing" not in response
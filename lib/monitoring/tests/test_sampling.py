@@ -0,0 +1,60 @@
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ALWAYS_ON, ParentBased, Sampler
+
+from ..sampling import RecordingSampler, TailSamplingSpanProcessor
+
+
+def make_tracer(root_sampler: Sampler, latency_threshold: float) -> tuple[trace.Tracer, InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(sampler=RecordingSampler(ParentBased(root=root_sampler)))
+    provider.add_span_processor(
+        TailSamplingSpanProcessor(SimpleSpanProcessor(exporter), latency_threshold=latency_threshold)
+    )
+    return provider.get_tracer(__name__), exporter
+
+
+def test_recording_sampler_records_dropped_spans() -> None:
+    tracer, _ = make_tracer(ALWAYS_OFF, latency_threshold=60)
+
+    with tracer.start_as_current_span("root") as root, tracer.start_as_current_span("child") as child:
+        assert root.is_recording()
+        assert child.is_recording()
+
+    assert root.get_span_context().trace_flags.sampled is False
+    assert child.get_span_context().trace_flags.sampled is False
+
+
+def test_sampled_traces_are_exported() -> None:
+    tracer, exporter = make_tracer(ALWAYS_ON, latency_threshold=60)
+
+    with tracer.start_as_current_span("root"), tracer.start_as_current_span("child"):
+        pass
+
+    assert [s.name for s in exporter.get_finished_spans()] == ["child", "root"]
+
+
+tail_scenarios = {
+    # Unsampled traces that are fast and successful are dropped
+    "fast": (60.0, False, []),
+    # Slow traces are kept in full, flagged as sampled
+    "slow": (0.0, False, ["child", "root"]),
+    # Traces with an error anywhere are kept in full
+    "error": (60.0, True, ["child", "root"]),
+}
+
+
+@pytest.mark.parametrize(("latency_threshold", "error", "expected"), tail_scenarios.values(), ids=tail_scenarios.keys())
+def test_tail_sampling(latency_threshold: float, error: bool, expected: list[str]) -> None:
+    tracer, exporter = make_tracer(ALWAYS_OFF, latency_threshold=latency_threshold)
+
+    with tracer.start_as_current_span("root"), tracer.start_as_current_span("child") as child:
+        if error:
+            child.set_status(trace.StatusCode.ERROR)
+
+    spans = exporter.get_finished_spans()
+    assert [s.name for s in spans] == expected
+    assert all(s.get_span_context().trace_flags.sampled for s in spans)
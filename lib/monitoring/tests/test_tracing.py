@@ -0,0 +1,49 @@
+import pytest
+from asgiref.sync import async_to_sync
+
+from lib.errors import AuthorizationError
+from lib.permissions import permission
+
+from ..tracing import in_unsampled_trace, trace_async_function, trace_function, tracing_enabled
+
+# Tests run without `config/otel_setup.py`, so there is no tracer provider configured
+
+
+def test_tracing_disabled_without_provider() -> None:
+    assert tracing_enabled() is False
+    assert in_unsampled_trace() is False
+
+
+def test_trace_function_returns_original_function() -> None:
+    def func() -> int:
+        return 1
+
+    assert trace_function()(func) is func
+
+
+def test_trace_async_function_returns_original_function() -> None:
+    async def func() -> int:
+        return 1
+
+    assert trace_async_function(name="test")(func) is func
+
+
+permission_scenarios = {
+    "allowed": (True, None),
+    "denied": (False, AuthorizationError),
+    # Anything other than True is treated as denied
+    "truthy": (1, AuthorizationError),
+}
+
+
+@pytest.mark.parametrize(("result", "error"), permission_scenarios.values(), ids=permission_scenarios.keys())
+def test_permission_without_provider(result: object, error: type[Exception] | None) -> None:
+    @permission
+    async def can_do_something() -> bool:
+        return result  # type: ignore # Testing non-boolean results
+
+    if error is None:
+        async_to_sync(can_do_something)()
+    else:
+        with pytest.raises(error):
+            async_to_sync(can_do_something)()
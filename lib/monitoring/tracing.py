@@ -2,16 +2,44 @@ from collections.abc import Awaitable, Callable
 from functools import wraps
 
 from opentelemetry import trace
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
 
 tracer = trace.get_tracer(__name__)
 
 
+def tracing_enabled() -> bool:
+    """Whether a tracer provider that can record spans has been configured.
+
+    Decorators check this once, when they are applied, so the provider must be configured before the decorated
+    modules are imported (see `config/otel_setup.py`). Without one, they return the original function.
+    """
+    provider = trace.get_tracer_provider()
+    if isinstance(provider, trace.ProxyTracerProvider | trace.NoOpTracerProvider):
+        return False
+    return getattr(provider, "sampler", None) is not ALWAYS_OFF
+
+
+def in_unsampled_trace() -> bool:
+    """Whether the current trace was not sampled, in which case child spans would be dropped anyway.
+
+    Spans that are recorded without being sampled (for tail sampling) still get children.
+    """
+    span = trace.get_current_span()
+    span_context = span.get_span_context()
+    return span_context.is_valid and not span_context.trace_flags.sampled and not span.is_recording()
+
+
 def trace_function[**P, T](name: str | None = None) -> Callable[[Callable[P, T]], Callable[P, T]]:
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        if not tracing_enabled():
+            return func
+
         span_name = name or f"{func.__module__}.{func.__name__}"
 
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if in_unsampled_trace():
+                return func(*args, **kwargs)
             with tracer.start_as_current_span(span_name):
                 return func(*args, **kwargs)
 
@@ -25,10 +53,15 @@ def trace_async_function[**P, T](
     metadata: dict[str, str | int | bool] | None = None,
 ) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
     def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        if not tracing_enabled():
+            return func
+
         span_name = name or f"{func.__module__}.{func.__name__}"
 
         @wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if in_unsampled_trace():
+                return await func(*args, **kwargs)
             with tracer.start_as_current_span(span_name, kind=trace.SpanKind.SERVER) as span:
                 if metadata:
                     span.set_attributes(metadata)
@@ -1,9 +1,12 @@
-from .paginator import Node, Page, PageInfo, PageInput, paginate
+from .paginator import Node, Page, PageInfo, PageInput, get_ordering, paginate
+from .sorting import SortRegistry
 
 __all__ = [
     "Node",
     "Page",
     "PageInfo",
     "PageInput",
+    "SortRegistry",
+    "get_ordering",
     "paginate",
 ]
@@ -1,10 +1,13 @@
+import json
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Any, Protocol
 
 from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.signing import b64_decode, b64_encode
-from django.db.models import QuerySet
+from django.db.models import F, Field, Q, QuerySet
+from django.db.models.fields.tuple_lookups import TupleGreaterThan, TupleLessThan
 
 from lib.models import BaseModel
 
@@ -19,6 +22,79 @@ def decode_cursor(cursor: str) -> str:
     return b64_decode(cursor.encode()).decode()
 
 
+def _orderable_fields(queryset: QuerySet[Any]) -> "dict[str, tuple[str, Field[Any, Any]]]":
+    """The fields and annotations a cursor can be made of, as (attribute, field) by name and attname."""
+    opts = queryset.model._meta  # noqa: SLF001 # Public Django API
+    fields = {"pk": (opts.pk.attname, opts.pk)}
+    for field in opts.concrete_fields:
+        fields[field.name] = fields[field.attname] = (field.attname, field)
+    for name, annotation in queryset.query.annotations.items():
+        fields[name] = (name, annotation.output_field)
+    return fields
+
+
+def get_ordering(queryset: QuerySet[Any]) -> tuple[str, ...]:
+    """The fields a queryset is explicitly ordered by, e.g. by a `SortRegistry`, or `("id",)`.
+
+    A unique field is appended when the ordering doesn't end with one, so that cursors point at a single row.
+    Annotations, such as a search rank, can be part of the ordering. Orderings on expressions or related fields
+    can't be turned into cursors, and fall back to `id`.
+    """
+    fields = _orderable_fields(queryset)
+    ordering = queryset.query.order_by
+    if not ordering or not all(isinstance(field, str) and field.lstrip("-") in fields for field in ordering):
+        return ("id",)
+    ordering = tuple(("-" if field.startswith("-") else "") + fields[field.lstrip("-")][0] for field in ordering)
+    if not any(fields[field.lstrip("-")][1].unique for field in ordering):
+        ordering = (*ordering, "-id" if ordering[-1].startswith("-") else "id")
+    return ordering
+
+
+def _cursor_values(item: BaseModel, ordering: Sequence[str]) -> list[Any]:
+    return [getattr(item, field.lstrip("-")) for field in ordering]
+
+
+def _encode_values(item: BaseModel, ordering: Sequence[str]) -> str:
+    values = _cursor_values(item, ordering)
+    if len(ordering) == 1:
+        # Single field cursors hold the bare value, as they always have
+        return encode_cursor(str(values[0]))
+    # Values are read back with the `to_python` of their field
+    return encode_cursor(
+        json.dumps([value.isoformat() if hasattr(value, "isoformat") else str(value) for value in values])
+    )
+
+
+def _decode_values(queryset: QuerySet[Any], cursor: str, ordering: Sequence[str]) -> list[Any]:
+    data = decode_cursor(cursor)
+    if len(ordering) == 1:
+        return [data]
+    fields = _orderable_fields(queryset)
+    return [
+        fields[field.lstrip("-")][1].to_python(value) for field, value in zip(ordering, json.loads(data), strict=True)
+    ]
+
+
+def _beyond(ordering: Sequence[str], values: Sequence[Any], *, forward: bool) -> Q:
+    """Rows after `values` in `ordering`, or before them when not going `forward`."""
+    ascending = [not field.startswith("-") for field in ordering]
+    names = [field.lstrip("-") for field in ordering]
+    if len(ordering) == 1:
+        return Q(**{f"{names[0]}__{'gt' if ascending[0] == forward else 'lt'}": values[0]})
+    if len(set(ascending)) == 1:
+        # A row comparison, e.g. `(created_at, id) < (%s, %s)`, is a single range scan of a matching index
+        lookup = TupleGreaterThan if ascending[0] == forward else TupleLessThan
+        return Q(lookup(tuple(F(name) for name in names), tuple(values)))
+    # Mixed directions, e.g. `a > x OR (a = x AND b < y)`
+    condition = Q()
+    for position, (name, value) in enumerate(zip(names, values, strict=True)):
+        step = Q(**{f"{name}__{'gt' if ascending[position] == forward else 'lt'}": value})
+        for previous, previous_value in zip(names[:position], values[:position], strict=True):
+            step &= Q(**{previous: previous_value})
+        condition |= step
+    return condition
+
+
 class PageInput(Protocol):
     first: int | None = None
     after: str | None = None
@@ -54,20 +130,17 @@ def paginate[T: BaseModel](
     cursor: str | None = None,
     limit: int = DEFAULT_LIMIT,
     forward: bool = True,
-    sorting_field: str = "id",
+    ordering: Sequence[str] | None = None,
     include_more: bool = True,
 ) -> Page[T]:
-    if cursor:
-        cursor = decode_cursor(cursor)
-
-    queryset = queryset.order_by(sorting_field if forward else f"-{sorting_field}")
+    """Paginates `queryset` with keyset cursors over `ordering`, which defaults to `get_ordering(queryset)`."""
+    ordering = tuple(ordering) if ordering else get_ordering(queryset)
 
-    selector = "gt" if forward else "lt"
-    query = {f"{sorting_field}__{selector}": cursor} if cursor else {}
+    queryset = queryset.order_by(*(ordering if forward else _reversed(ordering)))
 
     original_queryset = queryset
     if cursor:
-        queryset = queryset.filter(**query)
+        queryset = queryset.filter(_beyond(ordering, _decode_values(queryset, cursor, ordering), forward=forward))
 
     items = list(queryset[: limit + 1])
 
@@ -90,35 +163,27 @@ def paginate[T: BaseModel](
     if not forward and items:
         items = list(reversed(items))
 
-    start_cursor = None
-    end_cursor = None
-    if items:
-        start_cursor = getattr(items[0], sorting_field)
-        end_cursor = getattr(items[-1], sorting_field)
-
     # Executing 1 more db query to get the first and last items to avoid using count() on the queryset
     # count() on postgres is an expensive operation for large
 
     if include_more:
         has_next_page = (
-            has_more if forward else original_queryset.filter(**{f"{sorting_field}__gt": end_cursor}).exists()
+            has_more
+            if forward
+            else original_queryset.filter(_beyond(ordering, _cursor_values(items[-1], ordering), forward=True)).exists()
         )
         has_previous_page = (
-            has_more if not forward else original_queryset.filter(**{f"{sorting_field}__lt": start_cursor}).exists()
+            has_more
+            if not forward
+            else original_queryset.filter(_beyond(ordering, _cursor_values(items[0], ordering), forward=False)).exists()
         )
     else:
         has_next_page = False
         has_previous_page = False
 
-    if start_cursor:
-        start_cursor = encode_cursor(str(start_cursor))
-
-    if end_cursor:
-        end_cursor = encode_cursor(str(end_cursor))
-
     edges = [
         Node(
-            cursor=encode_cursor(str(getattr(item, sorting_field))),
+            cursor=_encode_values(item, ordering),
             node=item,
         )
         for item in items
@@ -128,9 +193,13 @@ def paginate[T: BaseModel](
         edges=edges,
         page_info=PageInfo(
             count=len(edges),
-            start_cursor=start_cursor,
-            end_cursor=end_cursor,
+            start_cursor=edges[0].cursor,
+            end_cursor=edges[-1].cursor,
             has_next_page=has_next_page,
             has_previous_page=has_previous_page,
         ),
     )
+
+
+def _reversed(ordering: Sequence[str]) -> tuple[str, ...]:
+    return tuple(field[1:] if field.startswith("-") else f"-{field}" for field in ordering)
@@ -0,0 +1,114 @@
+from collections.abc import Mapping, Sequence
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.db.models import QuerySet
+from django.utils.translation import gettext as _
+
+from lib.errors import InputError
+from lib.models import BaseModel
+
+
+def _sign(field: str) -> str:
+    return "-" if field.startswith("-") else ""
+
+
+def _index_orderings(model: type[models.Model]) -> list[tuple[str, ...]]:
+    """The column orderings the B-tree indexes of `model` can be scanned in, forwards."""
+    opts = model._meta  # noqa: SLF001 # Public Django API
+    orderings = [(field.attname,) for field in opts.concrete_fields if field.unique or field.db_index]
+    for index in opts.indexes:
+        # Partial indexes only serve queries repeating their condition, and other types can't be scanned in order
+        if index.condition is None and index.suffix == models.Index.suffix and index.fields:
+            orderings.append(tuple(_sign(field) + opts.get_field(field.lstrip("-")).attname for field in index.fields))
+    for constraint in opts.constraints:
+        if isinstance(constraint, models.UniqueConstraint) and constraint.condition is None and constraint.fields:
+            orderings.append(tuple(opts.get_field(field).attname for field in constraint.fields))
+    return orderings
+
+
+def _is_served(ordering: tuple[str, ...], index: tuple[str, ...]) -> bool:
+    if len(ordering) > len(index) or [f.lstrip("-") for f in ordering] != [
+        f.lstrip("-") for f in index[: len(ordering)]
+    ]:
+        return False
+    # An index is scanned either forwards or backwards, so every direction must match or every one must differ
+    return len({_sign(field) == _sign(column) for field, column in zip(ordering, index, strict=False)}) == 1
+
+
+class SortRegistry[T: BaseModel]:
+    """
+    The sorts a listing accepts, mapping public sort keys to orderings served by an index of `model`.
+
+    Orderings use field names, prefixed with "-" for descending order, and must end with a unique field so that
+    cursors of `lib.pagination.paginate` point at a single row. They are checked against `Meta.indexes` (and
+    unique or indexed fields) when the registry is created, which is when the slice is imported, so that a sort
+    needing a sequential scan and sort fails at startup rather than under load. Listings always filtered on a
+    column (e.g. `author`) can lead with it to use an index starting with that column.
+
+    Example:
+        SORTS = SortRegistry(Post, {"newest": ("-created_at", "-id"), "title": ("title", "id")}, default="newest")
+
+        queryset = SORTS.apply(Post.objects.all(), sort)
+    """
+
+    def __init__(self, model: type[T], sorts: Mapping[str, Sequence[str]], *, default: str) -> None:
+        self.model = model
+        self.orderings = {key: self._validate(key, ordering) for key, ordering in sorts.items()}
+        if default not in self.orderings:
+            raise ImproperlyConfigured(f"Default sort {default!r} of {model.__name__} isn't one of its sorts.")
+        self.default = default
+
+    def _validate(self, key: str, ordering: Sequence[str]) -> tuple[str, ...]:
+        opts = self.model._meta  # noqa: SLF001 # Public Django API
+        try:
+            fields = [opts.get_field(field.lstrip("-")) for field in ordering]
+        except FieldDoesNotExist as error:
+            raise ImproperlyConfigured(f"Sort {key!r} of {self.model.__name__}: {error}") from error
+        if not fields or any(not field.concrete or field.null for field in fields):
+            raise ImproperlyConfigured(
+                f"Sort {key!r} of {self.model.__name__} must order by non null fields of the model's table."
+            )
+        # Fields after the first unique one never change the order
+        unique = next((position for position, field in enumerate(fields) if field.unique), None)
+        if unique is None:
+            raise ImproperlyConfigured(
+                f"Sort {key!r} of {self.model.__name__} must end with a unique field (e.g. 'id') to paginate."
+            )
+        columns = tuple(_sign(field) + opts.get_field(field.lstrip("-")).attname for field in ordering[: unique + 1])
+        if not any(_is_served(columns, index) for index in _index_orderings(self.model)):
+            raise ImproperlyConfigured(
+                f"Sort {key!r} of {self.model.__name__} isn't served by an index, add "
+                f"models.Index(fields={list(ordering[: unique + 1])!r}, ...) to its Meta.indexes."
+            )
+        return columns
+
+    @property
+    def keys(self) -> tuple[str, ...]:
+        return tuple(self.orderings)
+
+    def ordering(self, sort: str | None) -> tuple[str, ...]:
+        """
+        The ordering of `sort`, or of the default sort. Raises an `InputError` for other sorts.
+        """
+        if not sort:
+            sort = self.default
+        try:
+            return self.orderings[sort]
+        except KeyError:
+            keys = ", ".join(self.keys)
+            raise InputError(
+                f"Unsupported sort {sort!r} for {self.model.__name__}",
+                code="invalid_sort",
+                message=_("Sorting by %(sort)s isn't supported. Options are %(keys)s.") % {"sort": sort, "keys": keys},
+                path=["sort"],
+            ) from None
+
+    def apply(self, queryset: QuerySet[T], sort: str | None) -> QuerySet[T]:
+        """
+        Order `queryset` by `sort`, which `lib.pagination.paginate` then uses as its cursor.
+        """
+        return queryset.order_by(*self.ordering(sort))
+
+    def __repr__(self) -> str:
+        return f"SortRegistry({self.model.__name__}, {self.keys!r}, default={self.default!r})"
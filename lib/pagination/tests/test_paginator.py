@@ -0,0 +1,25 @@
+import pytest
+from asgiref.sync import async_to_sync
+
+from core.auth.tests.factories import UserFactory
+from core.models import User
+
+from ..paginator import paginate
+
+
+@pytest.mark.django_db
+def test_paginate_forwards_and_backwards() -> None:
+    users = UserFactory.create_batch(3)
+    queryset = User.objects.filter(pk__in=[user.pk for user in users])
+
+    first = async_to_sync(paginate)(queryset, limit=2)
+    second = async_to_sync(paginate)(queryset, cursor=first.page_info.end_cursor, limit=2)
+
+    assert [edge.node for edge in first.edges] == users[:2]
+    assert [edge.node for edge in second.edges] == users[2:]
+    assert first.page_info.has_next_page
+    assert not second.page_info.has_next_page
+
+    previous = async_to_sync(paginate)(queryset, cursor=second.page_info.start_cursor, limit=2, forward=False)
+    assert [edge.node for edge in previous.edges] == users[:2]
+    assert not previous.page_info.has_previous_page
@@ -0,0 +1,79 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ImproperlyConfigured
+
+from core.auth.tests.factories import UserFactory
+from core.models import User
+from lib.errors import InputError
+
+from ..paginator import get_ordering, paginate
+from ..sorting import SortRegistry, _is_served
+
+
+def test_sort_registry_maps_keys_to_orderings() -> None:
+    sorts = SortRegistry(User, {"email": ("email",), "-email": ("-email",), "newest": ("-id",)}, default="newest")
+
+    assert sorts.ordering("-email") == ("-email",)
+    assert sorts.ordering(None) == ("-id",)
+    assert str(sorts.apply(User.objects.all(), "email").query).endswith('ORDER BY "user"."email" ASC')
+
+
+def test_sort_registry_rejects_unknown_sorts() -> None:
+    sorts = SortRegistry(User, {"email": ("email",)}, default="email")
+
+    with pytest.raises(InputError) as error:
+        sorts.ordering("first_name")
+    assert error.value.code == "invalid_sort"
+    assert error.value.path == ["sort"]
+
+
+@pytest.mark.parametrize(
+    ("ordering", "match"),
+    [
+        (("-created_at", "-id"), "isn't served by an index"),
+        (("first_name",), "must end with a unique field"),
+        (("created_by", "id"), "non null fields"),
+        (("missing",), "has no field named"),
+    ],
+)
+def test_sort_registry_validates_orderings(ordering: tuple[str, ...], match: str) -> None:
+    with pytest.raises(ImproperlyConfigured, match=match):
+        SortRegistry(User, {"sort": ordering}, default="sort")
+
+
+def test_is_served_in_either_direction() -> None:
+    index = ("author_id", "-created_at", "-id")
+
+    assert _is_served(("author_id", "-created_at", "-id"), index)
+    assert _is_served(("-author_id", "created_at", "id"), index)
+    assert _is_served(("author_id",), index)
+    assert not _is_served(("author_id", "created_at", "-id"), index)
+    assert not _is_served(("-created_at", "-id"), index)
+
+
+def test_get_ordering_appends_a_unique_field() -> None:
+    assert get_ordering(User.objects.all()) == ("id",)
+    assert get_ordering(User.objects.order_by("-first_name")) == ("-first_name", "-id")
+    assert get_ordering(User.objects.order_by("-email")) == ("-email",)
+
+
+@pytest.mark.django_db
+def test_paginate_with_compound_cursors() -> None:
+    users = UserFactory.create_batch(5, first_name="Same")
+    queryset = User.objects.filter(pk__in=[user.pk for user in users]).order_by("-first_name")
+    expected = [user.pk for user in sorted(users, key=lambda user: -user.pk)]
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page = async_to_sync(paginate)(queryset, cursor=cursor, limit=2)
+        seen += [edge.node.pk for edge in page.edges]
+        if not page.page_info.has_next_page:
+            break
+        cursor = page.page_info.end_cursor
+    assert seen == expected
+
+    page = async_to_sync(paginate)(queryset, cursor=page.page_info.start_cursor, limit=2, forward=False)
+    assert [edge.node.pk for edge in page.edges] == expected[2:4]
+    assert page.page_info.has_previous_page
+    assert page.page_info.has_next_page
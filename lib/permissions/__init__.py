@@ -1,5 +1,14 @@
+from .memo import PermissionMemo, current_memo, memoize_permissions
+from .middleware import PermissionMemoMiddleware
 from .permission import permission
+from .rules import RowPermission, row_permission
 
 __all__ = [
+    "PermissionMemo",
+    "PermissionMemoMiddleware",
+    "RowPermission",
+    "current_memo",
+    "memoize_permissions",
     "permission",
+    "row_permission",
 ]
@@ -0,0 +1,106 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Any
+
+from django.db import models
+from django.dispatch import receiver
+
+from lib.models import models_changed
+
+
+class PermissionMemo:
+    """The permission decisions made during a request, keyed by permission and arguments.
+
+    Concurrent checks with the same arguments, e.g. from the resolvers of every node of a listing, share a single
+    evaluation, and so a single tracing span. Failed checks aren't kept. The memo is cleared whenever the request
+    changes `BaseModel` rows, so that checks made after a write see it; clear it with `clear()` after other writes.
+    """
+
+    def __init__(self) -> None:
+        self._decisions: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._decisions)
+
+    async def adecide[T](self, key: Hashable, check: Callable[[], Awaitable[T]]) -> T:
+        """Returns the decision memoized for `key`, making it with `check()` if needed."""
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = self._decisions[key] = asyncio.ensure_future(check())
+            decision.add_done_callback(partial(self._forget_failure, key))
+        return await asyncio.shield(decision)
+
+    def clear(self) -> None:
+        self._decisions.clear()
+
+    def _forget_failure(self, key: Hashable, decision: asyncio.Future[Any]) -> None:
+        if (decision.cancelled() or decision.exception() is not None) and self._decisions.get(key) is decision:
+            del self._decisions[key]
+
+
+_memo: ContextVar[PermissionMemo | None] = ContextVar("permission_memo", default=None)
+
+
+@contextmanager
+def memoize_permissions() -> Iterator[PermissionMemo]:
+    """Memoizes the permission decisions made within the block."""
+    memo = PermissionMemo()
+    token = _memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _memo.reset(token)
+
+
+def current_memo() -> PermissionMemo | None:
+    """The memo of the current request, if any."""
+    return _memo.get()
+
+
+class _Unhashable(Exception):  # noqa: N818 # Internal control flow
+    pass
+
+
+def _normalize(value: Any) -> Hashable:
+    # Rows are identified by their primary key, rather than by their instance
+    if isinstance(value, models.Model):
+        if value.pk is None:
+            raise _Unhashable
+        return (value._meta.label, value.pk)  # noqa: SLF001 # Public Django API
+    try:
+        hash(value)
+    except TypeError:
+        raise _Unhashable from None
+    return value
+
+
+def decision_key(check: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable | None:
+    """Identifies a decision by its check and arguments, or `None` when an argument can't be part of a key."""
+    try:
+        return (
+            check,
+            tuple(_normalize(arg) for arg in args),
+            tuple(sorted((name, _normalize(value)) for name, value in kwargs.items())),
+        )
+    except _Unhashable:
+        return None
+
+
+async def adecide[T](check: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+    """Returns `await check(*args, **kwargs)`, memoized for the current request."""
+    memo = _memo.get()
+    key = None if memo is None else decision_key(check, args, kwargs)
+    if memo is None or key is None:
+        return await check(*args, **kwargs)
+    return await memo.adecide(key, partial(check, *args, **kwargs))
+
+
+@receiver(models_changed)
+def _clear_on_write(**_: Any) -> None:
+    # Sent in the context of the request making the change, including from the threads of `sync_to_async`
+    memo = _memo.get()
+    if memo is not None:
+        memo.clear()
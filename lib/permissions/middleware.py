@@ -0,0 +1,26 @@
+from collections.abc import Awaitable, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpRequest, HttpResponse
+
+from .memo import memoize_permissions
+
+
+class PermissionMemoMiddleware:
+    """Memoizes the permission decisions of each request, available as `request.permissions`.
+
+    See `lib.permissions.memo.PermissionMemo`.
+    """
+
+    async_capable = True
+    sync_capable = False
+
+    def __init__(self, get_response: Callable[[HttpRequest], Awaitable[HttpResponse]]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    async def __call__(self, request: HttpRequest) -> HttpResponse:
+        with memoize_permissions() as memo:
+            request.permissions = memo  # type: ignore # Request attribute set by this middleware
+            return await self.get_response(request)
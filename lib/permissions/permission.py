@@ -1,9 +1,10 @@
 from collections.abc import Awaitable, Callable
 from functools import wraps
 
-from opentelemetry import trace
-
 from lib.errors.base import AuthorizationError
+from lib.monitoring.tracing import trace_async_function
+
+from .memo import adecide
 
 
 def permission[**P](func: Callable[P, Awaitable[bool]]) -> Callable[P, Awaitable[None]]:
@@ -11,15 +12,18 @@ def permission[**P](func: Callable[P, Awaitable[bool]]) -> Callable[P, Awaitable
     This decorates a function that returns a boolean indicating whether the user has permission to perform an action.
     If the user does not have permission, it raises an `AuthorizationError`.
 
+    Decisions are memoized per request by arguments (see `lib.permissions.memo`), so only the first check with given
+    arguments is evaluated and traced.
+
     Raises:
         AuthorizationError: If the original function returns anything other than True.
     """
 
+    check = trace_async_function(name=f"permission:{func.__module__}.{func.__name__}")(func)
+
     @wraps(func)
     async def _fn(*args: P.args, **kwargs: P.kwargs) -> None:
-        span_name = f"permission:{func.__module__}.{func.__name__}"
-        with trace.get_tracer(__name__).start_as_current_span(span_name, kind=trace.SpanKind.SERVER):
-            result = await func(*args, **kwargs)
+        result = await adecide(check, *args, **kwargs)
 
         if result is not True:
             raise AuthorizationError(
@@ -0,0 +1,107 @@
+import inspect
+from collections.abc import Awaitable, Callable
+from functools import update_wrapper
+from typing import Any
+
+from django.db import models
+from django.db.models import Q, QuerySet
+
+from lib.errors.base import AuthorizationError
+from lib.monitoring.tracing import trace_async_function
+
+from .memo import adecide
+
+type Rule = Q | bool
+
+
+class RowPermission:
+    """
+    A permission whose rule is a `Q` filter of the rows it allows, see `row_permission`.
+
+    Rules and single object checks are memoized per request by arguments, like `permission` decisions.
+    """
+
+    def __init__(self, func: Callable[..., Awaitable[Rule]]) -> None:
+        update_wrapper(self, func)
+        self.name = func.__name__
+        self._parameters = frozenset(inspect.signature(func).parameters)
+        self._rule = trace_async_function(name=f"permission:{func.__module__}.{func.__name__}")(func)
+
+    async def rule(self, **kwargs: Any) -> Rule:
+        """
+        The filter of the allowed rows, or whether all (`True`) or none (`False`) of them are allowed.
+        """
+        return await adecide(self._rule, **kwargs)
+
+    async def filter[T: models.Model](self, queryset: QuerySet[T], **kwargs: Any) -> QuerySet[T]:
+        """
+        Narrow `queryset` down to the allowed rows, in SQL.
+        """
+        rule = await self.rule(**kwargs)
+        if rule is True:
+            return queryset
+        if rule is False:
+            return queryset.none()
+        return queryset.filter(rule)
+
+    async def aget[T: models.Model](self, queryset: QuerySet[T], lookups: dict[str, Any], **kwargs: Any) -> T:
+        """
+        Fetch the row of `queryset` matching `lookups`, with the rule applied to the same query.
+
+        Raises:
+            DoesNotExist: When no row matches `lookups`.
+            AuthorizationError: When the matching row isn't allowed. Only then is a second query made to tell it
+                apart from a missing row.
+        """
+        try:
+            return await (await self.filter(queryset, **kwargs)).aget(**lookups)
+        except queryset.model.DoesNotExist:
+            if not await queryset.filter(**lookups).aexists():
+                raise
+        raise self._forbidden()
+
+    async def allows(self, obj: models.Model, **kwargs: Any) -> bool:
+        """
+        Whether `obj` is one of the allowed rows. Takes a query unless the rule allows all or no rows, so rows that
+        are about to be fetched should be fetched with `aget` instead.
+        """
+        return await adecide(self._allows, obj, **kwargs)
+
+    async def _allows(self, obj: models.Model, **kwargs: Any) -> bool:
+        rule = await self.rule(**kwargs)
+        if isinstance(rule, bool):
+            return rule
+        return await type(obj)._default_manager.filter(pk=obj.pk).filter(rule).aexists()  # noqa: SLF001 # Public Django API
+
+    async def __call__(self, **kwargs: Any) -> None:
+        # The checked object is the one keyword argument the rule doesn't take, e.g. `post` in
+        # `can_read_post(auth_user=user, post=post)`
+        objects = {name: kwargs.pop(name) for name in list(kwargs) if name not in self._parameters}
+        if len(objects) != 1:
+            raise TypeError(f"{self.name}() takes the checked object as a single extra keyword argument.")
+        (obj,) = objects.values()
+        if not await self.allows(obj, **kwargs):
+            raise self._forbidden()
+
+    def _forbidden(self) -> AuthorizationError:
+        return AuthorizationError(
+            "User is not authorized to perform this action",
+            permission_required=self.name,
+        )
+
+
+def row_permission(func: Callable[..., Awaitable[Rule]]) -> RowPermission:
+    """
+    This decorates a function that returns a `Q` filter of the rows the user may access, or a boolean for all or
+    none of them, so that listings can filter the allowed rows in SQL rather than checking each one in Python.
+
+    - `await can_read_post.filter(queryset, auth_user=user)` narrows a queryset down to the allowed rows.
+    - `await can_read_post.aget(queryset, {"uuid": post_uuid}, auth_user=user)` fetches a single allowed row, in
+      the same query.
+    - `await can_read_post(auth_user=user, post=post)` checks a single object obtained otherwise, like a
+      `permission`. The object is passed as the one keyword argument the function doesn't take.
+
+    Raises:
+        AuthorizationError: When fetching or checking a single object that isn't one of the allowed rows.
+    """
+    return RowPermission(func)
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+
+from core.auth.tests.factories import UserFactory
+from core.models import User
+from lib.errors import AuthorizationError
+
+from ..memo import memoize_permissions
+from ..permission import permission
+
+checked: list[int] = []
+
+
+@permission
+async def can_edit_user(*, auth_user: User, user: User) -> bool:
+    checked.append(user.pk)
+    await asyncio.sleep(0.01)
+    return auth_user.pk == user.pk or not user.is_active
+
+
+@pytest.fixture(autouse=True)
+def _reset_checked() -> None:
+    checked.clear()
+
+
+@pytest.mark.django_db
+def test_decisions_are_memoized_per_request() -> None:
+    auth_user, other = UserFactory.create_batch(2)
+
+    async def run() -> None:
+        with memoize_permissions() as memo:
+            await asyncio.gather(*(can_edit_user(auth_user=auth_user, user=auth_user) for _ in range(5)))
+            # Other instances of the same rows share the decisions
+            await can_edit_user(auth_user=await User.objects.aget(pk=auth_user.pk), user=auth_user)
+            for _ in range(2):
+                with pytest.raises(AuthorizationError):
+                    await can_edit_user(auth_user=auth_user, user=other)
+            assert len(memo) == 2
+        await can_edit_user(auth_user=auth_user, user=auth_user)
+
+    async_to_sync(run)()
+
+    assert checked == [auth_user.pk, other.pk, auth_user.pk]
+
+
+@pytest.mark.django_db
+def test_writes_clear_the_memo() -> None:
+    auth_user, other = UserFactory.create_batch(2)
+
+    async def run() -> None:
+        with memoize_permissions() as memo:
+            with pytest.raises(AuthorizationError):
+                await can_edit_user(auth_user=auth_user, user=other)
+            other.is_active = False
+            await sync_to_async(other.save)()
+            assert len(memo) == 0
+            await can_edit_user(auth_user=auth_user, user=other)
+
+    async_to_sync(run)()
+
+    assert checked == [other.pk, other.pk]
@@ -0,0 +1,60 @@
+import uuid
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db.models import Q
+
+from core.auth.tests.factories import UserFactory
+from core.models import User
+from lib.errors import AuthorizationError
+from lib.monitoring.queries import QueryStats
+
+from ..rules import row_permission
+
+
+@row_permission
+async def can_read_user(*, auth_user: User) -> Q | bool:
+    if auth_user.is_active:
+        return Q(is_active=True)
+    return False
+
+
+@pytest.mark.django_db
+def test_filter_in_sql() -> None:
+    auth_user, other = UserFactory.create_batch(2)
+    inactive = UserFactory.create(is_active=False)
+
+    allowed = async_to_sync(can_read_user.filter)(User.objects.all(), auth_user=auth_user)
+    denied = async_to_sync(can_read_user.filter)(User.objects.all(), auth_user=inactive)
+
+    assert set(allowed) == {auth_user, other}
+    assert list(denied) == []
+
+
+@pytest.mark.django_db
+def test_check_single_objects() -> None:
+    auth_user = UserFactory.create()
+    inactive = UserFactory.create(is_active=False)
+
+    async_to_sync(can_read_user)(auth_user=auth_user, user=auth_user)
+    with pytest.raises(AuthorizationError):
+        async_to_sync(can_read_user)(auth_user=auth_user, user=inactive)
+    with pytest.raises(TypeError, match="single extra keyword argument"):
+        async_to_sync(can_read_user)(auth_user=auth_user)
+
+
+@pytest.mark.django_db
+def test_get_single_objects(assert_max_queries: Callable[..., AbstractContextManager[QueryStats]]) -> None:
+    auth_user = UserFactory.create()
+    inactive = UserFactory.create(is_active=False)
+
+    with assert_max_queries(1):
+        user = async_to_sync(can_read_user.aget)(User.objects.all(), {"uuid": auth_user.uuid}, auth_user=auth_user)
+
+    assert user == auth_user
+    with pytest.raises(AuthorizationError):
+        async_to_sync(can_read_user.aget)(User.objects.all(), {"uuid": inactive.uuid}, auth_user=auth_user)
+    with pytest.raises(User.DoesNotExist):
+        async_to_sync(can_read_user.aget)(User.objects.all(), {"uuid": uuid.uuid4()}, auth_user=auth_user)
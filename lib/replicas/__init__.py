@@ -0,0 +1,13 @@
+from .lag import ReplicaMonitor, get_monitor
+from .middleware import ReplicaRoutingMiddleware
+from .routing import ReplicaRouter, RoutingState, allow_replica_reads, routing
+
+__all__ = [
+    "ReplicaMonitor",
+    "ReplicaRouter",
+    "ReplicaRoutingMiddleware",
+    "RoutingState",
+    "allow_replica_reads",
+    "get_monitor",
+    "routing",
+]
@@ -0,0 +1,93 @@
+import logging
+import threading
+from collections.abc import Iterable
+from functools import cache
+from time import sleep
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+replica_lag = meter.create_gauge(
+    "db.replica.lag",
+    unit="s",
+    description="How far a read replica trails the primary, as of its last check.",
+)
+
+# 0 on a database that isn't replaying, e.g. a second database standing in for a replica in development. NULL when the
+# replica hasn't replayed anything yet, which counts as lagging.
+LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+
+class ReplicaMonitor:
+    """Checks the replication lag of the replicas every `interval` seconds, in a background thread.
+
+    Replicas are healthy while they trail the primary by at most `max_lag` seconds. They are all considered unhealthy
+    until the first check, so reads go to the primary while it runs.
+    """
+
+    def __init__(self, aliases: Iterable[str], *, max_lag: float, interval: float) -> None:
+        self.aliases = tuple(aliases)
+        self.max_lag = max_lag
+        self.interval = interval
+        # The replicas that reads can be sent to
+        self.healthy: tuple[str, ...] = ()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def ensure_started(self) -> None:
+        """Starts checking the replicas in the background, if it hasn't started yet."""
+        if self._thread is not None or not self.aliases:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="replica-monitor", daemon=True)
+                self._thread.start()
+
+    def check(self) -> dict[str, float | None]:
+        """Measures the lag of each replica, `None` for the unreachable ones, and updates the healthy replicas."""
+        lags = {alias: self._lag(alias) for alias in self.aliases}
+        self.healthy = tuple(alias for alias, lag in lags.items() if lag is not None and lag <= self.max_lag)
+        return lags
+
+    def _lag(self, alias: str) -> float | None:
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(LAG_QUERY)
+                row = cursor.fetchone()
+        except DatabaseError:
+            logger.warning("Failed to check the lag of a replica", extra={"alias": alias}, exc_info=True)
+            connection.close()
+            return None
+        lag = None if row is None or row[0] is None else float(row[0])
+        if lag is not None:
+            replica_lag.set(lag, {"db.replica.name": alias})
+        return lag
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Failed to check the replicas")
+                self.healthy = ()
+            sleep(self.interval)
+
+
+@cache
+def get_monitor() -> ReplicaMonitor:
+    """The monitor of the replicas in `DATABASE_REPLICAS`, shared by the process."""
+    return ReplicaMonitor(
+        settings.DATABASE_REPLICAS,
+        max_lag=settings.DATABASE_REPLICA_MAX_LAG,
+        interval=settings.DATABASE_REPLICA_CHECK_INTERVAL,
+    )
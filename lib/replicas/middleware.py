@@ -0,0 +1,40 @@
+from collections.abc import Awaitable, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from lib.cache import TieredCache
+
+from .lag import get_monitor
+from .routing import client_key, routing
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReplicaRoutingMiddleware:
+    """Sends the reads of safe requests to the read replicas.
+
+    Once a session writes, its requests stay on the primary for `DATABASE_REPLICA_STICKY_TTL` seconds, so that it
+    reads its own writes while the replicas catch up. GraphQL queries sent over POST are routed by
+    `lib.graphql.replicas.ReplicaReadsExtension`.
+    """
+
+    async_capable = True
+    sync_capable = False
+
+    def __init__(self, get_response: Callable[[HttpRequest], Awaitable[HttpResponse]]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        self.pins = TieredCache("replicas.pinned", ttl=settings.DATABASE_REPLICA_STICKY_TTL)
+        get_monitor().ensure_started()
+
+    async def __call__(self, request: HttpRequest) -> HttpResponse:
+        key = client_key(request)
+        pinned = key is not None and await self.pins.aget(key) is not None
+        with routing(replica_reads=request.method in SAFE_METHODS, pinned=pinned) as state:
+            response = await self.get_response(request)
+        if state.wrote and key is not None:
+            await self.pins.aset(key, True)
+        return response
@@ -0,0 +1,104 @@
+import hashlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from itertools import count
+from typing import Any
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, models
+from django.http import HttpRequest
+
+from .lag import ReplicaMonitor, get_monitor
+
+
+@dataclass
+class RoutingState:
+    """Where the reads of the current request can go.
+
+    The state is shared by the threads `sync_to_async` runs the request's queries in, so writes made in one of them
+    pin the rest of the request to the primary.
+    """
+
+    replica_reads: bool = False
+    pinned: bool = False
+    wrote: bool = False
+
+
+_state: ContextVar[RoutingState | None] = ContextVar("replica_routing", default=None)
+
+
+@contextmanager
+def routing(*, replica_reads: bool, pinned: bool = False) -> Iterator[RoutingState]:
+    """Routes the reads made within the block to the replicas, unless `pinned` to the primary or after a write."""
+    state = RoutingState(replica_reads=replica_reads, pinned=pinned)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def allow_replica_reads(allowed: bool = True) -> None:
+    """Allows or prevents sending the rest of the current request's reads to the replicas."""
+    state = _state.get()
+    if state is not None:
+        state.replica_reads = allowed
+
+
+def client_key(request: HttpRequest) -> str | None:
+    """Identifies the session of the request, to keep it on the primary for a while after it writes."""
+    token = request.headers.get("X-Session-Token") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    return hashlib.sha256(token.encode()).hexdigest() if token else None
+
+
+class ReplicaRouter:
+    """Sends the reads of requests routed with `routing` to the healthy replicas, and everything else to the primary.
+
+    Reads stay on the primary inside transactions, once the request has written, and for the apps in
+    `DATABASE_REPLICA_EXCLUDED_APPS` that must read their own writes across requests (e.g. sessions).
+    """
+
+    def __init__(self, monitor: ReplicaMonitor | None = None) -> None:
+        self._monitor = monitor
+        self._next = count()
+
+    @property
+    def monitor(self) -> ReplicaMonitor:
+        return self._monitor or get_monitor()
+
+    def db_for_read(self, model: type[models.Model], **hints: Any) -> str | None:
+        state = _state.get()
+        if state is None:
+            # Outside of requests, e.g. in management commands
+            return None
+        if (
+            not state.replica_reads
+            or state.pinned
+            or model._meta.app_label in settings.DATABASE_REPLICA_EXCLUDED_APPS  # noqa: SLF001 # Public Django API
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            # Explicit, as Django otherwise falls back to the database of the instance in the hints
+            return DEFAULT_DB_ALIAS
+        healthy = self.monitor.healthy
+        if not healthy:
+            return DEFAULT_DB_ALIAS
+        return healthy[next(self._next) % len(healthy)]
+
+    def db_for_write(self, model: type[models.Model], **hints: Any) -> str | None:
+        state = _state.get()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: models.Model, obj2: models.Model, **hints: Any) -> bool | None:
+        # Replicas hold the same data as the primary
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:  # noqa: SLF001 # Public Django API
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool | None:
+        # Replicas get their schema through replication
+        return False if db in settings.DATABASE_REPLICAS else None
@@ -0,0 +1,81 @@
+from typing import Any
+
+import pytest
+from django.db import transaction
+
+from core.models import User
+
+from ..lag import ReplicaMonitor
+from ..routing import ReplicaRouter, allow_replica_reads, routing
+
+
+@pytest.fixture
+def router(settings: Any) -> ReplicaRouter:
+    settings.DATABASE_REPLICAS = ["replica_0"]
+    monitor = ReplicaMonitor(settings.DATABASE_REPLICAS, max_lag=5, interval=60)
+    monitor.healthy = ("replica_0",)
+    return ReplicaRouter(monitor)
+
+
+def test_reads_outside_of_requests_are_not_routed(router: ReplicaRouter) -> None:
+    assert router.db_for_read(User) is None
+
+
+def test_safe_reads_go_to_the_replicas(router: ReplicaRouter) -> None:
+    with routing(replica_reads=True):
+        assert router.db_for_read(User) == "replica_0"
+
+    with routing(replica_reads=False):
+        assert router.db_for_read(User) == "default"
+
+
+def test_reads_can_be_allowed_during_the_request(router: ReplicaRouter) -> None:
+    with routing(replica_reads=False):
+        allow_replica_reads()
+        assert router.db_for_read(User) == "replica_0"
+
+
+def test_reads_stick_to_the_primary_after_a_write(router: ReplicaRouter) -> None:
+    with routing(replica_reads=True) as state:
+        assert router.db_for_write(User) == "default"
+        assert router.db_for_read(User) == "default"
+
+    assert state.wrote
+
+
+def test_pinned_requests_read_from_the_primary(router: ReplicaRouter) -> None:
+    with routing(replica_reads=True, pinned=True) as state:
+        assert router.db_for_read(User) == "default"
+
+    assert not state.wrote
+
+
+def test_lagging_replicas_fall_back_to_the_primary(router: ReplicaRouter) -> None:
+    router.monitor.healthy = ()
+
+    with routing(replica_reads=True):
+        assert router.db_for_read(User) == "default"
+
+
+@pytest.mark.django_db
+def test_reads_in_transactions_go_to_the_primary(router: ReplicaRouter) -> None:
+    with routing(replica_reads=True), transaction.atomic():
+        assert router.db_for_read(User) == "default"
+
+
+def test_replicas_are_not_migrated(router: ReplicaRouter) -> None:
+    assert router.allow_migrate("replica_0", "core") is False
+    assert router.allow_migrate("default", "core") is None
+
+
+@pytest.mark.django_db
+def test_monitor_checks_the_lag() -> None:
+    # The test database stands in for a replica, it isn't replaying so it has no lag
+    monitor = ReplicaMonitor(["default"], max_lag=5, interval=60)
+
+    assert monitor.check() == {"default": 0}
+    assert monitor.healthy == ("default",)
+
+    monitor.max_lag = -1
+    monitor.check()
+    assert monitor.healthy == ()
@@ -1,13 +1,18 @@
 from .api import create_api
 from .pagination import CursorPagination
 from .resources import BaseInput, BaseObjectResource, response
+from .serializers import compile_serializer, trusted_output
 from .types import UUIDList
+from .urls import LinkTemplate
 
 __all__ = [
     "BaseInput",
     "BaseObjectResource",
     "CursorPagination",
+    "LinkTemplate",
     "UUIDList",
+    "compile_serializer",
     "create_api",
     "response",
+    "trusted_output",
 ]
@@ -8,6 +8,7 @@ from ninja import NinjaAPI
 from ninja.security import HttpBearer
 
 import lib.errors
+from core.models import DeactivatedUser
 
 from . import error_handlers
 from .stoplight import StoplightElements
@@ -16,18 +17,22 @@ logger = logging.getLogger(__name__)
 
 
 class BearerMiddlewareAuthenticator(HttpBearer):
-    def __call__(self, request: HttpRequest) -> Any:
-        return self.authenticate(request=request)
+    async def __call__(self, request: HttpRequest) -> Any:  # type: ignore # Async authentication is supported
+        return await self.authenticate(request=request)
 
-    def authenticate(self, request: HttpRequest, token: str | None = None) -> Any:
+    async def authenticate(self, request: HttpRequest, token: str | None = None) -> Any:  # type: ignore
         # We will replace this eventually
-        if request.user and request.user.is_authenticated:
-            if not request.user.is_active:
-                raise lib.errors.UnauthenticatedError(
-                    code="account_deactivated",
-                    message=_("Your account has been deactivated."),
-                )
-            return request.user
+        # `auser` is resolved by the authentication middleware without blocking the event loop
+        user = await request.auser()
+        request.user = user
+        if user and user.is_authenticated:
+            return user
+        # Inactive users are resolved as anonymous
+        if isinstance(user, DeactivatedUser):
+            raise lib.errors.UnauthenticatedError(
+                code="account_deactivated",
+                message=_("Your account has been deactivated."),
+            )
         raise lib.errors.UnauthenticatedError
 
 
@@ -1,101 +1,97 @@
 import logging
+from functools import lru_cache
+from typing import Any
 
 import ninja.errors
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import HttpRequest, HttpResponse
 from django.utils.translation import gettext as _
 
 import lib.errors
-
-from . import resources
+from lib import jsonutils as json
 
 logger = logging.getLogger(__name__)
 
+# Bodies match `resources.ErrorResponse`, without its `None` values, and are built directly as it only holds strings
+# and paths
+type ErrorDetail = dict[str, Any]
+
+STATUSES: dict[type[Exception], int] = {
+    lib.errors.UnauthenticatedError: 401,
+    lib.errors.AuthorizationError: 403,
+    lib.errors.NotFoundError: 404,
+    lib.errors.InputError: 422,
+    lib.errors.UserError: 400,
+}
+
+# Status of every error class met so far, found from the closest class of its MRO in `STATUSES`
+_statuses: dict[type[Exception], int] = {}
+
+
+def error_status(type_: type[Exception]) -> int:
+    status = _statuses.get(type_)
+    if status is None:
+        status = _statuses[type_] = next((STATUSES[base] for base in type_.__mro__ if base in STATUSES), 500)
+    return status
+
+
+def _message(code: str, message: str, path: list[str | int] | None = None) -> ErrorDetail:
+    if path is None:
+        return {"code": code, "message": message}
+    return {"code": code, "message": message, "path": path}
+
+
+def _body(errors: list[ErrorDetail]) -> bytes:
+    return json.dumps({"errors": errors}).encode()
+
+
+@lru_cache(maxsize=1024)
+def _static_body(code: str, message: str) -> bytes:
+    # Errors without a path, e.g. `UnauthenticatedError`, repeat the same few bodies in each language
+    return _body([_message(code, message)])
+
+
+def _response(body: bytes, status: int) -> HttpResponse:
+    # Responses are built per request, as middleware may change them, around bodies that may be shared
+    return HttpResponse(body, status=status, content_type="application/json")
+
 
 def standard_error(request: HttpRequest, exc: lib.errors.BaseError | type[lib.errors.BaseError]) -> HttpResponse:
-    error_mapping: dict[type[lib.errors.BaseError], int] = {
-        lib.errors.UnauthenticatedError: 401,
-        lib.errors.AuthorizationError: 403,
-        lib.errors.NotFoundError: 404,
-        lib.errors.InputError: 422,
-        lib.errors.UserError: 400,
-    }
-    code = next((code for type_, code in error_mapping.items() if isinstance(exc, type_)), 500)
     logger.info(exc, extra={"user": str(request.user)})
-    detail = resources.ErrorResponse(
-        errors=[
-            resources.ErrorMessage(
-                code=exc.code,
-                message=exc.message,
-                path=exc.path if isinstance(exc, lib.errors.InputError) else None,
-            )
-        ]
-    ).model_dump(mode="json", exclude_none=True)
-    return JsonResponse(detail, status=code)
+    if isinstance(exc, lib.errors.InputError):
+        body = _body([_message(exc.code, exc.message, exc.path)])
+    else:
+        body = _static_body(exc.code, str(exc.message))
+    return _response(body, error_status(type(exc)))  # type: ignore # Handlers receive instances
 
 
 def unexpected_error(request: HttpRequest, exc: Exception | type[Exception]) -> HttpResponse:
     logger.error(exc, extra={"user": str(request.user)}, stack_info=True)
-    detail = resources.ErrorResponse(
-        errors=[
-            resources.ErrorMessage(
-                code="internal_error",
-                message=_("An unexpected error occurred."),
-                path=None,
-            )
-        ]
-    ).model_dump(mode="json", exclude_none=True)
-    return JsonResponse(
-        detail,
-        status=500,
-    )
+    return _response(_static_body("internal_error", _("An unexpected error occurred.")), 500)
 
 
 def invalid_input(
     request: HttpRequest, exc: ninja.errors.ValidationError | type[ninja.errors.ValidationError]
 ) -> HttpResponse:
     logger.info(exc, extra={"user": str(request.user)})
-    errors = []
-    for error in exc.errors:
-        errors.append(
-            resources.ErrorMessage(
-                code=error["type"],
-                message=error["msg"],
-                path=error["loc"],
-            )
-        )
-    detail = resources.ErrorResponse(
-        errors=errors,
-    ).model_dump(mode="json", exclude_none=True)
-    return JsonResponse(
-        detail,
-        status=422,
-    )
+    errors = [_message(error["type"], error["msg"], list(error["loc"])) for error in exc.errors]
+    return _response(_body(errors), 422)
+
+
+def _group_errors(exc: ExceptionGroup) -> list[ErrorDetail]:
+    errors: list[ErrorDetail] = []
+    for error in exc.exceptions:
+        if isinstance(error, ExceptionGroup):
+            errors.extend(_group_errors(error))
+        elif isinstance(error, lib.errors.InputError):
+            errors.append(_message(error.code, error.message, error.path))
+        elif isinstance(error, lib.errors.BaseError):
+            errors.append(_message(error.code, error.message))
+        else:
+            errors.append(_message("error", str(error)))
+    return errors
 
 
 def error_group(request: HttpRequest, exc: ExceptionGroup | type[ExceptionGroup]) -> HttpResponse:
     logger.info(exc, extra={"user": str(request.user)})
-
-    def get_errors_from_group(exc: ExceptionGroup) -> list[resources.ErrorMessage]:
-        errors: list[resources.ErrorMessage] = []
-        for error in exc.exceptions:
-            if isinstance(error, ExceptionGroup):
-                errors.extend(get_errors_from_group(error))
-                continue
-            errors.append(
-                resources.ErrorMessage(
-                    code=error.code if isinstance(error, lib.errors.BaseError) else "error",
-                    message=error.message if isinstance(error, lib.errors.BaseError) else str(error),
-                    path=error.path if isinstance(error, lib.errors.InputError) else None,
-                )
-            )
-        return errors
-
-    errors = get_errors_from_group(exc)  # type: ignore # ExceptionGroup type ambiguous for django ninja handler registration
-
-    detail = resources.ErrorResponse(
-        errors=errors,
-    ).model_dump(mode="json", exclude_none=True)
-    return JsonResponse(
-        detail,
-        status=422,
-    )
+    errors = _group_errors(exc)  # type: ignore # ExceptionGroup type ambiguous for django ninja handler registration
+    return _response(_body(errors), 422)
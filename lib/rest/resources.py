@@ -1,14 +1,15 @@
 from datetime import datetime
 from typing import Any, Literal
+from uuid import UUID
 
 from ninja import Field, Schema
-from pydantic import UUID4
 
 from lib.validation import Input, ValidationRule
 
 
 class BaseObjectResource(Schema):
-    uuid: UUID4 = Field(..., description="The object's UUID.")
+    # Not `UUID4`: `BaseModel` generates time-ordered UUIDv7s
+    uuid: UUID = Field(..., description="The object's UUID.")
     created_at: datetime = Field(..., description="The time the object was created.")
     updated_at: datetime = Field(..., description="The time the object was last updated.")
 
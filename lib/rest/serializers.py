@@ -0,0 +1,124 @@
+import inspect
+import types
+from collections.abc import Awaitable, Callable, Iterable
+from functools import cache, wraps
+from operator import attrgetter
+from typing import Any, Union, get_args, get_origin
+
+from django.db.models import Manager, QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from ninja import Schema
+
+from lib import jsonutils as json
+
+type Serializer = Callable[[Any, dict[str, Any]], dict[str, Any]]
+
+
+def _nested(annotation: Any) -> tuple[type[Schema] | None, bool]:
+    # The schema of a nested resource or list of resources, e.g. `Author`, `Author | None` or `list[Author]`
+    if isinstance(annotation, type) and issubclass(annotation, Schema):
+        return annotation, False
+    origin = get_origin(annotation)
+    if origin is list:
+        schema, _ = _nested(get_args(annotation)[0])
+        return schema, True
+    if origin in (Union, types.UnionType):
+        for arg in get_args(annotation):
+            if arg is not type(None):
+                return _nested(arg)
+    return None, False
+
+
+def _field_getter(resource: type[Schema], name: str, source: str, annotation: Any) -> Callable[[Any, Any], Any]:
+    resolver = inspect.getattr_static(resource, f"resolve_{name}", None)
+    if isinstance(resolver, staticmethod):
+        func = resolver.__func__
+        if "context" in inspect.signature(func).parameters:
+            return lambda obj, context: func(obj, context=context)
+        return lambda obj, _: func(obj)
+
+    get = attrgetter(source)
+    schema, many = _nested(annotation)
+    if schema is None:
+        return lambda obj, _: get(obj)
+    nested = compile_serializer(schema)
+    if many:
+
+        def get_many(obj: Any, context: Any) -> list[dict[str, Any]]:
+            items = get(obj)
+            if isinstance(items, Manager):
+                items = items.all()
+            return [nested(item, context) for item in items]
+
+        return get_many
+    return lambda obj, context: None if (value := get(obj)) is None else nested(value, context)
+
+
+@cache
+def compile_serializer(resource: type[Schema]) -> Serializer:
+    """
+    Compile `resource` into a function building its output from a model instance, without validating it.
+
+    Each field is read from the attribute of the same name (or its alias, which may be a dotted path), from its
+    static `resolve_<field>` method, or serialized with its own compiled serializer for nested resources.
+    """
+    getters = tuple(
+        (
+            name,
+            _field_getter(
+                resource,
+                name,
+                field.validation_alias if isinstance(field.validation_alias, str) else field.alias or name,
+                field.annotation,
+            ),
+        )
+        for name, field in resource.model_fields.items()
+    )
+
+    def serialize(obj: Any, context: dict[str, Any]) -> dict[str, Any]:
+        return {name: get(obj, context) for name, get in getters}
+
+    return serialize
+
+
+async def _serialize_body(serialize: Serializer, body: Any, context: dict[str, Any]) -> Any:
+    if isinstance(body, QuerySet):
+        body = [obj async for obj in body]
+    if isinstance(body, dict):
+        # Pages of `CursorPagination`, whose other values are already plain
+        return {**body, "data": [serialize(obj, context) for obj in body["data"]]}
+    if isinstance(body, Iterable):
+        return [serialize(obj, context) for obj in body]
+    return serialize(body, context)
+
+
+def trusted_output[**P](
+    resource: type[Schema],
+) -> Callable[[Callable[P, Awaitable[Any]]], Callable[P, Awaitable[Any]]]:
+    """
+    Serializes the model instances returned by an operation with the compiled serializer of `resource`, skipping
+    the validation of its output by Ninja.
+
+    The operation returns a `(status, body)` tuple or a body like other operations, where the body is an instance,
+    an iterable of instances, or a page of `CursorPagination` when applied above `paginate`. Only use it for outputs
+    that are known to match `resource`, e.g. rows of the model it describes: nothing checks them.
+    """
+    serialize = compile_serializer(resource)
+
+    def decorator(func: Callable[P, Awaitable[Any]]) -> Callable[P, Awaitable[Any]]:
+        @wraps(func)
+        async def _fn(*args: P.args, **kwargs: P.kwargs) -> Any:
+            result = await func(*args, **kwargs)
+            if isinstance(result, HttpResponseBase):
+                return result
+            status, body = result if isinstance(result, tuple) else (200, result)
+            if body is None:
+                return result
+            request: HttpRequest = args[0]  # type: ignore # Operations take the request first
+            context = {"request": request, "response_status": status}
+            content = json.dumps(await _serialize_body(serialize, body, context))
+            return HttpResponse(content, status=status, content_type="application/json")
+
+        return _fn
+
+    return decorator
@@ -11,6 +11,7 @@ from lib import jsonutils as json
 from .. import resources
 from ..error_handlers import (
     error_group,
+    error_status,
     invalid_input,
     standard_error,
     unexpected_error,
@@ -93,3 +94,21 @@ def test_error_group(mock_request: HttpRequest) -> None:
     assert json.loads(response.content) == resources.ErrorResponse(errors=expected_errors).model_dump(
         mode="json", exclude_none=True
     )
+
+
+def test_status_of_subclasses(mock_request: HttpRequest) -> None:
+    class EmailTakenError(lib.errors.UserError):
+        pass
+
+    class ConflictError(lib.errors.BaseError):
+        pass
+
+    assert error_status(EmailTakenError) == 400
+    assert error_status(ConflictError) == 500
+    assert error_status(lib.errors.UnauthenticatedError) == 401
+    # Bodies of errors without a path are cached, responses aren't
+    first = standard_error(mock_request, lib.errors.UnauthenticatedError())
+    second = standard_error(mock_request, lib.errors.UnauthenticatedError())
+    assert first is not second
+    assert first.status_code == second.status_code == 401
+    assert first.content == second.content
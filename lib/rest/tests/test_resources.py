@@ -0,0 +1,21 @@
+from django.utils import timezone
+
+from lib.models import BaseModel
+
+from ..resources import BaseObjectResource
+
+
+class Note(BaseModel):
+    class Meta:
+        # Outside of the installed apps, so that deleting users doesn't look for notes created by them
+        app_label = "resources_tests"
+
+
+def test_base_object_resource_serializes_uuid7() -> None:
+    now = timezone.now()
+    note = Note(created_at=now, updated_at=now)
+
+    resource = BaseObjectResource.model_validate(note)
+
+    assert note.uuid.version == 7
+    assert resource.model_dump(mode="json")["uuid"] == str(note.uuid)
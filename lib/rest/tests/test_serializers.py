@@ -0,0 +1,124 @@
+from typing import TYPE_CHECKING
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpRequest, HttpResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from ninja import Field, Router, Schema
+from ninja.pagination import paginate
+from ninja.testing import TestAsyncClient
+
+from core.auth.tests.factories import UserFactory
+from core.models import User
+from lib import jsonutils as json
+
+from ..pagination import CursorPagination
+from ..resources import BaseObjectResource, response
+from ..serializers import compile_serializer, trusted_output
+from ..urls import LinkTemplate
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+
+class Creator(Schema):
+    email: str = Field(..., description="Email of the user.")
+
+
+class UserResource(BaseObjectResource):
+    address: str = Field(..., alias="email", description="Email of the user.")
+    is_active: bool = Field(..., description="Whether the user is active.")
+    creator: Creator | None = Field(None, alias="created_by", description="The user who created the user.")
+    initials: str = Field(..., description="Initials of the user.")
+
+    @staticmethod
+    def resolve_initials(obj: object) -> str:
+        return "".join(name[0] for name in (obj.first_name, obj.last_name))  # type: ignore
+
+
+router = Router()
+
+
+@router.get("users/", response=response(200, list[UserResource]))
+@trusted_output(UserResource)
+@paginate(CursorPagination[User])
+async def browse_users(request: HttpRequest) -> "QuerySet[User]":  # noqa: ARG001 # request is passed by Ninja
+    return User.objects.select_related("created_by")
+
+
+@router.post("users/", response=response(201, UserResource))
+@trusted_output(UserResource)
+async def add_user(request: HttpRequest) -> tuple[int, User]:  # noqa: ARG001 # request is passed by Ninja
+    return 201, await User.objects.create_user(email="grace@example.com", first_name="Grace", last_name="Hopper")
+
+
+@router.delete("users/", response=response(204, None))
+@trusted_output(UserResource)
+async def delete_users(request: HttpRequest) -> HttpResponse:  # noqa: ARG001 # request is passed by Ninja
+    return HttpResponse(status=204)
+
+
+client = TestAsyncClient(router)
+
+
+def validated_output(user: User) -> dict[str, object]:
+    return json.loads(json.dumps(UserResource.model_validate(user).model_dump()))
+
+
+def test_serializer_matches_validated_output() -> None:
+    now = timezone.now()
+    creator = UserFactory.build(email="ada@example.com")
+    users = [
+        UserFactory.build(first_name="Ada", last_name="Lovelace", created_by=creator, created_at=now, updated_at=now),
+        UserFactory.build(first_name="Alan", last_name="Turing", created_by=None, created_at=now, updated_at=now),
+    ]
+    serialize = compile_serializer(UserResource)
+
+    for user in users:
+        validated = UserResource.model_validate(user).model_dump()
+        assert json.loads(json.dumps(serialize(user, {}))) == json.loads(json.dumps(validated))
+
+
+@pytest.mark.django_db
+def test_trusted_output_serializes_pages() -> None:
+    creator = UserFactory.create(first_name="Ada", last_name="Lovelace")
+    UserFactory.create_batch(2, first_name="Alan", last_name="Turing", created_by=creator)
+
+    result = async_to_sync(client.get)("users/?pagination[first]=2")
+
+    assert result.status_code == 200
+    page = result.json()
+    users = User.objects.select_related("created_by").order_by("id")
+    assert page["data"] == [validated_output(user) for user in users[:2]]
+    assert page["pagination"]["next"] is not None
+
+
+@pytest.mark.django_db
+def test_trusted_output_keeps_status() -> None:
+    result = async_to_sync(client.post)("users/")
+
+    assert result.status_code == 201
+    assert result.json() == validated_output(User.objects.get(email="grace@example.com"))
+
+
+def test_trusted_output_passes_responses_through() -> None:
+    result = async_to_sync(client.delete)("users/")
+
+    assert result.status_code == 204
+    assert result.content == b""
+
+
+def read_user(request: HttpRequest, key: str) -> HttpResponse:  # noqa: ARG001 # Only reversed
+    return HttpResponse()
+
+
+urlpatterns = [path("users/<str:key>/", read_user, name="user-read")]
+
+
+@pytest.mark.urls(__name__)
+def test_link_template_matches_reverse() -> None:
+    link = LinkTemplate("user-read", "key")
+
+    for key in ("abc", "a-b:c", "MTIz:1tQ", "a b&c"):
+        assert link(key) == reverse("user-read", kwargs={"key": key})
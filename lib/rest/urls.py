@@ -1,5 +1,11 @@
 from typing import Any
-from urllib.parse import quote_plus, urlparse
+from urllib.parse import quote, quote_plus, urlparse
+
+from django.urls import get_script_prefix, reverse
+from django.utils.http import RFC3986_SUBDELIMS
+
+# Characters `reverse` leaves unquoted in URLs
+_SAFE = RFC3986_SUBDELIMS + "/~:@"
 
 
 def set_query_params(url: str, params: dict[str, Any] | None = None) -> str:
@@ -13,3 +19,35 @@ def set_query_params(url: str, params: dict[str, Any] | None = None) -> str:
                 query[key] = ",".join([str(v) for v in value]) if isinstance(value, list) else str(value)
     query_string = "&".join(f"{key}={quote_plus(value)}" for key, value in query.items())
     return parsed_url._replace(query=query_string).geturl()
+
+
+class LinkTemplate:
+    """
+    The URL of a view for any value of one of its arguments, e.g. the link of each object of a page.
+
+    The view is reversed once, with a placeholder for the argument, and the URL is then built by formatting its
+    prefix and suffix around the value instead of calling `reverse` for each object.
+    """
+
+    # Accepted by the `uuid`, `slug`, `str` and `path` converters
+    placeholder = "ffffffff-ffff-4fff-bfff-ffffffffffff"
+
+    def __init__(self, viewname: str, kwarg: str, **kwargs: Any) -> None:
+        self.viewname = viewname
+        self.kwarg = kwarg
+        self.kwargs = kwargs
+        # By script prefix, which `reverse` includes and may differ between deployments of the same process
+        self._templates: dict[str, tuple[str, str]] = {}
+
+    def _template(self) -> tuple[str, str]:
+        prefix = get_script_prefix()
+        template = self._templates.get(prefix)
+        if template is None:
+            url = reverse(self.viewname, kwargs={**self.kwargs, self.kwarg: self.placeholder})
+            before, _, after = url.partition(self.placeholder)
+            template = self._templates[prefix] = (before, after)
+        return template
+
+    def __call__(self, value: Any) -> str:
+        before, after = self._template()
+        return f"{before}{quote(str(value), safe=_SAFE)}{after}"
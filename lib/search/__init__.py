@@ -0,0 +1,11 @@
+from .backends import RANK, TrigramSearch, VectorSearch
+from .indexes import search_vector_field, search_vector_index, trigram_index
+
+__all__ = [
+    "RANK",
+    "TrigramSearch",
+    "VectorSearch",
+    "search_vector_field",
+    "search_vector_index",
+    "trigram_index",
+]
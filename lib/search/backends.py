@@ -0,0 +1,108 @@
+from collections.abc import Sequence
+from functools import reduce
+from operator import or_
+from typing import Any
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField, TrigramSimilarity
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.db.models import F, Q, QuerySet
+from django.db.models.functions import Greatest
+
+from lib.models import BaseModel
+
+from .indexes import search_vector_index, trigram_expression, trigram_index
+
+# Annotation holding the rank of each result, which `lib.pagination.paginate` orders and cursors on
+RANK = "search_rank"
+
+
+def _field(model: type[BaseModel], name: str) -> "models.Field[Any, Any] | models.ForeignObjectRel":
+    try:
+        return model._meta.get_field(name)  # noqa: SLF001 # Public Django API
+    except FieldDoesNotExist as error:
+        raise ImproperlyConfigured(f"Search of {model.__name__}: {error}") from error
+
+
+def _has_index(model: type[BaseModel], index: models.Index) -> bool:
+    return any(declared == index for declared in model._meta.indexes)  # noqa: SLF001 # Public Django API
+
+
+class TrigramSearch[T: BaseModel]:
+    """
+    Case-insensitive substring search over text `fields`, ranked by trigram similarity.
+
+    Each field needs a `trigram_index` in `Meta.indexes`, which is checked when the search is created, and the
+    `pg_trgm` extension. Searches shorter than 3 characters can't be narrowed down by the index.
+
+    Example:
+        SEARCH = TrigramSearch(User, ("email", "full_name"))
+
+        queryset = SEARCH.apply(User.objects.all(), search)
+    """
+
+    def __init__(self, model: type[T], fields: Sequence[str]) -> None:
+        if not fields:
+            raise ImproperlyConfigured(f"Search of {model.__name__} must have at least one field.")
+        table = model._meta.db_table  # noqa: SLF001 # Public Django API
+        for name in fields:
+            if not _field(model, name).concrete:
+                raise ImproperlyConfigured(f"Search of {model.__name__} can't use {name!r}, which has no column.")
+            if not _has_index(model, trigram_index(table, name)):
+                raise ImproperlyConfigured(
+                    f"Search of {model.__name__} on {name!r} isn't served by an index, add "
+                    f"lib.search.trigram_index({table!r}, {name!r}) to its Meta.indexes."
+                )
+        self.model = model
+        self.fields = tuple(fields)
+
+    def apply(self, queryset: QuerySet[T], search: str | None) -> QuerySet[T]:
+        """
+        Filter `queryset` on `search`, most similar results first. Returns `queryset` as is without a search.
+        """
+        if not search:
+            return queryset
+        condition = reduce(or_, (Q(**{f"{name}__icontains": search}) for name in self.fields))
+        similarities = [TrigramSimilarity(trigram_expression(name), search.upper()) for name in self.fields]
+        rank = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        return queryset.filter(condition).annotate(**{RANK: rank}).order_by(f"-{RANK}", "-id")
+
+
+class VectorSearch[T: BaseModel]:
+    """
+    Full text search on a stored `search_vector_field`, ranked with `ts_rank`.
+
+    Searches use the web search syntax (quoted phrases, `or`, `-excluded`), and match whole words after
+    normalization by `config`, which must be the configuration of the vector. The vector needs a
+    `search_vector_index` in `Meta.indexes`, which is checked when the search is created.
+
+    Example:
+        SEARCH = VectorSearch(Post, "search_vector", config="english")
+    """
+
+    def __init__(self, model: type[T], field: str = "search_vector", *, config: str = "simple") -> None:
+        vector = _field(model, field)
+        if not isinstance(getattr(vector, "output_field", vector), SearchVectorField):
+            raise ImproperlyConfigured(f"Search of {model.__name__} on {field!r} needs a search vector field.")
+        table = model._meta.db_table  # noqa: SLF001 # Public Django API
+        if not _has_index(model, search_vector_index(table, field)):
+            raise ImproperlyConfigured(
+                f"Search of {model.__name__} on {field!r} isn't served by an index, add "
+                f"lib.search.search_vector_index({table!r}, {field!r}) to its Meta.indexes."
+            )
+        self.model = model
+        self.field = field
+        self.config = config
+
+    def apply(self, queryset: QuerySet[T], search: str | None) -> QuerySet[T]:
+        """
+        Filter `queryset` on `search`, best ranked results first. Returns `queryset` as is without a search.
+        """
+        if not search:
+            return queryset
+        query = SearchQuery(search, config=self.config, search_type="websearch")
+        return (
+            queryset.filter(**{self.field: query})
+            .annotate(**{RANK: SearchRank(F(self.field), query)})
+            .order_by(f"-{RANK}", "-id")
+        )
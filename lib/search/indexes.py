@@ -0,0 +1,44 @@
+from collections.abc import Mapping
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models
+from django.db.models.functions import Cast, Upper
+
+from lib.models import index_name
+
+
+def trigram_expression(field: str) -> Upper:
+    """The expression `icontains` filters on, `UPPER("field"::text)`, which a trigram index must match."""
+    return Upper(Cast(field, output_field=models.TextField()))
+
+
+def trigram_index(table: str, field: str) -> GinIndex:
+    """A `pg_trgm` GIN index serving `icontains` (`LIKE '%...%'`) filters on `field`, see `TrigramSearch`."""
+    return GinIndex(OpClass(trigram_expression(field), name="gin_trgm_ops"), name=index_name(table, [field], "trg"))
+
+
+def search_vector_field(
+    *fields: str, config: str = "simple", weights: Mapping[str, str] | None = None
+) -> models.GeneratedField:
+    """A stored `tsvector` column of `fields`, kept up to date by Postgres, see `VectorSearch`.
+
+    `config` must be a literal text search configuration (e.g. "english"), so that the expression is immutable.
+    `weights` optionally maps fields to a weight from "A" (highest) to "D", which ranking takes into account.
+    """
+    weights = weights or {}
+    vectors = [SearchVector(field, config=config, weight=weights.get(field)) for field in fields]
+    expression = vectors[0]
+    for vector in vectors[1:]:
+        expression = expression + vector
+    return models.GeneratedField(
+        expression=expression,
+        output_field=SearchVectorField(),
+        db_persist=True,
+        db_comment=f"Full text search vector of {', '.join(fields)}.",
+    )
+
+
+def search_vector_index(table: str, field: str = "search_vector") -> GinIndex:
+    """A GIN index serving full text searches on a `search_vector_field`."""
+    return GinIndex(fields=[field], name=index_name(table, [field], "gin"))
@@ -0,0 +1,60 @@
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+
+from core.auth.tests.factories import UserFactory
+from core.models import User
+from lib.pagination import paginate
+
+from .. import RANK, TrigramSearch, VectorSearch, trigram_index
+
+
+def test_trigram_search_needs_trigram_indexes() -> None:
+    assert trigram_index("user", "email") in User._meta.indexes  # noqa: SLF001 # Public Django API
+
+    with pytest.raises(ImproperlyConfigured, match="trigram_index"):
+        TrigramSearch(User, ("first_name",))
+
+
+@pytest.mark.django_db
+def test_trigram_index_migration_sql() -> None:
+    out = StringIO()
+
+    call_command("sqlmigrate", "core", "0002", stdout=out)
+
+    sql = out.getvalue()
+    assert "-- Creates extension pg_trgm" in sql
+    assert 'USING gin ((UPPER(("email")::text)) gin_trgm_ops);' in sql
+    assert 'USING gin ((UPPER(("full_name")::text)) gin_trgm_ops);' in sql
+
+
+def test_vector_search_needs_a_search_vector() -> None:
+    with pytest.raises(ImproperlyConfigured, match="search vector field"):
+        VectorSearch(User, "full_name")
+
+
+def test_search_without_a_search_leaves_the_queryset() -> None:
+    queryset = User.objects.all()
+
+    assert TrigramSearch(User, ("email",)).apply(queryset, "") is queryset
+
+
+@pytest.mark.django_db
+def test_trigram_search_ranks_and_paginates() -> None:
+    exact = UserFactory.create(first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    partial = UserFactory.create(first_name="Adalbert", last_name="Lovelacey", email="adalbert@example.com")
+    UserFactory.create(first_name="Grace", last_name="Hopper", email="grace@example.com")
+    search = TrigramSearch(User, ("email", "full_name"))
+
+    queryset = search.apply(User.objects.all(), "lovelace")
+
+    assert list(queryset) == [exact, partial]
+    assert getattr(queryset[0], RANK) > getattr(queryset[1], RANK)
+
+    first = async_to_sync(paginate)(queryset, limit=1)
+    second = async_to_sync(paginate)(queryset, cursor=first.page_info.end_cursor, limit=1)
+    assert [edge.node for edge in first.edges + second.edges] == [exact, partial]
+    assert not second.page_info.has_next_page
@@ -0,0 +1,135 @@
+# A session engine that keeps sessions in Redis, see `config/settings/sessions.py` to enable it.
+
+from datetime import timedelta
+from typing import Any
+
+import redis
+from django.conf import settings
+from django.contrib.sessions.backends.base import CreateError, SessionBase, UpdateError
+from django.contrib.sessions.models import Session
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+from lib.cache.client import get_redis
+
+KEY_PREFIX = "session:"
+
+
+def make_key(session_key: str) -> str:
+    return f"{KEY_PREFIX}{session_key}"
+
+
+def _client() -> redis.Redis:
+    client = get_redis()
+    if client is None:
+        raise ImproperlyConfigured("The Redis session engine requires CACHE_URL to be set.")
+    return client
+
+
+class SessionStore(SessionBase):
+    """Stores sessions in Redis, which expires them.
+
+    With `SESSION_REDIS_WRITE_THROUGH`, sessions are also written to the database, and sessions missing from Redis
+    (e.g. after a flush) are read back from it.
+    """
+
+    def __init__(self, session_key: str | None = None) -> None:
+        super().__init__(session_key)
+        self.write_through: bool = settings.SESSION_REDIS_WRITE_THROUGH
+
+    def preload(self) -> bool:
+        """Loads the session and returns whether it exists, in one round trip instead of `exists` then `load`."""
+        self._session_cache = self.load()
+        return self.session_key is not None
+
+    def load(self) -> dict[str, Any]:
+        if self.session_key is None:
+            return {}
+        data: bytes | str | None = _client().get(make_key(self.session_key))  # type: ignore # Sync client
+        if data is None and self.write_through:
+            data = self._load_from_db(self.session_key)
+        if data is None:
+            self._session_key = None
+            return {}
+        return self.decode(data.decode() if isinstance(data, bytes) else data)
+
+    def _load_from_db(self, session_key: str) -> str | None:
+        session = Session.objects.filter(session_key=session_key, expire_date__gt=timezone.now()).first()
+        if session is None:
+            return None
+        # Put it back in Redis for the rest of its lifetime
+        ttl = int((session.expire_date - timezone.now()).total_seconds())
+        if ttl > 0:
+            _client().set(make_key(session_key), session.session_data, ex=ttl, nx=True)
+        return session.session_data
+
+    def exists(self, session_key: str) -> bool:
+        if _client().exists(make_key(session_key)):
+            return True
+        return self.write_through and Session.objects.filter(session_key=session_key).exists()
+
+    def create(self) -> None:
+        while True:
+            self._session_key = self._get_new_session_key()
+            try:
+                self.save(must_create=True)
+            except CreateError:
+                continue
+            self.modified = True
+            return
+
+    def save(self, must_create: bool = False) -> None:
+        if self.session_key is None:
+            self.create()
+            return
+        data = self.encode(self._get_session(no_load=must_create))
+        age = self.get_expiry_age()
+        stored = _client().set(make_key(self.session_key), data, ex=age, nx=must_create, xx=not must_create)
+        if not stored and must_create:
+            raise CreateError
+        if not stored and not self.write_through:
+            # The session was deleted (e.g. logged out) by another request while this one was using it
+            raise UpdateError
+        if self.write_through:
+            self._save_to_db(self.session_key, data, age, must_create=must_create)
+
+    def _save_to_db(self, session_key: str, data: str, age: int, *, must_create: bool) -> None:
+        expire_date = timezone.now() + timedelta(seconds=age)
+        if must_create:
+            Session.objects.create(session_key=session_key, session_data=data, expire_date=expire_date)
+        else:
+            Session.objects.update_or_create(
+                session_key=session_key, defaults={"session_data": data, "expire_date": expire_date}
+            )
+
+    def cycle_key(self) -> None:
+        old_key = self.session_key
+        if old_key is None or self.write_through:
+            super().cycle_key()
+            return
+        data = self.encode(self._session)
+        age = self.get_expiry_age()
+        # Write the session under a new key and drop the old one in a single round trip
+        while True:
+            new_key = self._get_new_session_key()
+            pipeline = _client().pipeline()
+            pipeline.set(make_key(new_key), data, ex=age, nx=True)
+            pipeline.delete(make_key(old_key))
+            stored, _ = pipeline.execute()
+            if stored:
+                break
+        self._session_key = new_key
+
+    def delete(self, session_key: str | None = None) -> None:
+        session_key = session_key or self.session_key
+        if session_key is None:
+            return
+        _client().delete(make_key(session_key))
+        if self.write_through:
+            Session.objects.filter(session_key=session_key).delete()
+
+    @classmethod
+    def clear_expired(cls) -> None:
+        # Redis expires sessions on its own, only the rows written through need clearing
+        if settings.SESSION_REDIS_WRITE_THROUGH:
+            Session.objects.filter(expire_date__lt=timezone.now()).delete()
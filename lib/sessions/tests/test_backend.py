@@ -0,0 +1,140 @@
+from datetime import timedelta
+from typing import Any
+
+import fakeredis
+import pytest
+from django.contrib.sessions.backends.base import UpdateError
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.utils import timezone
+
+from tools.management.commands import sessions as sessions_command
+
+from .. import backend
+from ..backend import SessionStore, make_key
+
+
+@pytest.fixture
+def redis_client(monkeypatch: pytest.MonkeyPatch) -> fakeredis.FakeRedis:
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(backend, "get_redis", lambda: client)
+    monkeypatch.setattr(sessions_command, "get_redis", lambda: client)
+    return client
+
+
+@pytest.fixture
+def write_through(settings: Any) -> None:
+    settings.SESSION_REDIS_WRITE_THROUGH = True
+
+
+def create_session(**data: Any) -> SessionStore:
+    session = SessionStore()
+    session.update(data)
+    session.create()
+    return session
+
+
+def test_save_and_load(redis_client: fakeredis.FakeRedis) -> None:
+    session = create_session(user="alice")
+    session["theme"] = "dark"
+    session.save()
+
+    loaded = SessionStore(session.session_key)
+
+    assert loaded.preload()
+    assert dict(loaded.items()) == {"user": "alice", "theme": "dark"}
+    assert 0 < redis_client.ttl(make_key(session.session_key or "")) <= session.get_expiry_age()
+
+
+@pytest.mark.usefixtures("redis_client")
+def test_load_missing_session() -> None:
+    session = SessionStore("missing")
+
+    assert not session.preload()
+    assert session.session_key is None
+
+
+def test_save_of_a_deleted_session_fails(redis_client: fakeredis.FakeRedis) -> None:
+    session = create_session(user="alice")
+    redis_client.delete(make_key(session.session_key or ""))
+    session["theme"] = "dark"
+
+    with pytest.raises(UpdateError):
+        session.save()
+
+
+def test_expiry(redis_client: fakeredis.FakeRedis) -> None:
+    session = SessionStore()
+    session.set_expiry(60)
+    session.create()
+
+    assert 0 < redis_client.ttl(make_key(session.session_key or "")) <= 60  # Expiry set above
+
+
+def test_cycle_key(redis_client: fakeredis.FakeRedis) -> None:
+    session = create_session(user="alice")
+    old_key = session.session_key or ""
+
+    session.cycle_key()
+
+    assert session.session_key != old_key
+    assert not redis_client.exists(make_key(old_key))
+    assert SessionStore(session.session_key)["user"] == "alice"
+
+
+def test_delete(redis_client: fakeredis.FakeRedis) -> None:
+    session = create_session(user="alice")
+
+    session.delete()
+
+    assert not redis_client.exists(make_key(session.session_key or ""))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("write_through")
+def test_write_through(redis_client: fakeredis.FakeRedis) -> None:
+    session = create_session(user="alice")
+    key = session.session_key or ""
+    assert Session.objects.filter(session_key=key).exists()
+
+    redis_client.flushall()
+
+    # Read back from the database, and put back in Redis
+    assert SessionStore(key)["user"] == "alice"
+    assert redis_client.exists(make_key(key))
+
+    SessionStore(key).delete()
+    assert not Session.objects.filter(session_key=key).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("write_through")
+def test_write_through_skips_expired_sessions(redis_client: fakeredis.FakeRedis) -> None:
+    session = create_session(user="alice")
+    key = session.session_key or ""
+    Session.objects.filter(session_key=key).update(expire_date=timezone.now() - timedelta(seconds=1))
+    redis_client.flushall()
+
+    assert not SessionStore(key).preload()
+
+
+@pytest.mark.django_db
+def test_migrate(redis_client: fakeredis.FakeRedis, settings: Any) -> None:
+    now = timezone.now()
+    Session.objects.create(session_key="live", session_data="live-data", expire_date=now + timedelta(hours=1))
+    Session.objects.create(session_key="expired", session_data="old-data", expire_date=now - timedelta(hours=1))
+    Session.objects.create(session_key="newer", session_data="old-data", expire_date=now + timedelta(hours=1))
+    redis_client.set(make_key("newer"), "new-data")
+
+    call_command("sessions", "migrate", "--batch-size", "1")
+
+    assert redis_client.get(make_key("live")) == b"live-data"
+    assert 0 < redis_client.ttl(make_key("live")) <= timedelta(hours=1).total_seconds()
+    assert not redis_client.exists(make_key("expired"))
+    assert redis_client.get(make_key("newer")) == b"new-data"
+    assert Session.objects.count() == 3  # Sessions created above
+
+    settings.SESSION_ENGINE = "lib.sessions.backend"
+    call_command("sessions", "migrate", "--delete")
+
+    assert not Session.objects.exists()
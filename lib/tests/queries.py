@@ -0,0 +1,131 @@
+import json
+from collections import Counter
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+
+import pytest
+
+from lib.monitoring.queries import QueryStats, track_queries
+
+# Statements executed by the whole run, when recording with `--record-sql`
+_recorded: Counter[str] | None = None
+
+
+def _describe(stats: QueryStats) -> str:
+    return "\n".join(f"  {count}x {statement}" for statement, count in stats.statements.most_common())
+
+
+@pytest.fixture
+def assert_max_queries() -> Callable[..., AbstractContextManager[QueryStats]]:
+    """Fails the test if the block executes more than `max_queries` queries.
+
+    With `strict=True` it also fails if the same (normalized) SQL statement is executed more than once, which is
+    usually a sign of an N+1 query.
+
+    Example:
+        def test_browse(assert_max_queries):
+            with assert_max_queries(3, strict=True):
+                client.get(url)
+    """
+
+    @contextmanager
+    def _assert_max_queries(max_queries: int, *, strict: bool = False) -> Generator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        # The block's queries aren't seen by the recording around the test
+        if _recorded is not None:
+            _recorded.update(stats.statements)
+
+        if stats.count > max_queries:
+            pytest.fail(f"Expected at most {max_queries} queries, {stats.count} were executed:\n{_describe(stats)}")
+        if strict and stats.duplicates:
+            pytest.fail(f"{stats.duplicate_count} repeated queries were executed:\n{_describe(stats)}")
+
+    return _assert_max_queries
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--record-sql",
+        metavar="PATH",
+        type=Path,
+        help="Write the normalized SQL statements executed by the tests to PATH, for `./manage.py indexes advise`.",
+    )
+
+
+def _worker_id(config: pytest.Config) -> str | None:
+    # Set on the config of pytest-xdist workers
+    workerinput: dict[str, str] | None = getattr(config, "workerinput", None)
+    return workerinput["workerid"] if workerinput else None
+
+
+def _worker_paths(path: Path) -> list[Path]:
+    return sorted(path.parent.glob(f"{path.name}.gw*"))
+
+
+def _write(path: Path, recorded: Counter[str]) -> None:
+    with path.open("w") as file:
+        for statement, calls in recorded.most_common():
+            file.write(json.dumps({"query": statement, "calls": calls}) + "\n")
+
+
+def _read(path: Path) -> Counter[str]:
+    recorded: Counter[str] = Counter()
+    with path.open() as file:
+        for line in file:
+            entry = json.loads(line)
+            recorded[entry["query"]] += entry["calls"]
+    return recorded
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    path: Path | None = session.config.getoption("--record-sql")
+    if path is None or _worker_id(session.config) is not None:
+        return
+    # Left over by an interrupted run
+    for worker_path in _worker_paths(path):
+        worker_path.unlink()
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    path: Path | None = session.config.getoption("--record-sql")
+    if path is None or _worker_id(session.config) is not None:
+        return
+    # Under pytest-xdist, each worker records to its own file, merged once they have all finished
+    worker_paths = _worker_paths(path)
+    if not worker_paths:
+        return
+    recorded: Counter[str] = Counter()
+    for worker_path in worker_paths:
+        recorded.update(_read(worker_path))
+        worker_path.unlink()
+    _write(path, recorded)
+
+
+@pytest.fixture(scope="session")
+def _sql_recording(request: pytest.FixtureRequest) -> Generator[Counter[str] | None]:
+    global _recorded  # noqa: PLW0603 # Shared with `assert_max_queries`
+    path: Path | None = request.config.getoption("--record-sql")
+    if path is None:
+        yield None
+        return
+    worker_id = _worker_id(request.config)
+    if worker_id is not None:
+        path = path.with_name(f"{path.name}.{worker_id}")
+    _recorded = Counter()
+    try:
+        yield _recorded
+    finally:
+        _write(path, _recorded)
+        _recorded = None
+
+
+@pytest.fixture(autouse=True)
+def _record_sql(_sql_recording: Counter[str] | None) -> Generator[None]:
+    if _sql_recording is None:
+        yield
+        return
+    with track_queries() as stats:
+        yield
+    _sql_recording.update(stats.statements)
@@ -1,6 +1,7 @@
-from .base import Input, ValidationRule, validate
+from .base import Input, ValidationPlan, ValidationRule, validate
 from .validators import (
     DateShouldNotBeInFuture,
+    EachItem,
     EmailShouldBeValid,
     MinMaxLength,
     ModelShouldNotExist,
@@ -9,11 +10,13 @@ from .validators import (
 
 __all__ = [
     "DateShouldNotBeInFuture",
+    "EachItem",
     "EmailShouldBeValid",
     "Input",
     "MinMaxLength",
     "ModelShouldNotExist",
     "MultipleModelsShouldExist",
+    "ValidationPlan",
     "ValidationRule",
     "validate",
 ]
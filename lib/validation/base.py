@@ -1,4 +1,8 @@
+import weakref
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from operator import attrgetter
 from typing import Any
 
 from core.models import AnonymousUser, User
@@ -16,8 +20,70 @@ class ValidationRule(ABC):
         path: list[str | int],
     ) -> None: ...
 
+    async def validate_many(
+        self,
+        *,
+        values: Sequence[Any],
+        auth_user: User | AnonymousUser,
+        obj: "Input",
+        path: list[str | int],
+    ) -> None:
+        """
+        Validate each item of the list at `path`, raising the errors of all of them together.
+
+        Rules that don't await anything override this to check the whole list in one pass.
+        """
+        errors: list[InputError] = []
+        for i, value in enumerate(values):
+            try:
+                await self(value=value, auth_user=auth_user, obj=obj, path=[*path, i])
+            except InputError as e:
+                errors.append(e)
+            except ExceptionGroup as e:
+                errors.extend(_input_errors(e))
+        if errors:
+            raise ExceptionGroup("Validation failed", errors)
+
+
+@dataclass(frozen=True, slots=True)
+class ValidationPlan:
+    """
+    The validators of an input compiled once: the validated fields, a getter reading all of their values in one call
+    and the rules of each field.
+    """
+
+    fields: tuple[str, ...]
+    rules: tuple[tuple[ValidationRule, ...], ...]
+    getter: Callable[[object], Any] | None
+
+    @classmethod
+    def compile(cls, validators: Mapping[str, tuple[ValidationRule, ...]]) -> "ValidationPlan":
+        validated = {field: tuple(rules) for field, rules in validators.items() if rules}
+        fields = tuple(validated)
+        return cls(fields=fields, rules=tuple(validated.values()), getter=attrgetter(*fields) if fields else None)
+
+    @property
+    def validators(self) -> dict[str, tuple[ValidationRule, ...]]:
+        return dict(zip(self.fields, self.rules, strict=True))
+
+    def values(self, obj: object) -> tuple[Any, ...]:
+        if self.getter is None:
+            return ()
+        # `attrgetter` returns a tuple for several fields only
+        return self.getter(obj) if len(self.fields) > 1 else (self.getter(obj),)
+
+
+_plans: "weakref.WeakKeyDictionary[type[Input], ValidationPlan]" = weakref.WeakKeyDictionary()
+
 
 class Input(ABC):
+    """
+    An input validated by `validate`.
+
+    `validators` is compiled into a `ValidationPlan` the first time an instance of the class is validated, so it must
+    be the same for all of them. Inputs whose rules vary between instances override `validation_plan`.
+    """
+
     @abstractmethod
     def as_dict(self) -> dict[str, Any]:
         return self.__dict__
@@ -27,49 +93,51 @@ class Input(ABC):
     def validators(self) -> dict[str, tuple[ValidationRule, ...]]:
         return {}
 
+    @property
+    def validation_plan(self) -> ValidationPlan:
+        plan = _plans.get(type(self))
+        if plan is None:
+            plan = _plans[type(self)] = ValidationPlan.compile(self.validators)
+        return plan
+
+
+def _input_errors(group: ExceptionGroup) -> list[InputError]:
+    errors: list[InputError] = []
+    for exc in group.exceptions:
+        if isinstance(exc, InputError):
+            errors.append(exc)
+        elif isinstance(exc, ExceptionGroup):
+            errors.extend(_input_errors(exc))
+        else:
+            raise Exception("Non-InputError found in ExceptionGroup") from exc
+    return errors
 
-async def validate(  # noqa: C901 # Necessary complexity due to unmarshalling ExceptionGroup
+
+async def validate(
     obj: Input,
     *,
     auth_user: User | AnonymousUser | None = None,
     base_path: list[str | int] | None = None,
 ) -> None:
-    errors = []
-    base_path = base_path or []
-
-    if not obj.validators:
+    plan = obj.validation_plan
+    if not plan.fields:
         return
 
+    errors: list[InputError] = []
+    base_path = base_path or []
+
     if not auth_user:
         auth_user = AnonymousUser()
 
-    for field_name, rules in obj.validators.items():
+    for field_name, value, rules in zip(plan.fields, plan.values(obj), plan.rules, strict=True):
+        path = [*base_path, field_name]
         for rule in rules:
             try:
-                await rule(
-                    value=getattr(obj, field_name),
-                    auth_user=auth_user,
-                    obj=obj,
-                    path=[*base_path, field_name],
-                )
+                await rule(value=value, auth_user=auth_user, obj=obj, path=path)
             except InputError as e:
                 errors.append(e)
             except ExceptionGroup as e:
-
-                def get_exceptions(group: ExceptionGroup) -> list[InputError]:
-                    excs: list[InputError] = []
-                    for exc in group.exceptions:
-                        if isinstance(exc, InputError):
-                            excs.append(exc)
-                        elif isinstance(exc, ExceptionGroup):
-                            excs.extend(get_exceptions(exc))
-                        else:
-                            raise Exception("Non-InputError found in ExceptionGroup") from exc
-                    return excs
-
-                errors.extend(get_exceptions(e))
-            except Exception:
-                raise
+                errors.extend(_input_errors(e))
 
     if errors:
         raise ExceptionGroup("Validation failed", errors)
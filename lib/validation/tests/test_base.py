@@ -72,3 +72,20 @@ def test_validate_multiple_failures() -> None:
     assert len(exc_info.value.exceptions) == 2
     assert any(error.message == "Value is invalid" for error in exc_info.value.exceptions)
     assert any(error.message == "Value is not 123" for error in exc_info.value.exceptions)
+
+
+def test_validators_are_compiled_once_per_class() -> None:
+    reads: list[str] = []
+
+    class CountingInput(MockInput):
+        @property
+        def validators(self) -> dict[str, tuple[ValidationRule, ...]]:
+            reads.append("validators")
+            return {"field1": (MockRule1(),), "field2": ()}
+
+    async_to_sync(validate)(CountingInput(field1="valid", field2=321))
+    with pytest.raises(ExceptionGroup):
+        async_to_sync(validate)(CountingInput(field1="invalid", field2=321))
+
+    assert reads == ["validators"]
+    assert CountingInput(field1="valid", field2=321).validation_plan.fields == ("field1",)
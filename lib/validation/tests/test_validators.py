@@ -5,7 +5,7 @@ import pytest
 from asgiref.sync import async_to_sync
 
 from ..base import Input, ValidationRule, validate
-from ..validators import DateShouldNotBeInFuture
+from ..validators import DateShouldNotBeInFuture, EachItem, EmailShouldBeValid, MinMaxLength
 
 date_not_in_future_scenarios = {
     "date not in future": (datetime.now() - timedelta(days=1), None),
@@ -42,3 +42,36 @@ def test_date_not_in_future(date: datetime, error: type[Exception] | None) -> No
     except Exception as e:
         if error is None or not isinstance(e, error):
             raise
+
+
+def test_each_item_validates_lists_in_one_pass() -> None:
+    class TestRequest(Input):
+        def __init__(self, emails: list[str]) -> None:
+            self.emails = emails
+
+        def as_dict(self) -> dict[str, Any]:
+            return {"emails": self.emails}
+
+        @property
+        def validators(self) -> dict[str, tuple[ValidationRule, ...]]:
+            return {
+                "emails": (
+                    MinMaxLength(max_length=10_000),
+                    EachItem(MinMaxLength(max_length=30)),
+                    EachItem(EmailShouldBeValid()),
+                ),
+            }
+
+    emails = [f"user{i}@example.com" for i in range(10_000)]
+    sync_validate(TestRequest(emails=emails))
+
+    emails[1] = "invalid"
+    emails[2] = f"{'a' * 30}@example.com"
+    with pytest.raises(ExceptionGroup) as exc_info:
+        sync_validate(TestRequest(emails=emails), base_path=["root"])
+
+    errors = {(error.code, tuple(error.path)) for error in exc_info.value.exceptions}
+    assert errors == {
+        ("invalid_email", ("root", "emails", 1)),
+        ("max_length_exceeded", ("root", "emails", 2)),
+    }
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any
 
@@ -6,33 +7,54 @@ from django.core.validators import EmailValidator
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from core.models import AnonymousUser, User
 from lib.asyncutils import alist
 from lib.errors import InputError
 from lib.models import BaseModel
 
-from .base import ValidationRule
+from .base import Input, ValidationRule
 
 
 class EmailShouldBeValid(ValidationRule):
+    # Django's validator keeps no state between calls, so a single one is shared
+    email_validator = EmailValidator()
+
     async def __call__(self, *, value: str | None, path: list[str | int], **kwargs: Any) -> None:
+        if error := self._error(value, path):
+            raise error
+
+    async def validate_many(self, *, values: Sequence[str | None], path: list[str | int], **kwargs: Any) -> None:
+        _raise_all([self._error(value, [*path, i]) for i, value in enumerate(values)])
+
+    def _error(self, value: str | None, path: list[str | int]) -> InputError | None:
         if not value:
-            return
-        email_validator = EmailValidator()
+            return None
         try:
-            email_validator(value)
+            self.email_validator(value)
         except ValidationError as e:
-            raise InputError(
+            error = InputError(
                 f"Invalid email {value}",
                 code="invalid_email",
                 message=_("Invalid email address {value}.").format(value=value),
                 path=path,
-            ) from e
+            )
+            error.__cause__ = e
+            return error
+        return None
 
 
 class DateShouldNotBeInFuture(ValidationRule):
     async def __call__(self, *, value: datetime, path: list[str | int], **kwargs: Any) -> None:
+        if error := self._error(value, path, timezone.now()):
+            raise error
+
+    async def validate_many(self, *, values: Sequence[datetime], path: list[str | int], **kwargs: Any) -> None:
+        now = timezone.now()
+        _raise_all([self._error(value, [*path, i], now) for i, value in enumerate(values)])
+
+    def _error(self, value: datetime, path: list[str | int], now: datetime) -> InputError | None:
         if not isinstance(value, datetime):
-            raise InputError(
+            return InputError(
                 "Invalid date",
                 code="invalid_date",
                 message=_("Invalid date."),
@@ -40,8 +62,8 @@ class DateShouldNotBeInFuture(ValidationRule):
             )
         if timezone.is_naive(value):
             value = timezone.make_aware(value)
-        if value > timezone.now():
-            raise InputError(
+        if value > now:
+            return InputError(
                 f"Date {value} cannot be in the future",
                 code="date_in_future",
                 message=_("Date {value} should not be in the future.").format(
@@ -49,6 +71,7 @@ class DateShouldNotBeInFuture(ValidationRule):
                 ),
                 path=path,
             )
+        return None
 
 
 class ModelShouldNotExist(ValidationRule):
@@ -107,11 +130,20 @@ class MinMaxLength(ValidationRule):
         self.max_length = max_length
 
     async def __call__(self, *, value: str | list[Any] | None, path: list[str | int], **kwargs: Any) -> None:
+        if error := self._error(value, path):
+            raise error
+
+    async def validate_many(
+        self, *, values: Sequence[str | list[Any] | None], path: list[str | int], **kwargs: Any
+    ) -> None:
+        _raise_all([self._error(value, [*path, i]) for i, value in enumerate(values)])
+
+    def _error(self, value: str | list[Any] | None, path: list[str | int]) -> InputError | None:
         if value is None:
-            return
+            return None
 
         if self.min_length is not None and self.min_length > len(value):
-            raise InputError(
+            return InputError(
                 f"Invalid length {len(value)}",
                 code="min_length_not_met",
                 message=_("Minimum length {length} not met.").format(length=self.min_length),
@@ -119,9 +151,32 @@ class MinMaxLength(ValidationRule):
             )
 
         if self.max_length is not None and self.max_length < len(value):
-            raise InputError(
+            return InputError(
                 f"Invalid length {len(value)}",
                 code="max_length_exceeded",
                 message=_("Maximum length {length} exceeded.").format(length=self.max_length),
                 path=path,
             )
+        return None
+
+
+class EachItem(ValidationRule):
+    """
+    Validates each item of a list with `rule`, in one pass for rules that override `validate_many`.
+    """
+
+    def __init__(self, rule: ValidationRule) -> None:
+        self.rule = rule
+
+    async def __call__(
+        self, *, value: Sequence[Any] | None, auth_user: User | AnonymousUser, obj: Input, path: list[str | int]
+    ) -> None:
+        if not value:
+            return
+        await self.rule.validate_many(values=value, auth_user=auth_user, obj=obj, path=path)
+
+
+def _raise_all(errors: list[InputError | None]) -> None:
+    found = [error for error in errors if error is not None]
+    if found:
+        raise ExceptionGroup("Validation failed", found)
@@ -0,0 +1,513 @@
+# This file holds micro-benchmarks for performance sensitive helpers in `lib`.
+# Each benchmark is a sub command, e.g. `./manage.py benchmark tracing`.
+# Results are printed as the average time per call, relative to a baseline where it makes sense.
+
+import asyncio
+import hashlib
+import logging
+import resource
+import uuid
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from time import perf_counter
+from typing import Annotated, Any
+
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.test import RequestFactory
+from django.urls import path, reverse, set_urlconf
+from django.utils import timezone
+from django_typer.management import Typer
+from ninja import Schema
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from rich import print
+from typer import Option
+
+import lib.errors
+from core.models import AnonymousUser, User
+from lib import jsonutils as json
+from lib.asyncutils import Progress, astream
+from lib.cache import TieredCache
+from lib.models import uuid7
+from lib.monitoring import tracing_enabled
+from lib.monitoring.profiling import profile_tags, request_tags, thread_tags
+from lib.permissions import permission
+from lib.rest import BaseObjectResource, LinkTemplate, compile_serializer, error_handlers
+from lib.rest.resources import ErrorMessage, ErrorResponse
+from lib.validation import (
+    EachItem,
+    EmailShouldBeValid,
+    Input,
+    MinMaxLength,
+    ValidationPlan,
+    ValidationRule,
+    validate,
+)
+
+app = Typer(
+    name="benchmark",
+    help="Micro-benchmarks for performance sensitive helpers.",
+)  # type: ignore # TODO: Add missing generic type params
+
+Iterations = Annotated[int, Option("--iterations", "-n", help="Number of calls to time for each case.")]
+
+
+def _time_async(func: Callable[[], Awaitable[object]], iterations: int) -> float:
+    async def run() -> float:
+        start = perf_counter()
+        for _ in range(iterations):
+            await func()
+        return perf_counter() - start
+
+    return asyncio.run(run())
+
+
+def _time(func: Callable[[], object], iterations: int) -> float:
+    start = perf_counter()
+    for _ in range(iterations):
+        func()
+    return perf_counter() - start
+
+
+def _report(name: str, seconds: float, iterations: int, baseline: float | None = None) -> None:
+    per_call = seconds / iterations * 1e9
+    relative = f" ({seconds / baseline:.2f}x)" if baseline else ""
+    print(f"{name:<45} [bold]{per_call:>10.0f}[/bold] ns/call{relative}")
+
+
+@app.command(name="tracing")
+def tracing(iterations: Iterations = 100_000) -> None:
+    """Measure the overhead `@permission` (and the tracing decorators) add to a call."""
+    if tracing_enabled():
+        print("[red]Error:[/red] A tracer provider is already configured, the disabled case can't be measured.")
+        return
+
+    async def check() -> bool:
+        return True
+
+    async def undecorated() -> None:
+        if await check() is not True:
+            raise AssertionError
+
+    baseline = _time_async(undecorated, iterations)
+    _report("undecorated", baseline, iterations)
+
+    disabled = permission(check)
+    _report("@permission, no tracer provider", _time_async(disabled, iterations), iterations, baseline)
+
+    # Spans are recorded but not exported anywhere, so this is the cost of tracing itself
+    trace.set_tracer_provider(TracerProvider())
+    enabled = permission(check)
+    _report("@permission, sampled trace", _time_async(enabled, iterations), iterations, baseline)
+
+    unsampled = trace.NonRecordingSpan(
+        trace.SpanContext(
+            trace_id=1, span_id=1, is_remote=False, trace_flags=trace.TraceFlags(trace.TraceFlags.DEFAULT)
+        )
+    )
+
+    async def enabled_unsampled() -> None:
+        with trace.use_span(unsampled):
+            for _ in range(iterations):
+                await enabled()
+
+    start = perf_counter()
+    asyncio.run(enabled_unsampled())
+    _report("@permission, unsampled trace", perf_counter() - start, iterations, baseline)
+
+
+@app.command(name="profiling")
+def profiling(iterations: Iterations = 100_000, path: str = "/api/") -> None:
+    """Measure the overhead tagging profiles with the request's route and slice adds to a request."""
+    request = RequestFactory().get(path)
+
+    def disabled() -> None:
+        with nullcontext():
+            pass
+
+    baseline = _time(disabled, iterations)
+    _report("tags disabled", baseline, iterations)
+    _report("computing tags", _time(lambda: request_tags(request), iterations), iterations, baseline)
+
+    def enabled() -> None:
+        with profile_tags(request_tags(request)):
+            pass
+
+    _report("computing and setting tags", _time(enabled, iterations), iterations, baseline)
+
+    if not settings.MONITORING_PYROSCOPE_TAGS_ENABLED:
+        print("[yellow]Profiling tags are disabled, skipping the thread tagging case.[/yellow]")
+        return
+
+    def applied() -> None:
+        with profile_tags(request_tags(request)), thread_tags():
+            pass
+
+    _report("tagging a sync_to_async thread", _time(applied, iterations), iterations, baseline)
+
+
+@app.command(name="cache")
+def cache(iterations: Iterations = 10_000) -> None:
+    """Measure lookups in a `lib.cache` namespace, in-process (L1) and shared (L2) hits."""
+    tiered = TieredCache("benchmark", ttl=60)
+    async_to_sync(tiered.aset)("key", {"value": 1})
+
+    _report("local hit", _time_async(lambda: tiered.aget("key"), iterations), iterations)
+
+    async def shared_hit() -> None:
+        tiered.local.clear()
+        await tiered.aget("key")
+
+    _report("shared hit", _time_async(shared_hit, iterations), iterations)
+    _report("miss", _time_async(lambda: tiered.aget("missing"), iterations), iterations)
+    async_to_sync(tiered.adelete)("key")
+
+
+@app.command(name="pool")
+def pool(
+    iterations: Iterations = 2_000,
+    concurrency: Annotated[int, Option("--concurrency", "-c", help="Number of threads making requests.")] = 8,
+) -> None:
+    """Measure requests that connect and run a query, with and without the connection pool."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    settings_dict = connection.settings_dict
+    unpooled = {key: value for key, value in settings_dict["OPTIONS"].items() if key != "pool"}
+    pool_options = settings_dict["OPTIONS"].get("pool")
+    if not isinstance(pool_options, dict):
+        pool_options = {"min_size": concurrency, "max_size": concurrency}
+
+    def run(alias: str, options: dict[str, Any]) -> float:
+        # A connection per request, like Django does when the request finishes
+        def request(_: int) -> None:
+            wrapper = type(connection)({**settings_dict, "OPTIONS": options}, alias=alias)
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            wrapper.close()
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            # Warm up, so that opening the pool isn't timed
+            list(executor.map(request, range(concurrency)))
+            start = perf_counter()
+            list(executor.map(request, range(iterations)))
+            seconds = perf_counter() - start
+        print(f"{alias:<45} [bold]{iterations / seconds:>10.0f}[/bold] requests/s")
+        return seconds
+
+    baseline = run("unpooled", unpooled)
+    _report("unpooled", baseline, iterations)
+    pooled = run("pooled", {**unpooled, "pool": pool_options})
+    _report("pooled", pooled, iterations, baseline)
+    type(connection)({**settings_dict, "OPTIONS": {**unpooled, "pool": pool_options}}, alias="pooled").close_pool()
+
+
+@app.command(name="stream")
+def stream(
+    model: Annotated[str, Option("--model", "-m", help="Label of the model to stream, e.g. core.User.")] = "core.User",
+    chunk_size: Annotated[int, Option("--chunk-size", help="Rows fetched per round trip.")] = 2000,
+) -> None:
+    """Stream every row of a table with `astream`, reporting throughput and peak memory as it goes.
+
+    Peak memory should level off after the first chunks, however large the table. Seed the table first to stream
+    millions of rows, e.g. with `INSERT ... SELECT ... FROM generate_series(1, 10000000)`.
+    """
+    queryset = apps.get_model(model).objects.order_by("pk")
+    start = perf_counter()
+
+    def peak_rss() -> float:
+        # Kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    def report(progress: Progress) -> None:
+        if progress.batches == 1 or progress.batches % 100 == 0:
+            rate = progress.rows / (perf_counter() - start)
+            print(f"{progress.rows:>12} rows {rate:>12.0f} rows/s {peak_rss():>10.1f} MiB peak")
+
+    async def run() -> int:
+        rows = 0
+        async for _ in astream(queryset, chunk_size, on_progress=report):
+            rows += 1
+        return rows
+
+    rows = asyncio.run(run())
+    seconds = perf_counter() - start
+    print(f"Streamed [bold]{rows}[/bold] rows in {seconds:.2f}s, [bold]{peak_rss():.1f}[/bold] MiB peak")
+
+
+@app.command(name="uuids")
+def uuids(
+    rows: Annotated[int, Option("--rows", "-r", help="Rows inserted for each UUID version.")] = 10_000_000,
+    batch_size: Annotated[int, Option("--batch-size", help="Rows copied per COPY statement.")] = 100_000,
+) -> None:
+    """Compare generating and inserting random (v4) and time-ordered (v7) UUIDs, and the size of their index.
+
+    Rows are copied into scratch tables with a unique index on `uuid`, like `BaseModel` tables, dropped afterwards.
+    """
+    generators = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+    baseline = None
+    for name, generate in generators.items():
+        _report(f"generate {name}", _time(generate, 100_000), 100_000)
+
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        for name, generate in generators.items():
+            table = f"benchmark_{name}"
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(
+                f"CREATE TABLE {table} (id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY, uuid uuid NOT NULL)"
+            )
+            cursor.execute(f"CREATE UNIQUE INDEX {table}_uuid ON {table} (uuid)")
+            try:
+                start = perf_counter()
+                for offset in range(0, rows, batch_size):
+                    with cursor.cursor.copy(f"COPY {table} (uuid) FROM STDIN") as copy:
+                        for _ in range(min(batch_size, rows - offset)):
+                            copy.write_row((generate(),))
+                seconds = perf_counter() - start
+                cursor.execute("SELECT pg_relation_size(%s)", [f"{table}_uuid"])
+                index_size = cursor.fetchone()[0]
+            finally:
+                cursor.execute(f"DROP TABLE {table}")
+            _report(f"insert {name}", seconds, rows, baseline)
+            print(f"{'':<45} {rows / seconds:>10.0f} rows/s, index [bold]{index_size / 2**20:.1f}[/bold] MiB")
+            baseline = baseline or seconds
+
+
+@app.command(name="search")
+def search(
+    rows: Annotated[int, Option("--rows", "-r", help="Rows in the searched table.")] = 5_000_000,
+    iterations: Iterations = 20,
+) -> None:
+    """Compare `icontains` searches without an index, with a trigram index, and full text searches.
+
+    Rows are inserted into a scratch table, dropped afterwards, with a stored `tsvector` column like
+    `lib.search.search_vector_field`. The queries are the ones `TrigramSearch` and `VectorSearch` run.
+    """
+    table = "benchmark_search"
+    # Rows hold two words of 32 hex characters, a few thousand of them contain `term`
+    term = "a3f2"
+    queries = {
+        "icontains": (
+            "SELECT id FROM benchmark_search WHERE UPPER(body::text) LIKE UPPER(%s) ORDER BY id DESC LIMIT 20",
+            [f"%{term}%"],
+        ),
+        "trigram": (
+            (
+                "SELECT id, similarity(UPPER(body::text), UPPER(%s)) AS rank FROM benchmark_search "
+                "WHERE UPPER(body::text) LIKE UPPER(%s) ORDER BY rank DESC, id DESC LIMIT 20"
+            ),
+            [term, f"%{term}%"],
+        ),
+        "full text": (
+            (
+                "SELECT id, ts_rank(search_vector, query) AS rank FROM benchmark_search, "
+                "websearch_to_tsquery('simple'::regconfig, %s) query "
+                "WHERE search_vector @@ query ORDER BY rank DESC, id DESC LIMIT 20"
+            ),
+            # A whole word of the row in the middle of the table
+            [hashlib.md5(str(rows // 2).encode(), usedforsecurity=False).hexdigest()],
+        ),
+    }
+
+    def run(name: str, baseline: float | None = None) -> float:
+        sql, params = queries[name]
+        cursor.execute(sql, params)  # Warm up the cache
+        start = perf_counter()
+        for _ in range(iterations):
+            cursor.execute(sql, params)
+            cursor.fetchall()
+        seconds = perf_counter() - start
+        _report(name, seconds, iterations, baseline)
+        return seconds
+
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(
+            f"CREATE TABLE {table} (id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY, body text NOT NULL, "
+            "search_vector tsvector GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, body)) STORED)"
+        )
+        try:
+            start = perf_counter()
+            cursor.execute(
+                "INSERT INTO benchmark_search (body) SELECT md5(i::text) || ' ' || md5((i * 7)::text) "
+                "FROM generate_series(1, %s) i",
+                [rows],
+            )
+            cursor.execute(f"ANALYZE {table}")
+            print(f"Inserted [bold]{rows}[/bold] rows in {perf_counter() - start:.1f}s")
+
+            baseline = run("icontains")
+            for name, ddl in {
+                "trigram": f"CREATE INDEX {table}_trg ON {table} USING gin (UPPER(body::text) gin_trgm_ops)",
+                "full text": f"CREATE INDEX {table}_gin ON {table} USING gin (search_vector)",
+            }.items():
+                start = perf_counter()
+                cursor.execute(ddl)
+                built = perf_counter() - start
+                index = ddl.split()[2]
+                cursor.execute("SELECT pg_relation_size(%s)", [index])
+                size = cursor.fetchone()[0]
+                print(f"{'':<45} {index} built in {built:.1f}s, [bold]{size / 2**20:.1f}[/bold] MiB")
+                run(name, baseline)
+        finally:
+            cursor.execute(f"DROP TABLE {table}")
+
+
+@app.command(name="validation")
+def validation(inputs: Annotated[int, Option("--inputs", help="Inputs validated per case.")] = 10_000) -> None:
+    """Measure validating small inputs with their compiled plans, against reading `validators` on every call.
+
+    Then measure validating a list of as many emails with `EachItem`, against awaiting the rule for each item.
+    """
+    from lib.graphql.mutations import GraphqlInput  # noqa: PLC0415 # Only needed by this benchmark
+
+    class SmallInput(Input):
+        def __init__(self, name: str, email: str, tags: list[str]) -> None:
+            self.name = name
+            self.email = email
+            self.tags = tags
+
+        def as_dict(self) -> dict[str, Any]:
+            return vars(self)
+
+        @property
+        def validators(self) -> dict[str, tuple[ValidationRule, ...]]:
+            return {
+                "name": (MinMaxLength(1, 255),),
+                "email": (MinMaxLength(3, 255),),
+                "tags": (MinMaxLength(max_length=10),),
+            }
+
+    objs = [SmallInput(f"name {i}", f"user{i}@example.com", ["a", "b"]) for i in range(inputs)]
+    auth_user = AnonymousUser()
+
+    async def uncompiled(obj: Input) -> None:
+        # The validation loop before plans were compiled
+        for field_name, rules in obj.validators.items():
+            for rule in rules:
+                await rule(value=getattr(obj, field_name), auth_user=auth_user, obj=obj, path=[field_name])
+
+    async def run(check: Callable[[Input], Awaitable[None]], objs: list[Input]) -> float:
+        start = perf_counter()
+        for obj in objs:
+            await check(obj)
+        return perf_counter() - start
+
+    def report(name: str, seconds: float, baseline: float | None = None) -> None:
+        _report(name, seconds, inputs, baseline)
+        print(f"{'':<45} [bold]{inputs / seconds:>10.0f}[/bold] inputs/s")
+
+    baseline = asyncio.run(run(uncompiled, objs))
+    report("validators read per input", baseline)
+    report("compiled plan", asyncio.run(run(lambda obj: validate(obj, auth_user=auth_user), objs)), baseline)
+
+    plan = ValidationPlan.compile(objs[0].validators)
+    mutation_inputs: list[Input] = [GraphqlInput(data=obj, plan=plan) for obj in objs]
+    report(
+        "mutation input", asyncio.run(run(lambda obj: validate(obj, auth_user=auth_user), mutation_inputs)), baseline
+    )
+
+    _validate_list([obj.email for obj in objs], obj=objs[0])
+
+
+def _validate_list(emails: list[str], obj: Input) -> None:
+    # A single input holding a list of emails, validated item by item or in one pass
+    auth_user = AnonymousUser()
+    for rule in (MinMaxLength(3, 255), EmailShouldBeValid()):
+        each = EachItem(rule)
+
+        async def per_item(rule: ValidationRule = rule) -> None:
+            for i, email in enumerate(emails):
+                await rule(value=email, auth_user=auth_user, obj=obj, path=["emails", i])
+
+        async def one_pass(each: EachItem = each) -> None:
+            await each(value=emails, auth_user=auth_user, obj=obj, path=["emails"])
+
+        name = type(rule).__name__
+        baseline = _time_async(per_item, 1)
+        _report(f"{name} per item", baseline, len(emails))
+        _report(f"{name} in one pass", _time_async(one_pass, 1), len(emails), baseline)
+
+
+@app.command(name="errors")
+def errors(iterations: Iterations = 100_000) -> None:
+    """Measure building the error responses of the REST API, against validating them through the pydantic models."""
+    request = RequestFactory().get("/api/")
+    request.user = AnonymousUser()
+    logging.getLogger(error_handlers.__name__).disabled = True
+    cases: dict[str, lib.errors.BaseError] = {
+        "unauthenticated": lib.errors.UnauthenticatedError(),
+        "forbidden": lib.errors.AuthorizationError("Denied", permission_required="can_read"),
+        "invalid input": lib.errors.InputError("Invalid email", code="invalid_email", path=["body", "data", "email"]),
+    }
+
+    def pydantic_response(exc: lib.errors.BaseError) -> HttpResponse:
+        # How responses were built before their bodies were serialized directly
+        detail = ErrorResponse(
+            errors=[ErrorMessage(code=exc.code, message=exc.message, path=getattr(exc, "path", None))]
+        ).model_dump(mode="json", exclude_none=True)
+        return JsonResponse(detail, status=error_handlers.error_status(type(exc)))
+
+    for name, exc in cases.items():
+        baseline = _time(lambda exc=exc: pydantic_response(exc), iterations)
+        _report(f"{name} (pydantic)", baseline, iterations)
+        seconds = _time(lambda exc=exc: error_handlers.standard_error(request, exc), iterations)
+        _report(name, seconds, iterations, baseline)
+        print(f"{'':<45} [bold]{iterations / seconds:>10.0f}[/bold] responses/s")
+
+
+@app.command(name="serialization")
+def serialization(
+    rows: Annotated[int, Option("--rows", "-r", help="Rows per page.")] = 100,
+    iterations: Iterations = 1_000,
+) -> None:
+    """Measure serializing a page of rows through Ninja's validation, and with the trusted output serializer.
+
+    Rows aren't saved. Their links point to the read view of `urlpatterns` below, like the links of slices' rows.
+    """
+    # Reversed against this module's routes while the benchmark runs
+    set_urlconf(__name__)
+    link = LinkTemplate("user-read", "key")
+
+    class Reversed(BaseObjectResource):
+        email: str
+        link: str
+
+        @staticmethod
+        def resolve_link(obj: User) -> str:
+            return reverse("user-read", kwargs={"key": obj.uuid})
+
+    class Templated(Reversed):
+        @staticmethod
+        def resolve_link(obj: User) -> str:
+            return link(obj.uuid)
+
+    now = timezone.now()
+    page = [User(email=f"user{i}@example.com", created_at=now, updated_at=now) for i in range(rows)]
+
+    def validated(resource: type[Schema]) -> str:
+        return json.dumps({"data": [resource.model_validate(obj).model_dump() for obj in page]})
+
+    serialize = compile_serializer(Templated)
+
+    def trusted() -> str:
+        return json.dumps({"data": [serialize(obj, {}) for obj in page]})
+
+    baseline = _time(lambda: validated(Reversed), iterations)
+    _report(f"validated, reverse per row ({rows} rows)", baseline, iterations)
+    _report(
+        f"validated, link template ({rows} rows)", _time(lambda: validated(Templated), iterations), iterations, baseline
+    )
+    _report(f"trusted output ({rows} rows)", _time(trusted, iterations), iterations, baseline)
+    set_urlconf(None)
+
+
+def _read_user(request: HttpRequest, key: uuid.UUID) -> HttpResponse:  # noqa: ARG001 # Only reversed
+    return HttpResponse()
+
+
+urlpatterns = [path("users/<uuid:key>/", _read_user, name="user-read")]
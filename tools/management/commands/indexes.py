@@ -0,0 +1,163 @@
+# This file holds commands to find the indexes the app is missing, see `lib.models.advisor`.
+# Statements are read from `pg_stat_statements` (the extension must be installed in the database), or from a file
+# recorded by the test suite with `pytest --record-sql queries.jsonl`.
+# - `./manage.py indexes advise` prints the recommended indexes, with their estimated size
+# - `./manage.py indexes advise --migration <app>` also writes a migration creating them concurrently
+
+import json
+from pathlib import Path
+from typing import Annotated
+
+from django.apps import apps
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, models
+from django.db.migrations import Migration
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+from django_typer.management import Typer
+from rich import print
+from typer import Option
+
+from lib.models.advisor import Recommendation, TableStats, recommend
+
+app = Typer(
+    name="indexes",
+    help="Recommend the indexes missing for the queries the app runs.",
+)  # type: ignore # TODO: Add missing generic type params
+
+
+@app.callback()
+def main() -> None:
+    # Keeps the only command a subcommand, as Typer otherwise runs it as the app itself
+    pass
+
+
+STATEMENTS_QUERY = """
+SELECT query, calls FROM pg_stat_statements
+WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database()) AND query ILIKE 'SELECT%%'
+ORDER BY calls DESC LIMIT %s
+"""
+TABLE_QUERY = "SELECT reltuples, relpages FROM pg_class WHERE oid = %s::regclass"
+COLUMNS_QUERY = """
+SELECT attname, avg_width, null_frac, correlation, most_common_vals::text::text[], most_common_freqs
+FROM pg_stats WHERE schemaname = current_schema() AND tablename = %s
+"""
+
+
+def _read_statements(sql_file: Path | None, limit: int) -> list[tuple[str, int]]:
+    if sql_file is not None:
+        with sql_file.open() as lines:
+            return [(entry["query"], entry["calls"]) for entry in map(json.loads, lines)]
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(STATEMENTS_QUERY, [limit])
+        return cursor.fetchall()
+
+
+def _read_indexes(table: str) -> list[tuple[str, list[str]]]:
+    connection = connections[DEFAULT_DB_ALIAS]
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    return [
+        (constraint.get("type") or "idx", constraint["columns"])
+        for constraint in constraints.values()
+        if constraint["index"] or constraint["unique"] or constraint["primary_key"]
+    ]
+
+
+def _read_stats(table: str) -> TableStats:
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(TABLE_QUERY, [table])
+        rows, pages = cursor.fetchone()
+        cursor.execute(COLUMNS_QUERY, [table])
+        columns = cursor.fetchall()
+    true_fractions = {
+        column: dict(zip(values, frequencies, strict=True)).get("true", 0.0)
+        for column, _, _, _, values, frequencies in columns
+        if values and set(values) <= {"true", "false"}
+    }
+    return TableStats(
+        # -1 until the table has been vacuumed or analyzed
+        rows=max(rows, 0),
+        pages=pages,
+        widths={column: width for column, width, *_ in columns},
+        null_fractions={column: null_fraction for column, _, null_fraction, *_ in columns},
+        true_fractions=true_fractions,
+        correlations={column: correlation for column, _, _, correlation, *_ in columns if correlation is not None},
+    )
+
+
+def _format_size(size: int | None) -> str:
+    return "unknown size" if size is None else f"{size / 2**20:.1f} MiB"
+
+
+def _write_migration(app_label: str, indexes: list[tuple[type[models.Model], models.Index]]) -> Path:
+    leaves = MigrationLoader(None, ignore_no_migrations=True).graph.leaf_nodes(app_label)
+    number = max((int(name.split("_", 1)[0]) for _, name in leaves if name[:4].isdigit()), default=0) + 1
+    migration = Migration(f"{number:04d}_add_recommended_indexes", app_label)
+    migration.dependencies = leaves
+    migration.operations = [
+        AddIndexConcurrently(model._meta.model_name, index)  # noqa: SLF001 # Public Django API
+        for model, index in indexes
+    ]
+    writer = MigrationWriter(migration)
+    # Indexes can only be created concurrently outside of a transaction, which the writer has no option for
+    content = writer.as_string().replace(
+        "class Migration(migrations.Migration):\n", "class Migration(migrations.Migration):\n    atomic = False\n\n", 1
+    )
+    path = Path(writer.path)
+    path.write_text(content)
+    return path
+
+
+@app.command(name="advise")
+def advise(
+    sql_file: Annotated[
+        Path | None, Option("--sql-file", help="JSON lines of statements recorded by `pytest --record-sql`.")
+    ] = None,
+    limit: Annotated[int, Option("--limit", "-l", help="Number of most called statements to read.")] = 5000,
+    migration: Annotated[
+        str | None, Option("--migration", "-m", help="Write a migration creating the indexes of this app.")
+    ] = None,
+) -> None:
+    """Recommend composite, partial and BRIN indexes for the most called queries, with their estimated size."""
+    models_by_table = {
+        model._meta.db_table: model  # noqa: SLF001 # Public Django API
+        for model in apps.get_models()
+        if not model._meta.proxy and model._meta.managed  # noqa: SLF001 # Public Django API
+    }
+    try:
+        statements = _read_statements(sql_file, limit)
+    except DatabaseError:
+        print("[red]Error:[/red] pg_stat_statements isn't available, pass statements with --sql-file.")
+        return
+
+    existing = {table: _read_indexes(table) for table in models_by_table}
+    stats = {table: _read_stats(table) for table in existing}
+    recommendations: list[Recommendation] = recommend(statements, existing, stats)
+    if not recommendations:
+        print("No missing indexes found.")
+        return
+
+    to_migrate: list[tuple[type[models.Model], models.Index]] = []
+    for recommendation in recommendations:
+        model = models_by_table[recommendation.table]
+        fields_by_column = {
+            field.column: field.name
+            for field in model._meta.concrete_fields  # noqa: SLF001 # Public Django API
+        }
+        index = recommendation.to_index(fields_by_column)
+        declaration, _ = MigrationWriter.serialize(index)
+        print(
+            f"[bold]{model.__name__}[/bold] {recommendation.kind} ({', '.join(recommendation.columns)}),"
+            f" {recommendation.calls} calls, {_format_size(recommendation.estimated_size)}"
+        )
+        print(f"    {declaration}")
+        if model._meta.app_label == migration:  # noqa: SLF001 # Public Django API
+            to_migrate.append((model, index))
+
+    if migration is not None:
+        if not to_migrate:
+            print(f"[red]Error:[/red] None of the recommended indexes are on models of {migration}.")
+            return
+        path = _write_migration(migration, to_migrate)
+        print(f"Wrote [bold]{path}[/bold], add the indexes to the `Meta.indexes` of their models before migrating.")
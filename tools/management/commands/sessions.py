@@ -0,0 +1,75 @@
+# This file holds commands to manage sessions stored by `lib.sessions.backend`.
+# To move to the Redis engine without logging users out:
+# - Deploy with `SESSION_REDIS=True` and `SESSION_REDIS_WRITE_THROUGH=True`, sessions not yet in Redis are then read
+#   from the database
+# - Run `./manage.py sessions migrate` to copy the remaining live sessions to Redis
+# - Optionally turn off write-through, and run `./manage.py sessions migrate --delete` to drop the database copies
+
+from datetime import timedelta
+from typing import Annotated
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+from django_typer.management import Typer
+from redis.client import Pipeline
+from rich import print
+from typer import Option
+
+from lib.cache.client import get_redis
+from lib.sessions.backend import make_key
+
+app = Typer(
+    name="sessions",
+    help="Manage sessions stored in Redis.",
+)  # type: ignore # TODO: Add missing generic type params
+
+
+@app.callback()
+def main() -> None:
+    # Keeps the only command a subcommand, as Typer otherwise runs it as the app itself
+    pass
+
+
+def _flush(pipeline: Pipeline, copied: int, skipped: int) -> tuple[int, int]:
+    results = pipeline.execute()
+    stored = sum(1 for result in results if result)
+    return copied + stored, skipped + len(results) - stored
+
+
+@app.command(name="migrate")
+def migrate(
+    batch_size: Annotated[int, Option("--batch-size", "-b", help="Number of sessions written per round trip.")] = 1000,
+    delete: Annotated[bool, Option("--delete", help="Delete the database sessions once copied.")] = False,
+) -> None:
+    """Copy live database sessions to Redis, keeping their keys and expiry so users stay logged in."""
+    client = get_redis()
+    if client is None:
+        print("[red]Error:[/red] CACHE_URL must be set to migrate sessions to Redis.")
+        return
+    if delete and (settings.SESSION_ENGINE != "lib.sessions.backend" or settings.SESSION_REDIS_WRITE_THROUGH):
+        print("[red]Error:[/red] Database sessions can only be deleted once they are stored in Redis alone.")
+        return
+
+    now = timezone.now()
+    copied = skipped = 0
+    sessions = Session.objects.filter(expire_date__gt=now).order_by("pk")
+    pipeline = client.pipeline(transaction=False)
+    pending = 0
+    for session in sessions.iterator(chunk_size=batch_size):
+        ttl = (session.expire_date - now) // timedelta(seconds=1)
+        if ttl <= 0:
+            continue
+        # Sessions already in Redis are newer than their database copy, and are left alone
+        pipeline.set(make_key(session.session_key), session.session_data, ex=ttl, nx=True)
+        pending += 1
+        if pending >= batch_size:
+            copied, skipped = _flush(pipeline, copied, skipped)
+            pending = 0
+    if pending:
+        copied, skipped = _flush(pipeline, copied, skipped)
+    print(f"Copied [bold]{copied}[/bold] sessions to Redis, [bold]{skipped}[/bold] were already there.")
+
+    if delete:
+        deleted, _ = Session.objects.all().delete()
+        print(f"Deleted [bold]{deleted}[/bold] database sessions.")